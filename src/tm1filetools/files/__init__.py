@@ -12,6 +12,7 @@ from .text.blb import TM1BLBFile  # noqa
 from .text.cfg import TM1CfgFile  # noqa
 from .text.chore import TM1ChoreFile  # noqa
 from .text.cma import TM1CMAFile  # noqa
+from .text.encoding import TM1EncodingDetector  # noqa
 from .text.log import TM1ChangeLogFile, TM1LogFile, TM1ProcessErorrLogFile  # noqa
 from .text.process import TM1ProcessFile  # noqa
 from .text.rules import TM1RulesFile  # noqa
@@ -1,24 +1,80 @@
 import itertools
+import os
 from datetime import datetime
 from pathlib import Path
 
 
+class _FileSuffix:
+    """
+    Suffix of a file type
+
+    Read from the class, it's the suffix of the file type (e.g. "cub"), but read from an
+    instance, it's the suffix of the file itself, which may differ in case (e.g. "CUB")
+    """
+
+    def __init__(self, suffix: str):
+
+        self.suffix = suffix
+
+    def __get__(self, instance, owner):
+
+        if instance is None:
+            return self.suffix
+
+        return instance._get_suffix()
+
+
 class TM1File:
     """
     Base class for TM1 files
+
+    There can be a very large number of these (e.g. private subsets) so they only hold the path,
+    as a string, with everything else derived from it when asked for
     """
 
+    __slots__ = ("_path_str",)
+
     prefix = ""
     control_prefix = "}"
     is_tm1_file = True
+    suffix = _FileSuffix("")
 
     def __init__(self, path):
 
-        self._path = Path(path)
-        self.name = self._path.name
-        self.stem = self._path.stem
-        self.is_control = self._is_control_object()
-        self.suffix = self._get_suffix()
+        self._path = path
+
+    def __init_subclass__(cls, **kwargs):
+
+        super().__init_subclass__(**kwargs)
+
+        # allow file types to simply set suffix = "cub"
+        if isinstance(cls.__dict__.get("suffix"), str):
+            cls.suffix = _FileSuffix(cls.__dict__["suffix"])
+
+    @property
+    def _path(self) -> Path:
+
+        return Path(self._path_str)
+
+    @_path.setter
+    def _path(self, path) -> None:
+
+        self._path_str = os.fspath(path)
+
+    @property
+    def name(self) -> str:
+
+        return os.path.basename(self._path_str)
+
+    @property
+    def stem(self) -> str:
+
+        return os.path.splitext(self.name)[0]
+
+    @property
+    def is_control(self) -> bool:
+
+        return self._is_control_object()
 
     def __str__(self):
 
@@ -34,7 +90,7 @@ class TM1File:
 
     def _get_suffix(self):
 
-        return self._path.suffix[1:]
+        return os.path.splitext(self._path_str)[1][1:]
 
     def delete(self) -> int:
         """Deletes this file
@@ -54,17 +110,15 @@ class TM1File:
     def rename(self, new_name: str):
 
         # I feel there must be a more elegant way to do this
-        new_path = Path.joinpath(self._path.parent, f"{new_name}.{self.suffix}")
-        self._path = self._path.rename(new_path)
+        new_path = Path.joinpath(self._path.parent, f"{new_name}.{self._get_suffix()}")
 
-        # This could lead to some confusion about the difference b/w stem and name :shrug:
-        # Maybe there's a better way to handle this but let's just update the attribute
-        self.stem = self._path.stem
+        # name, stem etc are all derived from the path so are updated too
+        self._path = self._path.rename(new_path)
 
     def rename_suffix_to_lower(self):
 
         # a way to standardise all file extensions to lower case
-        new_path = Path.joinpath(self._path.parent, f"{self._stem}.{self._path.suffix.lower()}")
+        new_path = Path.joinpath(self._path.parent, f"{self.stem}{self._path.suffix.lower()}")
         self._path = self._path.rename(new_path)
 
     def strip_prefix(self):
@@ -91,9 +145,15 @@ class NonTM1File(TM1File):
 
     # Kind of a stupid name
 
+    __slots__ = ()
+
+    is_tm1_file = False
+
     def __init__(self, path):
 
         super().__init__(path)
 
-        self.is_control = False
-        self.is_tm1_file = False
+    @property
+    def is_control(self) -> bool:
+
+        return False
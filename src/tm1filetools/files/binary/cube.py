@@ -6,6 +6,8 @@ class TM1CubeFile(TM1BinaryFile):
     A class representation of a tm1 cube file
     """
 
+    __slots__ = ()
+
     suffix = "cub"
 
     def __init__(self, path):
@@ -18,6 +20,8 @@ class TM1AttributeCubeFile(TM1CubeFile):
     A class representation of a tm1 attribute cube file
     """
 
+    __slots__ = ()
+
     prefix = f"{TM1BinaryFile.attribute_prefix}"
 
     def __init__(self, path):
@@ -30,6 +34,8 @@ class TM1CellSecurityCubeFile(TM1CubeFile):
     A class representation of a tm1 cell security cube file
     """
 
+    __slots__ = ()
+
     prefix = f"{TM1CubeFile.control_prefix}CellSecurity_"
 
     def __init__(self, path):
@@ -42,6 +48,8 @@ class TM1PicklistCubeFile(TM1CubeFile):
     A class representation of a tm1 picklist cube file
     """
 
+    __slots__ = ()
+
     prefix = f"{TM1CubeFile.control_prefix}Picklist_"
 
     def __init__(self, path):
@@ -6,6 +6,8 @@ class TM1DimensionFile(TM1BinaryFile):
     A class representation of a tm1 dim file
     """
 
+    __slots__ = ()
+
     suffix = "dim"
 
     def __init__(self, path):
@@ -18,6 +20,8 @@ class TM1AttributeDimensionFile(TM1DimensionFile):
     A class representation of a tm1 dimension attribute dim file
     """
 
+    __slots__ = ()
+
     prefix = f"{TM1BinaryFile.attribute_prefix}"
 
     def __init__(self, path):
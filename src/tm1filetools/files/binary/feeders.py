@@ -6,6 +6,8 @@ class TM1FeedersFile(TM1BinaryFile):
     A class representation of a tm1 feeders file
     """
 
+    __slots__ = ()
+
     suffix = "feeders"
 
     def __init__(self, path):
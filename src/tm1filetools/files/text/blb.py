@@ -9,6 +9,8 @@ class TM1BLBFile(TM1TextFile):
 
     """
 
+    __slots__ = ()
+
     suffix = "blb"
 
     def __init__(self, path: Path):
@@ -10,6 +10,8 @@ class TM1CfgFile(TM1TextFile):
 
     """
 
+    __slots__ = ("config",)
+
     suffix = "cfg"
 
     # Could add a list of valid options here
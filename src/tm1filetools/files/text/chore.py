@@ -1,18 +1,168 @@
+from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Iterable, List, Optional, Union
 
 from .linecode import TM1LinecodeFile
 
 
+class TM1ChoreStep:
+    """
+    A process run by a chore and the values passed to its parameters
+
+    """
+
+    def __init__(self, process: str):
+
+        self.process: str = process
+        # parameter name -> value, in the order they appear in the file
+        self.parameters: dict = {}
+
+
+class TM1ChoreModel:
+    """
+    The parts of a chore that matter, as read from a .cho file
+
+    The steps are read the same way as the parameters of a process. The schedule (start_time, frequency
+    and active) hasn't been checked against a chore exported from a server, only a hand written one, so
+    don't rely on it until it has
+
+    """
+
+    def __init__(self):
+
+        self.name: Optional[str] = None
+
+        # the schedule, from codes 530, 531 and 532
+        self.start_time: Optional[datetime] = None
+        self.frequency: Optional[timedelta] = None
+        self.active: bool = False
+
+        self.steps: List[TM1ChoreStep] = []
+
+    def get_processes(self) -> List[str]:
+        """Returns the names of the processes run, in order"""
+
+        return [step.process for step in self.steps]
+
+
 class TM1ChoreFile(TM1LinecodeFile):
     """
-    A class representation of a tm1 TI process file
+    A class representation of a tm1 chore file
 
     """
 
+    # the parsed chore, read on first access
+    __slots__ = ("_model",)
+
     suffix = "cho"
 
+    # e.g. 530,20230101030000, see _parse_model for where the codes come from
+    _start_time_format = "%Y%m%d%H%M%S"
+
     def __init__(self, path: Path):
 
         super().__init__(path)
 
+        self._model: Optional[TM1ChoreModel] = None
+
     # A chore is just a text file that holds a name, processes to run and params, and scheduling information
+
+    def get_model(self) -> TM1ChoreModel:
+        """
+        Get the chore as parsed from the file. The file is read once and the result kept until it's written
+
+        Returns:
+            Chore model with the name, schedule and the steps
+
+        """
+
+        if self._model is None:
+            with open(self._path, "r") as f:
+                self._model = self._parse_model(f)
+
+            # the name isn't always in the file
+            self._model.name = self._model.name or self.stem
+
+        return self._model
+
+    def _reset_file_properties(self):
+
+        super()._reset_file_properties()
+
+        self._model = None
+
+    @classmethod
+    def _parse_model(cls, lines: Iterable[str]) -> TM1ChoreModel:
+
+        # a single pass over the lines
+        # the schedule comes first, then each step starts with a 6 line and has blocks for parameter names (560)
+        # and values (590), which are name,value pairs
+        # 601, 602, 560 and 590 mean the same as they do in .pro files, which we have real exports of
+        # the schedule codes (530 start time, 531 frequency, 532 active) haven't been checked against a chore
+        # exported from a server, the chore in the test artifacts is written by hand to the same layout,
+        # so treat start_time, frequency and active as a best guess until they have been
+        model = TM1ChoreModel()
+
+        block_code = None
+        remaining = 0
+
+        for line in lines:
+
+            line = line.rstrip()
+
+            if remaining:
+
+                remaining = remaining - 1
+
+                if block_code == "590" and model.steps:
+                    name, _, value = line.partition(cls.code_delimiter)
+                    model.steps[-1].parameters[name] = cls._parse_value(value)
+
+                continue
+
+            code, _, value = line.partition(cls.code_delimiter)
+
+            # the first line may have a bom
+            code = code.lstrip("\ufeff")
+
+            if code in ("560", "590"):
+                block_code = code
+                remaining = int(value) if value else 0
+            elif code == "6":
+                model.steps.append(TM1ChoreStep(cls._parse_single_string(line)))
+            elif code == "602" and model.name is None:
+                model.name = cls._parse_single_string(line)
+            elif code == "530" and value:
+                model.start_time = datetime.strptime(value, cls._start_time_format)
+            elif code == "531" and value:
+                model.frequency = cls._parse_frequency(value)
+            elif code == "532":
+                model.active = value == "1"
+
+        return model
+
+    @staticmethod
+    def _parse_frequency(value: str) -> timedelta:
+
+        # the last six digits are hours, minutes and seconds, anything before them is days
+        # e.g. 001000000 is daily, 000010000 hourly
+        value = value.zfill(6)
+        days = value[:-6] or "0"
+        hours, minutes, seconds = value[-6:-4], value[-4:-2], value[-2:]
+
+        return timedelta(days=int(days), hours=int(hours), minutes=int(minutes), seconds=int(seconds))
+
+    @classmethod
+    def _parse_value(cls, value: str) -> Union[str, int, float]:
+
+        # strings are quoted, numbers aren't
+        if value.startswith(cls.code_quote):
+            return value.strip(cls.code_quote)
+
+        try:
+            return int(value)
+        except ValueError:
+            try:
+                return float(value)
+            except ValueError:
+                return value
@@ -1,8 +1,21 @@
+import bisect
 import csv
+import itertools
+import math
+import operator
+import re
+from array import array
 from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from .text import TM1TextFile
 
+# numpy is optional, see TM1CMAColumns
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class TM1CMARow:
     def __init__(self, row):
@@ -27,6 +40,251 @@ class TM1CMARow:
             self.dt = "S"
 
 
+class TM1CMAFilter:
+    """
+    A filter on the elements of the rows of a cma file
+
+    Conditions are added per position (i.e. dimension, starting at 0) and a row has to meet all of them.
+    Each condition can be an exact element, a set of elements, a prefix or a regular expression that
+    has to match the whole element and any of them can be negated, e.g.
+
+        TM1CMAFilter().isin(0, ["BP", "FC"]).startswith(1, "2023").equals(3, "Total", negate=True)
+
+    The conditions are compiled to plain functions as they're added so the filter can be applied to
+    the raw rows from the csv reader before anything else is done with them. It can be reused across
+    files and sent to worker processes.
+
+    """
+
+    def __init__(self):
+
+        # (position, function, negate) in the order they're checked, the cheapest first
+        self._tests: List[Tuple[int, Callable[[str], object], bool]] = []
+        self._costs: List[int] = []
+
+    def __bool__(self) -> bool:
+
+        return bool(self._tests)
+
+    @classmethod
+    def from_string(cls, el_string: str) -> "TM1CMAFilter":
+        """Creates a filter from elements separated by colons, e.g. "202301::Germany", blanks match anything"""
+
+        el_filter = cls()
+
+        for position, element in enumerate(TM1CMAFile._parse_els(el_string)):
+            if element != "":
+                el_filter.equals(position, element)
+
+        return el_filter
+
+    def equals(self, position: int, element: str, negate: bool = False) -> "TM1CMAFilter":
+        """Adds a condition that the element at a position is a given element"""
+
+        return self._add(position, frozenset([element]).__contains__, negate, 0)
+
+    def isin(self, position: int, elements: Iterable[str], negate: bool = False) -> "TM1CMAFilter":
+        """Adds a condition that the element at a position is one of a set of elements"""
+
+        return self._add(position, frozenset(elements).__contains__, negate, 0)
+
+    def startswith(self, position: int, prefix: str, negate: bool = False) -> "TM1CMAFilter":
+        """Adds a condition that the element at a position starts with a prefix"""
+
+        return self._add(position, operator.methodcaller("startswith", prefix), negate, 1)
+
+    def matches(self, position: int, pattern: str, negate: bool = False) -> "TM1CMAFilter":
+        """Adds a condition that the element at a position matches a regular expression, all of it"""
+
+        return self._add(position, re.compile(pattern).fullmatch, negate, 2)
+
+    def match(self, elements: List[str]) -> bool:
+        """Returns True if a list of elements, in order, meets all the conditions"""
+
+        return self._match(elements, 0)
+
+    def match_row(self, row: List[str]) -> bool:
+        """Returns True if a row from a cma file meets all the conditions, the first column is the cube"""
+
+        return self._match(row, 1)
+
+    def _match(self, values: List[str], offset: int) -> bool:
+
+        try:
+            for position, test, negate in self._tests:
+                # a match is anything truthy, e.g. a re.Match
+                if (not test(values[position + offset])) != negate:
+                    return False
+        except IndexError:
+            # the row doesn't have the position
+            return False
+
+        return True
+
+    def _add(self, position: int, test: Callable[[str], object], negate: bool, cost: int) -> "TM1CMAFilter":
+
+        # keep the cheap tests at the front
+        index = bisect.bisect_right(self._costs, cost)
+
+        self._costs.insert(index, cost)
+        self._tests.insert(index, (position, test, negate))
+
+        return self
+
+
+class TM1CMAColumns:
+    """
+    The cells of a cma file held in columns rather than as a row object per cell
+
+    Each element column is dictionary encoded, i.e. held as integer codes with a list per position to look up
+    the element name of each code. Values are held as floats, with string values kept to one side along with
+    the row they belong to (the float is nan for those rows).
+
+    The columns are numpy arrays if numpy is installed (pip install tm1filetools[numpy]), otherwise they are
+    arrays from the standard library, which are just as compact but slower to filter and aggregate.
+
+    """
+
+    def __init__(self, cube: Optional[str], width: int, use_numpy: bool):
+
+        self.cube: Optional[str] = cube
+        self.numpy: bool = use_numpy
+
+        # the element name of each code, per position
+        self.elements: List[List[str]] = [[] for _ in range(width)]
+        # and the other way round
+        self._lookups: List[Dict[str, int]] = [{} for _ in range(width)]
+
+        # the code of the element of each row, per position
+        self.codes: list = [array("i") for _ in range(width)]
+        self.values = array("d")
+
+        # the rows with string values and the values
+        self.string_rows = array("q")
+        self.string_values: List[str] = []
+
+    def __len__(self) -> int:
+
+        return len(self.values)
+
+    @property
+    def width(self) -> int:
+        """The number of element columns, i.e. dimensions in the cube"""
+
+        return len(self.elements)
+
+    def get_code(self, position: int, element: str) -> Optional[int]:
+        """Returns the code of an element at a position or None if it's not in the file"""
+
+        return self._lookups[position].get(element)
+
+    def get_row(self, row: int) -> Tuple[List[str], object]:
+        """Returns the elements and the value of a row, the value is a float or a string"""
+
+        elements = [self.elements[i][self.codes[i][row]] for i in range(self.width)]
+        value = self.values[row]
+
+        if math.isnan(value):
+            # the string rows are in order
+            index = bisect.bisect_left(self.string_rows, row)
+
+            if index < len(self.string_rows) and self.string_rows[index] == row:
+                return elements, self.string_values[index]
+
+        return elements, float(value)
+
+    def get_mask(self, position: int, elements: Iterable[str], mask=None):
+        """Returns a mask of the rows with one of a set of elements at a position
+
+        Args:
+            position: The position of the dimension, starting at 0
+            elements: The elements to match
+            mask: Optionally, a mask to combine with (and)
+
+        Returns:
+            A numpy array of bools, or an array of 0 and 1 without numpy
+        """
+
+        wanted = {code for code in (self.get_code(position, e) for e in elements) if code is not None}
+        codes = self.codes[position]
+
+        if self.numpy:
+            result = np.isin(codes, list(wanted))
+            return result if mask is None else result & mask
+
+        if mask is None:
+            return array("b", [code in wanted for code in codes])
+
+        return array("b", [m and code in wanted for code, m in zip(codes, mask)])
+
+    def sum_by(self, positions: List[int], mask=None) -> Dict[Tuple[str, ...], float]:
+        """Returns the sum of the numeric values grouped by the elements at some positions
+
+        Args:
+            positions: The positions of the dimensions to group by, e.g. [0, 1] for the first two
+            mask: Optionally, a mask of the rows to include, see get_mask
+
+        Returns:
+            Dict of sums keyed by tuples of element names
+        """
+
+        return {key: total for key, (total, _) in self._aggregate(positions, mask).items()}
+
+    def count_by(self, positions: List[int], mask=None) -> Dict[Tuple[str, ...], int]:
+        """Returns the number of numeric cells grouped by the elements at some positions, see sum_by"""
+
+        return {key: count for key, (_, count) in self._aggregate(positions, mask).items()}
+
+    def _aggregate(self, positions: List[int], mask=None) -> Dict[Tuple[str, ...], Tuple[float, int]]:
+
+        if self.numpy:
+            return self._aggregate_numpy(positions, mask)
+
+        totals = {}
+        columns = [self.codes[p] for p in positions]
+
+        for row, value in enumerate(self.values):
+
+            # nan is never equal to itself, i.e. skip the string cells
+            if value != value or (mask is not None and not mask[row]):
+                continue
+
+            codes = tuple(column[row] for column in columns)
+            total, count = totals.get(codes, (0.0, 0))
+            totals[codes] = (total + value, count + 1)
+
+        return {self._decode(positions, codes): result for codes, result in totals.items()}
+
+    def _aggregate_numpy(self, positions: List[int], mask=None) -> Dict[Tuple[str, ...], Tuple[float, int]]:
+
+        selected = ~np.isnan(self.values)
+
+        if mask is not None:
+            selected = selected & mask
+
+        if not positions:
+            count = int(selected.sum())
+
+            # no group at all if nothing is selected, the same as without numpy
+            return {(): (float(self.values[selected].sum()), count)} if count else {}
+
+        keys = np.stack([self.codes[p][selected] for p in positions], axis=1)
+        groups, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+
+        totals = np.bincount(inverse, weights=self.values[selected], minlength=len(groups))
+        counts = np.bincount(inverse, minlength=len(groups))
+
+        return {
+            self._decode(positions, codes): (float(total), int(count))
+            for codes, total, count in zip(groups.tolist(), totals, counts)
+        }
+
+    def _decode(self, positions: List[int], codes: Iterable[int]) -> Tuple[str, ...]:
+
+        return tuple(self.elements[p][code] for p, code in zip(positions, codes))
+
+
 class TM1CMAFile(TM1TextFile):
     """
     A class representation of a tm1 CMA file
@@ -35,6 +293,9 @@ class TM1CMAFile(TM1TextFile):
 
     """
 
+    # both read from the file on first access
+    __slots__ = ("_delimiter", "_cube")
+
     suffix = "cma"
     # does this vary? I think it does for cmas based on locale
     quote_character = '"'
@@ -43,9 +304,34 @@ class TM1CMAFile(TM1TextFile):
 
         super().__init__(path)
 
-        self.delimiter = self._get_delimiter()
+        self._delimiter: Optional[str] = None
+        self._cube: Optional[str] = None
+
+    @property
+    def delimiter(self) -> Optional[str]:
+        """The delimiter between columns, read from the first line on first access, None if the file is empty"""
+
+        # None means an empty file, checking again is cheap as is_non_empty is kept
+        if self._delimiter is None:
+            self._delimiter = self._get_delimiter()
+
+        return self._delimiter
+
+    @property
+    def cube(self) -> Optional[str]:
+        """The name of the cube, read from the first row on first access, None if the file is empty"""
+
+        if self._cube is None:
+            self._cube = self._get_cube()
+
+        return self._cube
 
-        self.cube = self._get_cube()
+    def _reset_file_properties(self):
+
+        super()._reset_file_properties()
+
+        self._delimiter = None
+        self._cube = None
 
     def _get_delimiter(self):
 
@@ -71,47 +357,170 @@ class TM1CMAFile(TM1TextFile):
 
         return row.cube
 
-    def reader(self, dt: str = None, el_filter: str = None):
+    def reader(self, dt: str = None, el_filter: Union[str, TM1CMAFilter, None] = None):
         """
         A generator that reads each line of the cma and yields every row matching the applied filters
 
+        Args:
+            dt: Only rows with numeric (N) or string (S) values
+            el_filter: Only rows matching a filter, either a TM1CMAFilter or elements separated by colons
+
         """
 
         if self._path.exists:
-            # hack
-            if not self.delimiter:
-                self.delimiter = self._get_delimiter()
 
-            with open(self._path, "r") as f:
-                for row in csv.reader(f, delimiter=self.delimiter, quotechar=self.quote_character):
+            for row in self.read_rows(el_filter=el_filter):
+
+                row_obj = TM1CMARow(row)
+
+                # filter for n or s values
+                if dt and row_obj.dt.lower() != dt.lower():
+                    continue
+
+                yield row_obj
+
+    def read_rows(self, el_filter: Union[str, TM1CMAFilter, None] = None) -> Iterator[List[str]]:
+        """
+        A generator that yields each row matching a filter as it comes from the csv reader, i.e. a list of strings
+        with the server and cube first and the value last. Much faster than reader for large files
+
+        Args:
+            el_filter: Only rows matching a filter, either a TM1CMAFilter or elements separated by colons
 
-                    row_obj = TM1CMARow(row)
+        """
+
+        # an empty file
+        if not self.delimiter:
+            return
+
+        # compiled once rather than for every row
+        el_filter = self._get_filter(el_filter)
+
+        with open(self._path, "r") as f:
+            for row in csv.reader(f, delimiter=self.delimiter, quotechar=self.quote_character):
+
+                # skip blank lines and the rows that can't match before doing anything else with them
+                if row and (not el_filter or el_filter.match_row(row)):
+                    yield row
+
+    def load_columns(
+        self,
+        chunk_size: int = 100000,
+        use_numpy: Optional[bool] = None,
+        el_filter: Union[str, TM1CMAFilter, None] = None,
+    ) -> TM1CMAColumns:
+        """
+        Reads the whole file into columns, without creating an object per row
+
+        Args:
+            chunk_size: Number of rows to read before converting the values and adding them to the columns
+            use_numpy: Use numpy arrays, defaults to using numpy if it's installed
+            el_filter: Only rows matching a filter, either a TM1CMAFilter or elements separated by colons
+
+        Returns:
+            The cells of the file as columns
+
+        """
+
+        if use_numpy is None:
+            use_numpy = np is not None
+
+        if use_numpy and np is None:
+            raise ImportError("numpy is not installed, try pip install tm1filetools[numpy]")
+
+        columns = None
+        rows = self.read_rows(el_filter=el_filter)
+
+        while True:
+
+            chunk = list(itertools.islice(rows, chunk_size))
+
+            if not chunk:
+                break
 
-                    # filter for n or s values
-                    if dt and row_obj.dt.lower() != dt.lower():
-                        continue
+            if columns is None:
+                columns = TM1CMAColumns(chunk[0][0].split(":")[-1], len(chunk[0]) - 2, use_numpy)
 
-                    # apply element filter
+            self._add_chunk(chunk, columns)
 
-                    if el_filter:
+        if columns is None:
+            return TM1CMAColumns(None, 0, use_numpy)
 
-                        els = self._parse_els(el_filter)
+        columns.elements = [list(lookup) for lookup in columns._lookups]
 
-                        # naive approach
-                        skip = False
-                        for i, el in enumerate(els):
+        if use_numpy:
+            # no copy, the arrays are used as the buffers
+            columns.codes = [np.frombuffer(column, dtype=np.int32) for column in columns.codes]
+            columns.values = np.frombuffer(columns.values, dtype=np.float64)
+            columns.string_rows = np.frombuffer(columns.string_rows, dtype=np.int64)
 
-                            if el == "":
-                                continue
+        return columns
 
-                            if el != row_obj.elements[i]:
-                                skip = True
-                                break
+    def _add_chunk(self, chunk: List[list], columns: TM1CMAColumns) -> None:
+
+        # rows should all be the same length, the number of dimensions plus the cube and value
+        if any(len(row) != columns.width + 2 for row in chunk):
+            raise ValueError(f"Rows of different lengths in {self._path}")
+
+        for position, lookup in enumerate(columns._lookups):
+
+            # setdefault gives the next code to elements not seen before
+            columns.codes[position].extend([lookup.setdefault(row[position + 1], len(lookup)) for row in chunk])
+
+        raw = [row[-1] for row in chunk]
+
+        try:
+            # most chunks will be all numbers, so convert them in one go
+            columns.values.extend(array("d", map(float, raw)))
+            return
+        except ValueError:
+            pass
+
+        offset = len(columns.values)
+
+        for index, value in enumerate(raw):
+            try:
+                columns.values.append(float(value))
+            except ValueError:
+                columns.values.append(math.nan)
+                columns.string_rows.append(offset + index)
+                columns.string_values.append(value)
+
+    @classmethod
+    def format_row(cls, row: List[str], delimiter: str = ",") -> str:
+        """
+        Returns a row as a line of a cma file, without the line break
+
+        Args:
+            row: The server and cube, the elements and the value, as from read_rows
+            delimiter: The delimiter between columns, e.g. the delimiter of the file the row came from
+
+        Returns:
+            The line, with the elements quoted and the value too if it's a string
+
+        """
+
+        try:
+            float(row[-1])
+            value = row[-1]
+        except ValueError:
+            value = cls._quote(row[-1])
+
+        return delimiter.join([cls._quote(v) for v in row[:-1]] + [value])
+
+    @classmethod
+    def _quote(cls, value: str) -> str:
+
+        # quotes in the value are doubled
+        return cls.quote_character + value.replace(cls.quote_character, cls.quote_character * 2) + cls.quote_character
+
+    @staticmethod
+    def _get_filter(el_filter: Union[str, TM1CMAFilter, None]) -> Optional[TM1CMAFilter]:
 
-                        if skip:
-                            continue
+        if isinstance(el_filter, str):
+            return TM1CMAFilter.from_string(el_filter)
 
-                    yield row_obj
+        return el_filter
 
     @staticmethod
     def _parse_els(el_string: str):
@@ -0,0 +1,171 @@
+import codecs
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from chardet import UniversalDetector
+
+
+class TM1EncodingDetector:
+    """
+    Detects the encoding of text files without reading the whole file
+
+    A byte order mark is checked first. Otherwise, chardet's incremental detector is fed
+    chunks from the start of the file until it's confident or the sample size is reached.
+
+    Results are cached against the path, size and modified time of the file so an unchanged
+    file is only ever checked once. If a cache file is provided, the cache can be saved and
+    reused between runs.
+
+    """
+
+    # utf-32 le has to be checked before utf-16 le as its bom starts with the same bytes
+    _boms = [
+        (codecs.BOM_UTF32_LE, "UTF-32"),
+        (codecs.BOM_UTF32_BE, "UTF-32"),
+        (codecs.BOM_UTF8, "UTF-8-SIG"),
+        (codecs.BOM_UTF16_LE, "UTF-16"),
+        (codecs.BOM_UTF16_BE, "UTF-16"),
+    ]
+
+    # tried in order when the sample is ascii, latin-1 can decode any bytes so it's the last resort
+    _fallbacks = ["utf-8", "cp1252", "latin-1"]
+
+    _block_size = 1 << 20
+
+    def __init__(self, sample_size: int = 64 * 1024, chunk_size: int = 4 * 1024, cache_file: Optional[Path] = None):
+
+        self.sample_size: int = sample_size
+        self.chunk_size: int = chunk_size
+
+        # path -> [size, mtime, encoding], lists rather than tuples so it survives a round trip to json
+        self._cache: Dict[str, List] = {}
+        self._cache_file: Optional[Path] = cache_file
+
+        if self._cache_file:
+            self.load()
+
+    def detect(self, path: Path) -> Optional[str]:
+        """Return the encoding of a file, using the cached result if the file hasn't changed
+
+        Args:
+            path: Path of the file to check
+
+        Returns:
+            The name of the encoding or None if the file doesn't exist or it can't be determined
+        """
+
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+
+        key = str(path)
+
+        cached = self._cache.get(key)
+
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+
+        encoding = self._detect(path)
+
+        self._cache[key] = [stat.st_size, stat.st_mtime_ns, encoding]
+
+        return encoding
+
+    def get_read_encoding(self, path: Path, encoding: Optional[str]) -> Optional[str]:
+        """Return an encoding the whole of a file can be decoded with, given the encoding detected
+
+        Only the start of a file is sampled, which may be all ascii when something further on isn't. For those
+        files, the whole file is checked against utf-8, then cp1252 and then latin-1
+
+        Args:
+            path: Path of the file
+            encoding: The encoding detected from the sample
+
+        Returns:
+            The name of the encoding, the same as detected unless that was ascii
+        """
+
+        if not encoding or encoding.lower() != "ascii":
+            return encoding
+
+        for fallback in self._fallbacks:
+            if self._can_decode(path, fallback):
+                return fallback
+
+        return encoding
+
+    def load(self) -> None:
+        """Load previously detected encodings from the cache file, if it exists"""
+
+        if self._cache_file and self._cache_file.exists():
+            with open(self._cache_file, "r") as f:
+                self._cache.update(json.load(f))
+
+    def save(self) -> None:
+        """Write the detected encodings to the cache file so they can be reused"""
+
+        if self._cache_file:
+            with open(self._cache_file, "w") as f:
+                json.dump(self._cache, f)
+
+    def get_cached(self) -> Dict[str, List]:
+        """Returns the cached results as a dict of [size, mtime (ns), encoding] lists keyed by path"""
+
+        return dict(self._cache)
+
+    def add_cached(self, path: str, size: int, mtime_ns: int, encoding: Optional[str]) -> None:
+        """Adds a result detected elsewhere (e.g. stored in a catalog) to the cache"""
+
+        self._cache[path] = [size, mtime_ns, encoding]
+
+    def clear(self) -> None:
+        """Forget all detected encodings"""
+
+        self._cache = {}
+
+    def _detect(self, path: Path) -> Optional[str]:
+
+        with open(path, "rb") as f:
+
+            head = f.read(4)
+
+            for bom, encoding in self._boms:
+                if head.startswith(bom):
+                    return encoding
+
+            detector = UniversalDetector()
+            detector.feed(head)
+            read = len(head)
+
+            # stop as soon as chardet has made up its mind
+            while not detector.done and read < self.sample_size:
+
+                chunk = f.read(min(self.chunk_size, self.sample_size - read))
+
+                if not chunk:
+                    break
+
+                detector.feed(chunk)
+                read = read + len(chunk)
+
+            detector.close()
+
+        return detector.result["encoding"]
+
+    def _can_decode(self, path: Path, encoding: str) -> bool:
+
+        decoder = codecs.getincrementaldecoder(encoding)()
+
+        try:
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(self._block_size), b""):
+                    decoder.decode(block)
+
+            decoder.decode(b"", final=True)
+
+        except (UnicodeDecodeError, FileNotFoundError):
+            return False
+
+        return True
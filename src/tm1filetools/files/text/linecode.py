@@ -1,5 +1,5 @@
-import itertools
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 from .text import TM1TextFile
 
@@ -13,6 +13,9 @@ class TM1LinecodeFile(TM1TextFile):
 
     """
 
+    # the lines of the file and where each code is, read once on first access
+    __slots__ = ("_lines", "_code_index", "_blocks")
+
     # That is the separator used in lines, not say the datasource
     # I think it's always a comma but need to check
     code_delimiter = ","
@@ -28,33 +31,63 @@ class TM1LinecodeFile(TM1TextFile):
 
         super().__init__(path)
 
-    def _get_line_by_index(self, index: int, rstrip=True):
+        self._lines: Optional[List[str]] = None
+        # code -> index of the first line with that code
+        self._code_index: Optional[Dict[str, int]] = None
+        # code -> (start, end) indexes of the lines of a multiline block
+        self._blocks: Optional[Dict[str, Tuple[int, int]]] = None
 
-        return next(itertools.islice(self.reader(rstrip=rstrip), index, index + 1))
+    def _get_lines(self) -> List[str]:
 
-    def _get_line_by_code(self, linecode: int, rstrip=True):
+        if self._lines is None:
+            self._parse()
+
+        return self._lines
+
+    def _parse(self) -> None:
+
+        # keep the lines as read (i.e. with the newline) so they can still be returned unstripped
+        with open(self._path, "r") as f:
+            self._lines = f.readlines()
+
+        self._code_index = {}
+        self._blocks = {}
 
-        # Are lines ever duplicated?
-        lines = self.reader(rstrip=rstrip)
+        for index, line in enumerate(self._lines):
 
-        for line in lines:
+            code = line.rstrip().split(self.code_delimiter)[0]
 
-            code = line.split(self.code_delimiter)[0]
+            # Are lines ever duplicated? If so, the first one wins
+            if code not in self._code_index:
+                self._code_index[code] = index
 
-            if code == str(linecode):
-                return line
+    def _get_line_by_index(self, index: int, rstrip=True):
+
+        line = self._get_lines()[index]
+
+        return line.rstrip() if rstrip else line
+
+    def _get_line_by_code(self, linecode: int, rstrip=True):
+
+        index = self._get_line_index_by_code(linecode)
+
+        if index is not None:
+            return self._get_line_by_index(index, rstrip=rstrip)
 
     def _get_line_index_by_code(self, linecode: int):
 
-        # Are lines ever duplicated?
-        lines = self.reader()
+        self._get_lines()
+
+        return self._code_index.get(str(linecode))
 
-        for index, line in enumerate(lines):
+    def _reset_file_properties(self):
 
-            code = line.split(self.code_delimiter)[0]
+        super()._reset_file_properties()
 
-            if code == str(linecode):
-                return index
+        # read it again next time
+        self._lines = None
+        self._code_index = None
+        self._blocks = None
 
     @classmethod
     def _parse_single_int(cls, line: str) -> int:
@@ -122,24 +155,27 @@ class TM1LinecodeFile(TM1TextFile):
 
         """
 
-        # get the index and the line for this code
-        index = self._get_line_index_by_code(linecode)
-        line = self._get_line_by_code(linecode)
-
-        # parse the line to get the number of lines
-        number_of_lines = self._parse_single_int(line)
+        start, end = self._get_block_bounds(linecode)
 
-        # This isn't the most elegant but the size of these chunks is unlikely to be large
-        lines = []
-
-        # loop over the next n lines
-        index = index + 1
-        for i in range(index, index + number_of_lines):
-
-            line = self._get_line_by_index(i, rstrip=rstrip)
-            lines.append(line)
+        lines = self._get_lines()[start:end]
 
         if rstrip:
             return [line.rstrip() for line in lines]
 
         return lines
+
+    def _get_block_bounds(self, linecode: int) -> Tuple[int, int]:
+
+        self._get_lines()
+
+        key = str(linecode)
+
+        if key not in self._blocks:
+
+            # the line with the code holds the number of lines that follow it
+            index = self._get_line_index_by_code(linecode)
+            number_of_lines = self._parse_single_int(self._get_line_by_index(index))
+
+            self._blocks[key] = (index + 1, index + 1 + number_of_lines)
+
+        return self._blocks[key]
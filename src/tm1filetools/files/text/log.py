@@ -12,6 +12,8 @@ class TM1LogFile(TM1TextFile):
 
     """
 
+    __slots__ = ()
+
     suffix = "log"
 
     def __init__(self, path: Path):
@@ -25,6 +27,8 @@ class TM1ProcessErorrLogFile(TM1LogFile):
 
     """
 
+    __slots__ = ("process", "timestamp")
+
     prefix = "TM1ProcessError_"
 
     def __init__(self, path: Path):
@@ -80,6 +84,8 @@ class TM1ChangeLogFile(TM1LogFile):
 
     """
 
+    __slots__ = ()
+
     metadata_prefix = "#"
     delimiter = ","
     quote = '"'
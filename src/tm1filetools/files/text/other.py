@@ -10,6 +10,8 @@ class TM1LoginCfgFile(TM1TextFile):
 
     """
 
+    __slots__ = ("_valid_params", "config", "_section", "_params")
+
     def __init__(self, path: Path, section: str):
 
         # list of valid params
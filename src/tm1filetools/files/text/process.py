@@ -1,9 +1,36 @@
 import json
+import os
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from .linecode import TM1LinecodeFile
 
 
+class TM1ProcessModel:
+    """
+    The parts of a TI process that matter, as read from a .pro file
+
+    Code tabs are lists of lines as they appear in the file (i.e. with the newline), parameters,
+    variables and the datasource are dicts in the format of the json representation of a process
+
+    """
+
+    def __init__(self):
+
+        self.name: Optional[str] = None
+
+        self.prolog: List[str] = []
+        self.metadata: List[str] = []
+        self.data: List[str] = []
+        self.epilog: List[str] = []
+
+        self.parameters: List[dict] = []
+        self.variables: List[dict] = []
+        self.datasource: dict = {"Type": "None"}
+
+        self.has_security_access: bool = False
+
+
 class TM1ProcessFile(TM1LinecodeFile):
     """
     A class representation of a tm1 TI process file. A TM1 .pro file
@@ -11,8 +38,34 @@ class TM1ProcessFile(TM1LinecodeFile):
 
     """
 
+    # the parsed process, read on first access
+    __slots__ = ("_model",)
+
     suffix = "pro"
 
+    # codes followed by a block of lines, the value on the line is the number of lines in the block
+    # e.g. 560 is the parameter names, 572 to 575 the code tabs
+    _multiline_codes = {
+        "560",
+        "561",
+        "566",
+        "572",
+        "573",
+        "574",
+        "575",
+        "577",
+        "578",
+        "579",
+        "580",
+        "581",
+        "582",
+        "590",
+        "637",
+    }
+
+    # the code tabs and the attribute of the model holding each one
+    _code_tab_codes = {"572": "prolog", "573": "metadata", "574": "data", "575": "epilog"}
+
     # three line auto generated code where code tabs are empty
     _code_block_prefix_lines = ["", "#****Begin: Generated Statements***", "#****End: Generated Statements****"]
 
@@ -24,6 +77,23 @@ class TM1ProcessFile(TM1LinecodeFile):
 
         super().__init__(path)
 
+        self._model: Optional[TM1ProcessModel] = None
+
+    def get_model(self) -> TM1ProcessModel:
+        """
+        Get the process as parsed from the file. The file is read once and the result kept until it's written
+
+        Returns:
+            Process model with the name, code tabs, parameters, variables, datasource and security flag
+
+        """
+
+        if self._model is None:
+            with open(self._path, "r") as f:
+                self._model = self._parse_model(f)
+
+        return self._model
+
     def get_prolog_code(self, rstrip=True) -> list[str]:
         """
         Get a list of strings representing each line of code in the prolog
@@ -36,9 +106,7 @@ class TM1ProcessFile(TM1LinecodeFile):
 
         """
 
-        linecode = 572
-
-        return self._get_multiline_block(linecode, rstrip=rstrip)
+        return self._get_code_lines(self.get_model().prolog, rstrip=rstrip)
 
     def get_metadata_code(self, rstrip=True) -> list[str]:
         """
@@ -51,9 +119,8 @@ class TM1ProcessFile(TM1LinecodeFile):
             List of strings, one for each line in the metadata tab
 
         """
-        linecode = 573
 
-        return self._get_multiline_block(linecode, rstrip=rstrip)
+        return self._get_code_lines(self.get_model().metadata, rstrip=rstrip)
 
     def get_data_code(self, rstrip=True) -> list[str]:
         """
@@ -67,9 +134,7 @@ class TM1ProcessFile(TM1LinecodeFile):
 
         """
 
-        linecode = 574
-
-        return self._get_multiline_block(linecode, rstrip=rstrip)
+        return self._get_code_lines(self.get_model().data, rstrip=rstrip)
 
     def get_epilog_code(self, rstrip=True) -> list[str]:
         """
@@ -83,126 +148,232 @@ class TM1ProcessFile(TM1LinecodeFile):
 
         """
 
-        linecode = 575
+        return self._get_code_lines(self.get_model().epilog, rstrip=rstrip)
 
-        return self._get_multiline_block(linecode, rstrip=rstrip)
+    def write_model(self, model: Optional[TM1ProcessModel] = None) -> None:
+        """
+        Write the code tabs of a process model back to the file, everything else in the file is kept as it is
 
-    def _to_json(self, sort_keys: bool = True, rstrip: bool = True):
+        The line counts of the code tabs are regenerated, so lines can be added and removed freely. The new
+        content goes to a temporary file first, which then replaces the file, so it's never left half written
 
-        name = self._parse_single_string(self._get_line_by_code(602))
+        Args:
+            model: The process model to write, defaults to the model of this file, e.g. after editing its code
+
+        """
+
+        text = self._to_pro(model or self.get_model())
+
+        temp_path = self._path.with_name(f"{self._path.name}.tmp")
+
+        with open(temp_path, "w", newline="") as f:
+            f.write(text)
+
+        os.replace(temp_path, self._path)
+
+        self._reset_file_properties()
+
+    def _to_pro(self, model: TM1ProcessModel) -> str:
+
+        # newline="" so the line endings of the file are kept
+        with open(self._path, "r", newline="") as f:
+            return "".join(self._serialize(f.readlines(), model))
+
+    @classmethod
+    def _serialize(cls, lines: List[str], model: TM1ProcessModel) -> Iterator[str]:
+
+        # the same single pass as parsing, copying every line apart from the code tabs, which come from the model
+        newline = "\r\n" if lines and lines[0].endswith("\r\n") else "\n"
 
-        prolog = self._codeblock_to_json_str(self.get_prolog_code())
-        metadata = self._codeblock_to_json_str(self.get_metadata_code())
-        data = self._codeblock_to_json_str(self.get_data_code())
-        epilog = self._codeblock_to_json_str(self.get_epilog_code())
+        written = set()
+        copy = True
+        remaining = 0
 
-        security_access = self._parse_single_int(self._get_line_by_code(1217))
-        security_access = security_access == 1
+        for line in lines:
+
+            if remaining:
+                remaining = remaining - 1
+                if copy:
+                    yield line
+                continue
+
+            code, _, value = line.rstrip().partition(cls.code_delimiter)
+
+            if code in cls._multiline_codes:
+
+                remaining = int(value) if value else 0
+
+                # as in parsing, if a tab is duplicated the first one wins and the rest are copied
+                copy = code not in cls._code_tab_codes or code in written
 
-        parameters = self._get_parameters()
-        variables = self._get_variables()
+                if not copy:
+                    written.add(code)
+                    yield from cls._serialize_code_tab(code, getattr(model, cls._code_tab_codes[code]), newline)
+                    continue
 
-        datasource = self._get_datasource()
+            yield line
+
+    @classmethod
+    def _serialize_code_tab(cls, code: str, tab: List[str], newline: str) -> List[str]:
+
+        # a line given with line breaks in it is written as several lines, so the count is right
+        code_lines = [part.rstrip("\r") for line in tab for part in line.rstrip("\r\n").split("\n")]
+
+        return [f"{code}{cls.code_delimiter}{len(code_lines)}{newline}"] + [line + newline for line in code_lines]
+
+    def _to_json(self, sort_keys: bool = True, rstrip: bool = True, indent: Optional[int] = 4):
+
+        model = self.get_model()
 
         json_dump = {
-            "Name": name,
-            "PrologProcedure": prolog,
-            "MetadataProcedure": metadata,
-            "DataProcedure": data,
-            "EpilogProcedure": epilog,
-            "HasSecurityAccess": security_access,
-            "Parameters": parameters,
-            "Variables": variables,
-            "DataSource": datasource,
+            "Name": model.name,
+            "PrologProcedure": self._codeblock_to_json_str(self.get_prolog_code()),
+            "MetadataProcedure": self._codeblock_to_json_str(self.get_metadata_code()),
+            "DataProcedure": self._codeblock_to_json_str(self.get_data_code()),
+            "EpilogProcedure": self._codeblock_to_json_str(self.get_epilog_code()),
+            "HasSecurityAccess": model.has_security_access,
+            "Parameters": model.parameters,
+            "Variables": model.variables,
+            "DataSource": model.datasource,
         }
 
-        return json.dumps(json_dump, sort_keys=sort_keys, indent=4)
+        return json.dumps(json_dump, sort_keys=sort_keys, indent=indent)
 
     def _get_parameters(self) -> list:
 
-        # What does the json look like with no params?
-        params = []
+        return self.get_model().parameters
+
+    def _get_variables(self) -> list:
+
+        return self.get_model().variables
+
+    def _get_datasource(self) -> dict:
+
+        return self.get_model().datasource
+
+    def _reset_file_properties(self):
+
+        super()._reset_file_properties()
+
+        self._model = None
+
+    @classmethod
+    def _parse_model(cls, lines: Iterable[str]) -> TM1ProcessModel:
+
+        # a single pass over the lines, either expecting a line with a code or collecting the lines of a block
+        values: Dict[str, str] = {}
+        blocks: Dict[str, List[str]] = {}
+
+        block: List[str] = []
+        remaining = 0
+
+        for line in lines:
+
+            if remaining:
+                block.append(line)
+                remaining = remaining - 1
+                continue
+
+            line = line.rstrip()
+            code, _, value = line.partition(cls.code_delimiter)
+
+            if code in cls._multiline_codes:
+                block = []
+                remaining = int(value) if value else 0
+                # Are lines ever duplicated? If so, the first one wins
+                blocks.setdefault(code, block)
+            elif code not in values:
+                values[code] = line
+
+        model = TM1ProcessModel()
+
+        if "602" in values:
+            model.name = cls._parse_single_string(values["602"])
+
+        if "1217" in values:
+            model.has_security_access = cls._parse_single_int(values["1217"]) == 1
+
+        model.prolog = blocks.get("572", [])
+        model.metadata = blocks.get("573", [])
+        model.data = blocks.get("574", [])
+        model.epilog = blocks.get("575", [])
+
+        model.parameters = cls._parse_parameters(blocks)
+        model.variables = cls._parse_variables(blocks)
+        model.datasource = cls._parse_datasource(values)
+
+        return model
+
+    @classmethod
+    def _parse_parameters(cls, blocks: Dict[str, List[str]]) -> list:
 
         # param names are from 560
         # param datatypes are from 561
         # param default values are from 590
         # param hints are from 637
+        names = [line.rstrip() for line in blocks.get("560", [])]
+        datatypes = blocks.get("561", [])
+        defaults = blocks.get("590", [])
+        hints = blocks.get("637", [])
 
-        # this needs to be refactored
-        idx_datatype = self._get_line_index_by_code(561)
-        idx_default = self._get_line_index_by_code(590)
-        idx_hint = self._get_line_index_by_code(637)
-
-        names = self._get_multiline_block(linecode=560)
+        params = []
 
         for idx, name in enumerate(names):
 
-            # these are single ints on the line
-            datatype = self._type_mapping[int(self._get_line_by_index(idx_datatype + idx + 1))]
-
-            hint = self._get_key_value_pair_string(self._get_line_by_index(idx_hint + idx + 1))["value"]
-
-            default = self._get_key_value_pair_string(self._get_line_by_index(idx_default + idx + 1))["value"]
-
             params.append(
                 {
                     "Name": name,
-                    "Prompt": hint,
-                    "Type": datatype,
-                    "Value": default,
+                    "Prompt": cls._get_key_value_pair_string(hints[idx].rstrip())["value"],
+                    "Type": cls._type_mapping[int(datatypes[idx])],
+                    "Value": cls._get_key_value_pair_string(defaults[idx].rstrip())["value"],
                 }
             )
 
         return params
 
-    def _get_variables(self) -> list:
+    @classmethod
+    def _parse_variables(cls, blocks: Dict[str, List[str]]) -> list:
 
         # Variables are a bit like the parameters with them
         # being defined over multiple lines in different sections
 
-        # What does the json look like with no datasource?
-        variables = []
-
-        # variable names are from 577
-        names = self._get_multiline_block(linecode=577)
-
-        # offsets are from 579
-        idx_offset = self._get_line_index_by_code(579)
-
-        # types are from 578
-        idx_types = self._get_line_index_by_code(578)
+        # variable names are from 577, types from 578, offsets from 579 and start and end bytes from 580 and 581
+        names = [line.rstrip() for line in blocks.get("577", [])]
+        types = blocks.get("578", [])
+        offsets = blocks.get("579", [])
+        starts = blocks.get("580", [])
+        ends = blocks.get("581", [])
 
-        # start and end bytes
-        idx_start = self._get_line_index_by_code(580)
-        idx_end = self._get_line_index_by_code(581)
+        variables = []
 
         for idx, name in enumerate(names):
 
-            # these are single ints on the line
-            offset = int(self._get_line_by_index(idx_offset + idx + 1))
-            type = self._type_mapping[int(self._get_line_by_index(idx_types + idx + 1))]
-
-            # get start and end bytes
-            start = int(self._get_line_by_index(idx_start + idx + 1))
-            end = int(self._get_line_by_index(idx_end + idx + 1))
-
-            #
-            var = {"EndByte": end, "Name": name, "Position": offset, "StartByte": start, "Type": type}
-
-            variables.append(var)
+            variables.append(
+                {
+                    "EndByte": int(ends[idx]),
+                    "Name": name,
+                    "Position": int(offsets[idx]),
+                    "StartByte": int(starts[idx]),
+                    "Type": cls._type_mapping[int(types[idx])],
+                }
+            )
 
         return variables
 
-    def _get_datasource(self) -> dict:
+    @classmethod
+    def _parse_datasource(cls, values: Dict[str, str]) -> dict:
 
         # On processes with a datasource, the correct json
         # seems to be this
         datasource = {"Type": "None"}
 
+        if "562" not in values:
+            return datasource
+
         # need to come up with a mapping for all types
-        datasource_type = self._parse_single_string(self._get_line_by_code(562))
+        datasource_type = cls._parse_single_string(values["562"])
 
-        datasource_type_json = self._datasource_type_mapping[datasource_type]
+        datasource_type_json = cls._datasource_type_mapping[datasource_type]
         if datasource_type_json:
             datasource["Type"] = datasource_type_json
 
@@ -215,17 +386,25 @@ class TM1ProcessFile(TM1LinecodeFile):
         if datasource_type_json == "ASCII":
             datasource["asciiDelimiterType"] = "Character"
 
-        datasource["asciiDecimalSeparator"] = self._parse_single_string(self._get_line_by_code(588))
-        datasource["asciiDelimiterChar"] = self._parse_single_string(self._get_line_by_code(567))
+        datasource["asciiDecimalSeparator"] = cls._parse_single_string(values["588"])
+        datasource["asciiDelimiterChar"] = cls._parse_single_string(values["567"])
 
-        datasource["asciiHeaderRecords"] = self._parse_single_int(self._get_line_by_code(569))
-        datasource["asciiQuoteCharacter"] = self._parse_single_string(self._get_line_by_code(568))
-        datasource["asciiThousandSeparator"] = self._parse_single_string(self._get_line_by_code(589))
-        datasource["dataSourceNameForClient"] = self._parse_single_string(self._get_line_by_code(585))
-        datasource["dataSourceNameForServer"] = self._parse_single_string(self._get_line_by_code(586))
+        datasource["asciiHeaderRecords"] = cls._parse_single_int(values["569"])
+        datasource["asciiQuoteCharacter"] = cls._parse_single_string(values["568"])
+        datasource["asciiThousandSeparator"] = cls._parse_single_string(values["589"])
+        datasource["dataSourceNameForClient"] = cls._parse_single_string(values["585"])
+        datasource["dataSourceNameForServer"] = cls._parse_single_string(values["586"])
 
         return datasource
 
+    @staticmethod
+    def _get_code_lines(lines: List[str], rstrip: bool = True) -> List[str]:
+
+        if rstrip:
+            return [line.rstrip() for line in lines]
+
+        return list(lines)
+
     @staticmethod
     def _codeblock_to_json_str(lines: list[str]) -> str:
 
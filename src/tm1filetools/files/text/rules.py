@@ -9,6 +9,8 @@ class TM1RulesFile(TM1TextFile):
 
     """
 
+    __slots__ = ()
+
     suffix = "rux"
     block_terminator = ";"
 
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, TextIO
 
 from .linecode import TM1LinecodeFile
 from .user_owned import TM1UserFile
@@ -11,40 +11,89 @@ class TM1SubsetFile(TM1UserFile, TM1LinecodeFile):
 
     """
 
+    # settings from the lines before the elements, read on first access
+    __slots__ = ("public", "owner", "dimension", "_header")
+
     suffix = "sub"
     folder_suffix = "}subs"
+    # subsets of alternate hierarchies live in a folder per hierarchy under this, e.g. dim}hiers/hier}subs
+    hierarchies_folder_suffix = "}hiers"
 
     def __init__(self, path: Path, public: bool = True):
 
         super().__init__(path)
 
+        self._header: Optional[dict] = None
+
         self.dimension = self._get_object_name()
         self.public = public
         self.owner = self._get_owner_name()
+
+    @property
+    def subset_name(self) -> str:
+
         # subset_name maybe a clearer API than stem?
-        self.subset_name = self.stem
+        return self.stem
 
-    def _get_mdx(self) -> Optional[str]:
-        """Read file and return the MDX, if file defines a dynamic subset, or None
+    @property
+    def hierarchy(self) -> str:
 
-        Returns:
-            A string containing the MDX or None
+        # the same as the dimension unless the subset is in a hierarchy folder
+        return self._path.parent.name.removesuffix(self.folder_suffix)
+
+    def get_alias(self) -> Optional[str]:
+        """Returns the alias the subset displays, if one is set"""
+
+        return self._get_header()["alias"]
+
+    def get_expand_above(self) -> bool:
+        """Returns True if consolidations are expanded above their children"""
+
+        return self._get_header()["expand_above"]
+
+    def get_element_count(self) -> int:
+        """Returns the number of elements in the file, for a dynamic subset this is a snapshot"""
+
+        return self._get_header()["element_count"]
+
+    def get_elements(self) -> Iterator[str]:
+        """Yields the elements of the subset one at a time, without reading them all in at once
 
+        For a dynamic subset, these are the elements when the file was last saved
+
+        Returns:
+            Iterator of element names
         """
 
-        mdx_chars = self._parse_single_int(self._get_line_by_code(275))
+        with open(self._path, "r", encoding=self._get_read_encoding()) as f:
+
+            header = self._read_header(f)
+
+            if self._header is None:
+                self._header = header
 
-        if mdx_chars > 0:
+            for _ in range(header["element_count"]):
 
-            mdx_idx = self._get_line_index_by_code(275) + 1
+                line = f.readline()
 
-            return self._get_line_by_index(mdx_idx)
+                if not line:
+                    return
 
-        return None
+                yield line.rstrip("\r\n")
+
+    def _get_mdx(self) -> Optional[str]:
+        """Read file and return the MDX, if file defines a dynamic subset, or None
+
+        Returns:
+            A string containing the MDX or None
+
+        """
+
+        return self._get_header()["mdx"]
 
     def _get_name_from_file(self):
 
-        return self._parse_single_string(self._get_line_by_code(284))
+        return self._get_header()["name"]
 
     def _to_json(self):
         """Read file and return a json representation
@@ -60,15 +109,103 @@ class TM1SubsetFile(TM1UserFile, TM1LinecodeFile):
 
         json_dump["Name"] = name
 
-        # if the file contains an mdx expression, add it
+        hierarchy_odata = self._get_hierarchy_odata(self.dimension, self.hierarchy)
+
+        json_dump["Hierarchy@odata.bind"] = hierarchy_odata
+
+        # if the file contains an mdx expression, add it, otherwise it's a static subset so add the elements
         if self._get_mdx():
             json_dump["Expression"] = self._get_mdx()
+        else:
+            # element names are quoted with single quotes, so those in names have to be doubled
+            json_dump["Elements@odata.bind"] = [
+                f"{hierarchy_odata}/Elements('{e.replace(self.single_quote_json, self.single_quote_json * 2)}')"
+                for e in self.get_elements()
+            ]
 
-        # hierarchy_odata = self._get_hierarchy_odata()
+        return json_dump
 
-        # json_dump["Hierarchy@odata.bind"] = hierarchy_odata
+    def _get_object_name(self) -> str:
 
-        return json_dump
+        hierarchies_folder = self._path.parent.parent.name
+
+        if hierarchies_folder.endswith(self.hierarchies_folder_suffix):
+            return hierarchies_folder.removesuffix(self.hierarchies_folder_suffix)
+
+        return super()._get_object_name()
+
+    def _get_owner_name(self) -> str:
+
+        # private subsets of alternate hierarchies are a level deeper, e.g. user/dim}hiers/hier}subs
+        if not self.public and self._path.parent.parent.name.endswith(self.hierarchies_folder_suffix):
+            return self._path.parents[2].name
+
+        return super()._get_owner_name()
+
+    def _get_header(self) -> dict:
+
+        if self._header is None:
+            with open(self._path, "r", encoding=self._get_read_encoding()) as f:
+                self._header = self._read_header(f)
+
+        return self._header
+
+    def _reset_file_properties(self):
+
+        super()._reset_file_properties()
+
+        self._header = None
+
+    @classmethod
+    def _read_header(cls, f: TextIO) -> dict:
+
+        # read up to the start of the elements (270) in a single pass, leaving the file at the first element
+        header = {"name": None, "alias": None, "expand_above": False, "mdx": None, "element_count": 0}
+
+        while True:
+
+            line = f.readline()
+
+            if not line:
+                break
+
+            line = line.rstrip()
+            code, _, value = line.partition(cls.code_delimiter)
+
+            if code == "284":
+                header["name"] = cls._parse_single_string(line)
+            elif code == "274":
+                header["alias"] = value or None
+            elif code == "18":
+                header["expand_above"] = value == "1"
+            elif code == "275" and value and int(value) > 0:
+                header["mdx"] = cls._read_mdx(f, int(value))
+            elif code == "270":
+                header["element_count"] = int(value) if value else 0
+                break
+
+        return header
+
+    @staticmethod
+    def _read_mdx(f: TextIO, length: int) -> str:
+
+        # the value of 275 is the number of characters in the mdx, which can run over several lines
+        # I think the line breaks are counted as \r\n, as that's what TM1 writes
+        lines = []
+        read = 0
+
+        while read < length:
+
+            line = f.readline()
+
+            if not line:
+                break
+
+            line = line.rstrip("\r\n")
+            lines.append(line)
+            read = read + len(line) + 2
+
+        return "\r\n".join(lines)
 
     @staticmethod
     def _get_hierarchy_odata(dim: str, hier: str = None):
@@ -1,8 +1,8 @@
 from pathlib import Path
-
-import chardet
+from typing import Optional
 
 from ..base import TM1File
+from .encoding import TM1EncodingDetector
 
 
 class TM1TextFile(TM1File):
@@ -11,16 +11,46 @@ class TM1TextFile(TM1File):
 
     """
 
+    __slots__ = ("_is_non_empty", "_encoding", "_encoding_detected", "_read_encoding", "f")
+
+    # shared by all text files, swap for one with a cache file to reuse results between runs
+    encoding_detector: TM1EncodingDetector = TM1EncodingDetector()
+
     def __init__(self, path: Path):
 
         super().__init__(path)
 
-        # this introduces a dependency and may not really be useful
-        self.is_non_empty = self._get_non_empty()
-        self.encoding = self._get_encoding()
+        # these both mean touching the file so only work them out when asked
+        # this matters when scanning a folder with lots of big files (e.g. cmas)
+        self._is_non_empty: Optional[bool] = None
+        self._encoding: Optional[str] = None
+        # the encoding can legitimately be None so track whether we've looked
+        self._encoding_detected: bool = False
+        # the encoding to read the whole file with, see _get_read_encoding
+        self._read_encoding: Optional[str] = None
 
         self.f = None
 
+    @property
+    def is_non_empty(self) -> bool:
+        """True if the file exists and has some content, checked on first access"""
+
+        if self._is_non_empty is None:
+            self._is_non_empty = self._get_non_empty()
+
+        return self._is_non_empty
+
+    @property
+    def encoding(self) -> Optional[str]:
+        """The encoding of the file, detected on first access"""
+
+        # this introduces a dependency and may not really be useful
+        if not self._encoding_detected:
+            self._encoding = self._get_encoding()
+            self._encoding_detected = True
+
+        return self._encoding
+
     def reader(self, rstrip: bool = True):
 
         if self._path.exists:
@@ -45,16 +75,28 @@ class TM1TextFile(TM1File):
         with open(self._path, "w") as f:
             f.write(text)
 
-        self.is_non_empty = self._get_non_empty()
+        self._reset_file_properties()
+
+    def _reset_file_properties(self):
+
+        # the content has changed so anything derived from it needs to be checked again
+        self._is_non_empty = None
+        self._encoding = None
+        self._encoding_detected = False
+        self._read_encoding = None
 
     def _get_encoding(self):
 
-        if self.exists():
-            with open(self._path, "rb") as f:
-                data = f.read()
-                return chardet.detect(data)["encoding"]
+        return self.encoding_detector.detect(self._path)
+
+    def _get_read_encoding(self) -> Optional[str]:
+
+        # the encoding is a guess from the start of the file, which may be all ascii when something further on
+        # isn't, so those files are checked all the way through once
+        if self._read_encoding is None:
+            self._read_encoding = self.encoding_detector.get_read_encoding(self._path, self.encoding)
 
-        return None
+        return self._read_encoding
 
     def _get_non_empty(self):
 
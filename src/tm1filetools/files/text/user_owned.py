@@ -10,6 +10,10 @@ class TM1UserFile(TM1TextFile):
     You probably don't want to instantiate this class, use view or subset instead
     """
 
+    # subsets and views also inherit from TM1LinecodeFile and only one base class can add slots
+    # so public and owner are declared in the subclasses
+    __slots__ = ()
+
     def __init__(self, path: Path, public: bool = True):
 
         super().__init__(path)
@@ -1,25 +1,181 @@
 from pathlib import Path
+from typing import List, Optional, TextIO
 
 from .linecode import TM1LinecodeFile
+from .subset import TM1SubsetFile
 from .user_owned import TM1UserFile
 
 
+class TM1ViewDimension:
+    """
+    A dimension on one of the axes of a view and the subset it uses
+
+    The subset is either a named subset, saved in its own .sub file, or an inline subset saved as part of the view
+
+    """
+
+    def __init__(self, dimension: str):
+
+        # a hierarchy other than the default is written as dim:hier
+        self.dimension, _, hierarchy = dimension.partition(":")
+        self.hierarchy: str = hierarchy or self.dimension
+
+        # the name of the subset, or None if it's inline
+        self.subset: Optional[str] = None
+
+        # inline subsets only
+        self.elements: List[str] = []
+        self.alias: Optional[str] = None
+        self.mdx: Optional[str] = None
+
+        # titles only
+        self.selected: Optional[str] = None
+
+    @property
+    def is_named(self) -> bool:
+
+        return self.subset is not None
+
+
+class TM1ViewModel:
+    """
+    The layout of a view, as read from a .vue file
+
+    """
+
+    def __init__(self):
+
+        self.name: Optional[str] = None
+
+        self.titles: List[TM1ViewDimension] = []
+        self.columns: List[TM1ViewDimension] = []
+        self.rows: List[TM1ViewDimension] = []
+
+        # zero suppression, SuppressEmptyRows and SuppressEmptyColumns in the rest api
+        self.suppress_rows: bool = False
+        self.suppress_columns: bool = False
+
+    def get_dimensions(self) -> List[TM1ViewDimension]:
+        """Returns the dimensions on all the axes, titles first, then columns and rows"""
+
+        return self.titles + self.columns + self.rows
+
+    def get_named_subsets(self) -> List[tuple]:
+        """Returns the named subsets used, in the order of the axes
+
+        Returns:
+            List of (dimension, hierarchy, subset name) tuples, the hierarchy is the dimension for the default
+        """
+
+        return [(d.dimension, d.hierarchy, d.subset) for d in self.get_dimensions() if d.is_named]
+
+
 class TM1ViewFile(TM1UserFile, TM1LinecodeFile):
     """
     A class representation of a tm1 view file
 
     """
 
+    # the parsed view, read on first access
+    __slots__ = ("public", "owner", "cube", "_model")
+
     # still can't really decide if this belongs here
     suffix = "vue"
     folder_suffix = "}vues"
 
+    # the count of dimensions on each axis comes before them
+    _axis_codes = {"374": "titles", "360": "columns", "371": "rows"}
+
     def __init__(self, path: Path, public: bool = True):
 
         super().__init__(path)
 
+        self._model: Optional[TM1ViewModel] = None
+
         # does this assumption hold true or do vue files sometimes get nested further?
         self.cube = self._get_object_name()
         self.public = public
         self.owner = self._get_owner_name()
-        self.view_name = self.stem
+
+    @property
+    def view_name(self) -> str:
+
+        return self.stem
+
+    def get_model(self) -> TM1ViewModel:
+        """
+        Get the view as parsed from the file. The file is read once and the result kept until it's written
+
+        Returns:
+            View model with the dimensions and subsets on each axis and the zero suppression
+
+        """
+
+        if self._model is None:
+            with open(self._path, "r", encoding=self._get_read_encoding()) as f:
+                self._model = self._parse_model(f)
+
+            self._model.name = self._model.name or self.stem
+
+        return self._model
+
+    def _reset_file_properties(self):
+
+        super()._reset_file_properties()
+
+        self._model = None
+
+    @classmethod
+    def _parse_model(cls, f: TextIO) -> TM1ViewModel:
+
+        # a single pass over the file
+        # each axis starts with a count (374, 360, 371) and then each dimension is a 7 line followed by
+        # either a 6 line with the name of the subset or 270 and the elements of an inline subset
+        # the title selections (373) come after all the axes
+        model = TM1ViewModel()
+
+        axis = None
+
+        while True:
+
+            line = f.readline()
+
+            if not line:
+                break
+
+            line = line.rstrip("\r\n")
+            code, _, value = line.partition(cls.code_delimiter)
+
+            # the first line may have a bom
+            code = code.lstrip("\ufeff")
+
+            if code in cls._axis_codes:
+                axis = getattr(model, cls._axis_codes[code])
+            elif code == "390":
+                model.name = cls._parse_single_string(line)
+            elif code == "363":
+                # the views we have exported have both off, so which of 363 and 364 is rows isn't confirmed
+                model.suppress_rows = value == "1"
+            elif code == "364":
+                model.suppress_columns = value == "1"
+            elif code == "373":
+                # one line per title, the element is after the code (always 1?)
+                for title in model.titles:
+                    title.selected = f.readline().rstrip("\r\n").partition(cls.code_delimiter)[2]
+
+                # nothing after this belongs to an axis
+                axis = None
+            elif axis is None:
+                continue
+            elif code == "7":
+                axis.append(TM1ViewDimension(value))
+            elif code == "6" and axis:
+                axis[-1].subset = value
+            elif code == "270" and axis:
+                axis[-1].elements = [f.readline().rstrip("\r\n") for _ in range(int(value) if value else 0)]
+            elif code == "274" and axis:
+                axis[-1].alias = value or None
+            elif code == "275" and axis and value and int(value) > 0:
+                axis[-1].mdx = TM1SubsetFile._read_mdx(f, int(value))
+
+        return model
@@ -0,0 +1,228 @@
+import heapq
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from tm1filetools.files import TM1CMAFile
+from tm1filetools.files.text.cma import TM1CMAFilter
+
+# e.g. ("BP", "202301")
+Key = Tuple[str, ...]
+
+# count, sum, min and max of the numeric cells and the count of the string cells
+State = List
+
+
+class TM1CMAAggregator:
+    """
+    Sums, counts, mins, maxes and means of the values in cma files, grouped by the elements at some positions
+
+    Rows are read one at a time, so files of any size can be aggregated. If the number of groups gets
+    too big to keep in memory, the groups so far are sorted and written to a temporary file and the
+    files are merged back together when the results are read.
+
+    Numeric and string cells are kept apart, string cells are only counted.
+
+    """
+
+    def __init__(
+        self,
+        positions: List[int],
+        el_filter: Union[str, TM1CMAFilter, None] = None,
+        max_groups: int = 1000000,
+        spill_path: Optional[Path] = None,
+    ):
+
+        # the positions of the dimensions to group by, starting at 0, e.g. [0, 1] for version and period
+        self.positions: List[int] = list(positions)
+
+        self._el_filter = el_filter
+
+        self._max_groups: int = max_groups
+        # where the groups go when there are too many, defaults to the system temp folder
+        self._spill_path: Optional[Path] = spill_path
+        self._spills: List[str] = []
+
+        self._groups: Dict[Key, State] = {}
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *args):
+
+        self.close()
+
+    def close(self) -> None:
+        """Deletes any temporary files"""
+
+        for path in self._spills:
+            os.remove(path)
+
+        self._spills = []
+
+    def add_file(self, cma: TM1CMAFile) -> None:
+        """Adds the rows of a cma file that match the filter"""
+
+        # the first column is the cube so elements start at 1
+        shifted = [p + 1 for p in self.positions]
+
+        for row in cma.read_rows(el_filter=self._el_filter):
+            self.add_row(tuple([row[p] for p in shifted]), row[-1])
+
+    def add_row(self, key: Key, value: str) -> None:
+        """Adds a single value to a group
+
+        Args:
+            key: The elements at the positions grouped by
+            value: The value as it is in the file
+        """
+
+        state = self._get_state(key)
+
+        try:
+            number = float(value)
+        except ValueError:
+            state[4] = state[4] + 1
+            return
+
+        if state[0]:
+            state[2] = min(state[2], number)
+            state[3] = max(state[3], number)
+        else:
+            state[2] = state[3] = number
+
+        state[0] = state[0] + 1
+        state[1] = state[1] + number
+
+    def add_groups(self, groups: Iterable[Tuple[Key, State]]) -> None:
+        """Adds the groups of another aggregator, e.g. one that read part of a file, see get_states"""
+
+        for key, state in groups:
+            self._combine(self._get_state(key), state)
+
+    def add_spills(self, paths: Iterable[str]) -> None:
+        """Takes over the spill files of another aggregator, see release_spills
+
+        The groups in them are merged in when the results are read and the files are deleted on close
+        """
+
+        self._spills.extend(paths)
+
+    def release_spills(self) -> List[str]:
+        """Writes any groups still in memory to a spill file and hands over all the spill files
+
+        This aggregator is left empty and won't delete the files, whoever takes them should, e.g. with
+        add_spills. Used to pass the groups from a worker process without holding them all at once
+
+        Returns:
+            List of paths, each file has a group per line in order of the key
+        """
+
+        if self._groups:
+            self._spill()
+
+        paths = self._spills
+        self._spills = []
+
+        return paths
+
+    def get_states(self) -> Iterator[Tuple[Key, State]]:
+        """Yields the raw state of each group, in order of the key, for passing to add_groups"""
+
+        current_key = None
+        current = None
+
+        sources = [self._read_spill(path) for path in self._spills] + [iter(sorted(self._groups.items()))]
+
+        # each source is sorted so equal keys come together
+        for key, state in heapq.merge(*sources, key=lambda group: group[0]):
+
+            if key == current_key:
+                self._combine(current, state)
+                continue
+
+            if current is not None:
+                yield current_key, current
+
+            current_key = key
+            current = list(state)
+
+        if current is not None:
+            yield current_key, current
+
+    def get_results(self) -> Iterator[Tuple[Key, dict]]:
+        """Yields the results for each group, in order of the key
+
+        Returns:
+            Iterator of (key, result) tuples, the result is a dict with the count, sum, min, max and mean
+            of the numeric cells (None if there aren't any) and the count of the string cells as strings
+        """
+
+        for key, state in self.get_states():
+            yield key, self._get_result(state)
+
+    def get_groups(self) -> Dict[Key, dict]:
+        """Returns the results for every group at once, see get_results"""
+
+        return dict(self.get_results())
+
+    def _get_state(self, key: Key) -> State:
+
+        state = self._groups.get(key)
+
+        if state is None:
+
+            if len(self._groups) >= self._max_groups:
+                self._spill()
+
+            state = self._groups[key] = [0, 0.0, None, None, 0]
+
+        return state
+
+    @staticmethod
+    def _combine(state: State, other: State) -> None:
+
+        if other[0]:
+            state[2] = other[2] if not state[0] else min(state[2], other[2])
+            state[3] = other[3] if not state[0] else max(state[3], other[3])
+
+        state[0] = state[0] + other[0]
+        state[1] = state[1] + other[1]
+        state[4] = state[4] + other[4]
+
+    @staticmethod
+    def _get_result(state: State) -> dict:
+
+        count, total, minimum, maximum, strings = state
+
+        return {
+            "count": count,
+            "sum": total if count else None,
+            "min": minimum,
+            "max": maximum,
+            "mean": total / count if count else None,
+            "strings": strings,
+        }
+
+    def _spill(self) -> None:
+
+        # one group per line, in order of the key
+        fd, path = tempfile.mkstemp(suffix=".spill", dir=self._spill_path)
+        self._spills.append(path)
+
+        with os.fdopen(fd, "w") as f:
+            for key, state in sorted(self._groups.items()):
+                f.write(json.dumps([key, state]) + "\n")
+
+        self._groups = {}
+
+    @staticmethod
+    def _read_spill(path: str) -> Iterator[Tuple[Key, State]]:
+
+        with open(path, "r") as f:
+            for line in f:
+                key, state = json.loads(line)
+                yield tuple(key), state
@@ -1,4 +1,8 @@
+import os
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from tm1filetools.files import NonTM1File  # noqa
 from tm1filetools.files import TM1AttributeCubeFile  # noqa
@@ -56,3 +60,111 @@ class TM1BaseFileTool:
             return path.rglob("".join(map(either, pattern)))
 
         return path.glob("".join(map(either, pattern)))
+
+    @classmethod
+    def _index_files(
+        cls, path: Path, recursive_suffixes: Iterable[str] = (), workers: Optional[int] = None
+    ) -> Dict[str, List[Path]]:
+        """Walk a folder once and bucket every file found by its lower case suffix
+
+        Files in sub folders (e.g. private subsets and views) are only indexed when
+        their suffix is one of `recursive_suffixes` (or it contains the wildcard "*")
+
+        Args:
+            path: The folder to scan
+            recursive_suffixes: Suffixes to also look for in sub folders
+            workers: Number of threads used to list sub folders, they are listed one by one if not set
+
+        Returns:
+            Dict of lists of paths keyed by lower case suffix (without the dot)
+        """
+
+        index = defaultdict(list)
+
+        if path is None or not path.is_dir():
+            return index
+
+        recursive_suffixes = {s.lower() for s in recursive_suffixes}
+        recurse_all = "*" in recursive_suffixes
+
+        if not recursive_suffixes:
+            folders = [(True, cls._list_folder(path)[0])]
+        elif workers and workers > 1:
+            folders = cls._walk_parallel(path, workers)
+        else:
+            folders = cls._walk(path)
+
+        for top, files in folders:
+            for file_path in files:
+
+                suffix = os.path.splitext(file_path)[1][1:].lower()
+
+                if top or recurse_all or suffix in recursive_suffixes:
+                    index[suffix].append(Path(file_path))
+
+        return index
+
+    @staticmethod
+    def _list_folder(folder) -> Tuple[List[str], List[str]]:
+        """Returns the paths of the files and sub folders in a folder"""
+
+        files = []
+        sub_folders = []
+
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                # don't follow links to avoid looping back up the tree
+                if entry.is_dir(follow_symlinks=False):
+                    sub_folders.append(entry.path)
+                else:
+                    files.append(entry.path)
+
+        return files, sub_folders
+
+    @classmethod
+    def _walk(cls, path: Path) -> Iterator[Tuple[bool, List[str]]]:
+        """Yields (is top level folder, file paths) for a folder and everything under it"""
+
+        # a stack of (folder, is top level folder) tuples rather than recursing
+        folders = [(path, True)]
+
+        while folders:
+
+            folder, top = folders.pop()
+
+            files, sub_folders = cls._list_folder(folder)
+
+            folders.extend((f, False) for f in sub_folders)
+
+            yield top, files
+
+    @classmethod
+    def _walk_parallel(cls, path: Path, workers: int) -> Iterator[Tuple[bool, List[str]]]:
+        """As _walk but folders are listed in a pool of threads
+
+        Private subsets and views are spread over a folder per user and a folder per object
+        so, on slow (e.g. network) storage, listing them side by side is much quicker
+        """
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+
+            pending = {executor.submit(cls._list_folder, path): True}
+
+            while pending:
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+
+                    top = pending.pop(future)
+
+                    # a folder removed while we were walking has nothing to offer
+                    try:
+                        files, sub_folders = future.result()
+                    except FileNotFoundError:
+                        continue
+
+                    for sub_folder in sub_folders:
+                        pending[executor.submit(cls._list_folder, sub_folder)] = False
+
+                    yield top, files
@@ -0,0 +1,280 @@
+import os
+import sqlite3
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from tm1filetools.files.base import TM1File
+from tm1filetools.files.text.encoding import TM1EncodingDetector
+
+
+class TM1ScanCatalog:
+    """
+    A persistent record of the files found in a TM1 data dir, stored in a SQLite database
+
+    On each scan, every folder is stat'd but only folders whose modified time has changed
+    since the last scan are listed again. Everything else is read from the database, so a
+    scan of an unchanged data dir costs one stat per folder rather than one per file.
+
+    Note that a folder's modified time only changes when files are added, removed or renamed,
+    not when an existing file is edited, so the sizes, times, encodings and attributes recorded for
+    files in an unchanged folder can be out of date.
+
+    """
+
+    _schema = """
+        CREATE TABLE IF NOT EXISTS folders (
+            path TEXT PRIMARY KEY,
+            parent TEXT,
+            mtime_ns INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS folders_parent ON folders (parent);
+        CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY,
+            folder TEXT NOT NULL,
+            suffix TEXT NOT NULL,
+            size INTEGER,
+            mtime_ns INTEGER,
+            type TEXT,
+            encoding TEXT,
+            cube TEXT,
+            dimension TEXT,
+            owner TEXT
+        );
+        CREATE INDEX IF NOT EXISTS files_folder ON files (folder);
+    """
+
+    # attributes of file objects worth keeping, if the file type has them
+    _attributes = ["cube", "dimension", "owner"]
+
+    def __init__(self, path: Path):
+
+        self._path: Path = path
+
+        self._conn = sqlite3.connect(str(path))
+        self._conn.executescript(self._schema)
+
+        # files added or changed since the catalog was opened
+        self._changed: set = set()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *args):
+
+        self.close()
+
+    def close(self) -> None:
+        """Commits anything outstanding and closes the database"""
+
+        self._conn.commit()
+        self._conn.close()
+
+    def index(self, path: Path, recursive_suffixes: Iterable[str] = ()) -> Dict[str, List[Path]]:
+        """Returns the files in a folder bucketed by lower case suffix, rescanning changed folders only
+
+        This is a drop in replacement for TM1BaseFileTool._index_files
+
+        Args:
+            path: The folder to scan
+            recursive_suffixes: Suffixes to also look for in sub folders (or "*" for everything)
+
+        Returns:
+            Dict of lists of paths keyed by lower case suffix (without the dot)
+        """
+
+        index = defaultdict(list)
+
+        if path is None or not path.is_dir():
+            return index
+
+        recursive_suffixes = {s.lower() for s in recursive_suffixes}
+        recurse_all = "*" in recursive_suffixes
+
+        folders = [(path, True)]
+
+        while folders:
+
+            folder, top = folders.pop()
+
+            try:
+                mtime_ns = os.stat(folder).st_mtime_ns
+            except FileNotFoundError:
+                # removed since the parent was listed
+                self._forget_folder(str(folder))
+                continue
+
+            row = self._conn.execute("SELECT mtime_ns FROM folders WHERE path = ?", (str(folder),)).fetchone()
+
+            if row is None or row[0] != mtime_ns:
+                self._rescan_folder(folder, mtime_ns)
+
+            for file_path, suffix in self._conn.execute(
+                "SELECT path, suffix FROM files WHERE folder = ?", (str(folder),)
+            ).fetchall():
+                if top or recurse_all or suffix in recursive_suffixes:
+                    index[suffix].append(Path(file_path))
+
+            if recursive_suffixes:
+                for (sub_folder,) in self._conn.execute(
+                    "SELECT path FROM folders WHERE parent = ?", (str(folder),)
+                ).fetchall():
+                    folders.append((Path(sub_folder), False))
+
+        self._conn.commit()
+
+        return index
+
+    def record(self, files: Iterable[TM1File], changed_only: bool = True) -> None:
+        """Stores the type and attributes (cube, dimension, owner) of files
+
+        Attributes that are only read from a file when asked for (e.g. the cube of a cma) are stored if they
+        have been read, the file isn't read just to store them
+
+        Args:
+            files: File objects, any not in the catalog are skipped
+            changed_only: Only files added or changed since the last scan
+        """
+
+        rows = []
+
+        for f in files:
+
+            path = str(f._path)
+
+            if changed_only and path not in self._changed:
+                continue
+
+            attributes = [self._get_attribute(f, a) for a in self._attributes]
+            rows.append([f.__class__.__name__] + attributes + [path])
+
+        self._conn.executemany("UPDATE files SET type = ?, cube = ?, dimension = ?, owner = ? WHERE path = ?", rows)
+        self._conn.commit()
+
+        self._changed.difference_update(r[-1] for r in rows)
+
+    def get_records(self) -> Dict[str, dict]:
+        """Returns the type and attributes stored for each file that has them, keyed by path
+
+        Files added or changed since they were recorded don't have a type so aren't included
+        """
+
+        return {
+            path: {"type": file_type, **dict(zip(self._attributes, attributes))}
+            for path, file_type, *attributes in self._conn.execute(
+                "SELECT path, type, cube, dimension, owner FROM files WHERE type IS NOT NULL"
+            )
+        }
+
+    def save_encodings(self, detector: TM1EncodingDetector) -> None:
+        """Stores encodings the detector has found, if the files haven't changed since they were catalogued"""
+
+        rows = [
+            (encoding, path, size, mtime_ns)
+            for path, (size, mtime_ns, encoding) in detector.get_cached().items()
+            if encoding is not None
+        ]
+
+        self._conn.executemany("UPDATE files SET encoding = ? WHERE path = ? AND size = ? AND mtime_ns = ?", rows)
+        self._conn.commit()
+
+    def load_encodings(self, detector: TM1EncodingDetector) -> None:
+        """Seeds the detector with the encodings stored in the catalog
+
+        The detector still checks the size and modified time of a file before using them
+        """
+
+        for path, size, mtime_ns, encoding in self._conn.execute(
+            "SELECT path, size, mtime_ns, encoding FROM files WHERE encoding IS NOT NULL"
+        ):
+            detector.add_cached(path, size, mtime_ns, encoding)
+
+    def get_record(self, path: Path) -> Optional[dict]:
+        """Returns what is stored about a file as a dict, or None if it's not in the catalog"""
+
+        cursor = self._conn.execute("SELECT * FROM files WHERE path = ?", (str(path),))
+        row = cursor.fetchone()
+
+        if row is None:
+            return None
+
+        return {c[0]: v for c, v in zip(cursor.description, row)}
+
+    @staticmethod
+    def _get_attribute(f: TM1File, name: str):
+
+        # lazy attributes are properties backed by a private one, don't read the file to fill it
+        if isinstance(getattr(type(f), name, None), property):
+            return getattr(f, f"_{name}", None)
+
+        return getattr(f, name, None)
+
+    def _rescan_folder(self, folder: Path, mtime_ns: int) -> None:
+
+        key = str(folder)
+
+        # keep the encoding of anything that hasn't changed
+        known = {
+            path: (size, mtime, encoding)
+            for path, size, mtime, encoding in self._conn.execute(
+                "SELECT path, size, mtime_ns, encoding FROM files WHERE folder = ?", (key,)
+            )
+        }
+        known_folders = {path for (path,) in self._conn.execute("SELECT path FROM folders WHERE parent = ?", (key,))}
+
+        files = []
+        sub_folders = set()
+
+        with os.scandir(folder) as entries:
+            for entry in entries:
+
+                # don't follow links to avoid looping back up the tree
+                if entry.is_dir(follow_symlinks=False):
+                    sub_folders.add(entry.path)
+                    continue
+
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+
+                previous = known.pop(entry.path, None)
+
+                if previous and previous[0] == stat.st_size and previous[1] == stat.st_mtime_ns:
+                    continue
+
+                suffix = os.path.splitext(entry.name)[1][1:].lower()
+                files.append((entry.path, key, suffix, stat.st_size, stat.st_mtime_ns))
+
+        # whatever is left in known has gone
+        self._conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in known])
+
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO files (path, folder, suffix, size, mtime_ns) VALUES (?, ?, ?, ?, ?)", files
+        )
+        self._changed.update(f[0] for f in files)
+
+        for path in known_folders - sub_folders:
+            self._forget_folder(path)
+
+        # new folders get a null time so they are listed when first visited
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO folders (path, parent, mtime_ns) VALUES (?, ?, NULL)",
+            [(path, key) for path in sub_folders - known_folders],
+        )
+
+        self._conn.execute(
+            "INSERT OR REPLACE INTO folders (path, parent, mtime_ns) VALUES (?, (SELECT parent FROM folders WHERE path = ?), ?)",  # noqa
+            (key, key, mtime_ns),
+        )
+
+    def _forget_folder(self, path: str) -> None:
+
+        # the folder and everything under it
+        prefix = path + os.sep
+
+        self._conn.execute(
+            "DELETE FROM files WHERE folder = ? OR substr(folder, 1, ?) = ?", (path, len(prefix), prefix)
+        )
+        self._conn.execute("DELETE FROM folders WHERE path = ? OR substr(path, 1, ?) = ?", (path, len(prefix), prefix))
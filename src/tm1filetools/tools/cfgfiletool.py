@@ -57,12 +57,13 @@ class TM1CfgFileTool(TM1BaseFileTool):
                 return WindowsPath(pure_path)
 
             # We can't do much with an absolute path when running on a separate machine
-            return self._path
+            return self._path_cfg.parent
 
         else:
             # thanks to the magic of pathlib, this seems to work cross platform :)
             # note, I've made it an absolute path, not sure this is strictly necessary
-            return Path.joinpath(self._path, pure_path).resolve()
+            # relative to the folder the cfg file is in, which may not be the path we were given
+            return Path.joinpath(self._path_cfg.parent, pure_path).resolve()
 
     def get_data_path(self) -> Path:
 
@@ -0,0 +1,230 @@
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from tm1filetools.files import TM1ProcessFile
+
+# e.g. ("load sales", "prolog", 12)
+Hit = Tuple[str, str, int]
+
+
+class TM1CodeIndex:
+    """
+    An inverted index of the tokens in the code tabs of TI processes, stored in a SQLite database
+
+    Three kinds of token are indexed, all case insensitive as TI is:
+
+    - identifiers, e.g. variables like vYear
+    - functions, i.e. identifiers followed by an opening bracket, e.g. CellPutN
+    - literals, i.e. the contents of quoted strings, e.g. a cube name
+
+    Only processes that have changed since they were last indexed (by size and modified time)
+    are parsed again when the index is updated.
+
+    """
+
+    _schema = """
+        CREATE TABLE IF NOT EXISTS processes (
+            path TEXT PRIMARY KEY,
+            name TEXT,
+            size INTEGER,
+            mtime_ns INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS tokens (
+            token TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            path TEXT NOT NULL,
+            tab TEXT NOT NULL,
+            line INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS tokens_token ON tokens (token, kind);
+        CREATE INDEX IF NOT EXISTS tokens_path ON tokens (path);
+    """
+
+    tabs = ["prolog", "metadata", "data", "epilog"]
+
+    # single quoted strings, a quote is escaped by doubling it
+    _literal_pattern = re.compile(r"'((?:[^']|'')*)'")
+    _identifier_pattern = re.compile(r"[A-Za-z_][A-Za-z0-9_.$]*(\s*\()?")
+
+    def __init__(self, path: Path):
+
+        self._path: Path = path
+
+        self._conn = sqlite3.connect(str(path))
+        self._conn.executescript(self._schema)
+
+        # processes that couldn't be parsed on the last update and why
+        self.errors: Dict[str, str] = {}
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *args):
+
+        self.close()
+
+    def close(self) -> None:
+        """Commits anything outstanding and closes the database"""
+
+        self._conn.commit()
+        self._conn.close()
+
+    def update(self, procs: Iterable[TM1ProcessFile]) -> int:
+        """Indexes any processes that are new or have changed and drops any that are no longer there
+
+        Args:
+            procs: All the process files that should be in the index
+
+        Returns:
+            The number of processes (re)indexed
+        """
+
+        known = {
+            path: (size, mtime_ns)
+            for path, size, mtime_ns in self._conn.execute("SELECT path, size, mtime_ns FROM processes")
+        }
+
+        count = 0
+        self.errors = {}
+
+        for p in procs:
+
+            path = str(p._path)
+            stat = p._path.stat()
+
+            if known.pop(path, None) == (stat.st_size, stat.st_mtime_ns):
+                continue
+
+            self._forget(path)
+            self._index(p, stat.st_size, stat.st_mtime_ns)
+            count = count + 1
+
+        # whatever is left in known has gone
+        for path in known:
+            self._forget(path)
+
+        self._conn.commit()
+
+        return count
+
+    def find_identifier(self, name: str) -> List[Hit]:
+        """Returns where an identifier (e.g. a variable) is used
+
+        Args:
+            name: The identifier, case insensitive
+
+        Returns:
+            List of (process name, tab, line number) tuples, line numbers start at 1
+        """
+
+        return self._find(name, "identifier")
+
+    def find_function(self, name: str) -> List[Hit]:
+        """Returns where a function (or anything followed by an opening bracket) is called"""
+
+        return self._find(name, "function")
+
+    def find_literal(self, text: str) -> List[Hit]:
+        """Returns where a quoted string is used, without the quotes, e.g. a cube or process name"""
+
+        return self._find(text, "literal")
+
+    def find_calls(self, function: str, literal: Optional[str] = None) -> List[Hit]:
+        """Returns where a function is called, optionally only on lines that also have a quoted string
+
+        e.g. find_calls("CellPutN", "Sales") for lines writing to the Sales cube
+
+        """
+
+        if literal is None:
+            return self.find_function(function)
+
+        return self._conn.execute(
+            """
+            SELECT p.name, f.tab, f.line
+            FROM tokens f
+            JOIN tokens l ON l.path = f.path AND l.tab = f.tab AND l.line = f.line
+            JOIN processes p ON p.path = f.path
+            WHERE f.token = ? AND f.kind = 'function' AND l.token = ? AND l.kind = 'literal'
+            ORDER BY p.name, f.tab, f.line
+            """,
+            (function.lower(), literal.lower()),
+        ).fetchall()
+
+    def get_processes(self, token: str, kind: Optional[str] = None) -> List[str]:
+        """Returns the names of the processes that use a token
+
+        Args:
+            token: The token, case insensitive
+            kind: Optionally, only tokens of this kind (identifier, function or literal)
+
+        Returns:
+            Sorted list of process names
+        """
+
+        return sorted({name for name, _, _ in self._find(token, kind)})
+
+    @classmethod
+    def tokenize(cls, line: str) -> Iterator[Tuple[str, str]]:
+        """Yields (token, kind) for each token in a line of TI code, tokens are lower case"""
+
+        # comments have to start the line
+        if line.lstrip().startswith("#"):
+            return
+
+        for match in cls._literal_pattern.finditer(line):
+            yield match.group(1).replace("''", "'").lower(), "literal"
+
+        # blank out the strings so their contents don't look like identifiers
+        code = cls._literal_pattern.sub(lambda m: " " * len(m.group(0)), line)
+
+        for match in cls._identifier_pattern.finditer(code):
+
+            # skip the end of things like 1.5e10
+            if match.start() and (code[match.start() - 1].isdigit()):
+                continue
+
+            name = match.group(0).rstrip("( \t").lower()
+            yield name, "function" if match.group(1) else "identifier"
+
+    def _find(self, token: str, kind: Optional[str] = None) -> List[Hit]:
+
+        sql = "SELECT p.name, t.tab, t.line FROM tokens t JOIN processes p ON p.path = t.path WHERE t.token = ?"
+        params = [token.lower()]
+
+        if kind:
+            sql = sql + " AND t.kind = ?"
+            params.append(kind)
+
+        return self._conn.execute(sql + " ORDER BY p.name, t.tab, t.line", params).fetchall()
+
+    def _index(self, p: TM1ProcessFile, size: int, mtime_ns: int) -> None:
+
+        rows = []
+
+        try:
+            # a fresh object as the one passed in may hold a model parsed before the file changed
+            model = TM1ProcessFile(p._path).get_model()
+        except Exception as e:
+            # still record the process so it isn't parsed again until it changes
+            self.errors[p.name] = f"{type(e).__name__}: {e}"
+            model = None
+
+        for tab in self.tabs if model else []:
+            for number, line in enumerate(getattr(model, tab), start=1):
+                for token, kind in set(self.tokenize(line)):
+                    rows.append((token, kind, str(p._path), tab, number))
+
+        self._conn.executemany("INSERT INTO tokens (token, kind, path, tab, line) VALUES (?, ?, ?, ?, ?)", rows)
+        self._conn.execute(
+            "INSERT INTO processes (path, name, size, mtime_ns) VALUES (?, ?, ?, ?)",
+            (str(p._path), model.name if model and model.name else p.stem, size, mtime_ns),
+        )
+
+    def _forget(self, path: str) -> None:
+
+        self._conn.execute("DELETE FROM tokens WHERE path = ?", (path,))
+        self._conn.execute("DELETE FROM processes WHERE path = ?", (path,))
@@ -0,0 +1,275 @@
+import collections
+import csv
+import heapq
+import itertools
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from tm1filetools.files import TM1CMAFile
+
+# e.g. ("BP", "202301", "Amount")
+Key = Tuple[str, ...]
+
+# the status (added, removed or changed), the elements, the value before and after and the change if both are numbers
+Difference = Tuple[str, Key, Union[float, str, None], Union[float, str, None], Optional[float]]
+
+
+class TM1CMADiff:
+    """
+    The cells that differ between two cma files, e.g. exports of a cube before and after a process runs
+
+    Each file is sorted by its elements with an external sort, i.e. sorted in chunks that are written to
+    temporary files and streamed back through a merge, so the number of cells held in memory at once
+    is limited. The two sorted streams are then walked together to find the cells that have been added,
+    removed or changed.
+
+    """
+
+    added = "added"
+    removed = "removed"
+    changed = "changed"
+
+    def __init__(
+        self,
+        before: TM1CMAFile,
+        after: TM1CMAFile,
+        max_rows: int = 1000000,
+        temp_path: Optional[Path] = None,
+        tolerance: float = 0.0,
+    ):
+
+        self._before: TM1CMAFile = before
+        self._after: TM1CMAFile = after
+
+        # the number of rows sorted in memory at once
+        self._max_rows: int = max_rows
+        # where the sorted chunks go, defaults to the system temp folder
+        self._temp_path: Optional[Path] = temp_path
+        self._runs: List[str] = []
+
+        # numeric changes no bigger than this are ignored, e.g. rounding
+        self._tolerance: float = tolerance
+
+        # the server and cube, for writing cma files
+        self._cube_column: Optional[str] = None
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *args):
+
+        self.close()
+
+    def close(self) -> None:
+        """Deletes any temporary files"""
+
+        self._remove_runs(list(self._runs))
+
+    def get_differences(self) -> Iterator[Difference]:
+        """Yields each cell that differs between the two files, in order of the elements
+
+        Each call sorts both files again, any temporary files it needs are deleted when it finishes
+
+        Returns:
+            Iterator of (status, elements, value before, value after, change) tuples. Values are floats or
+            strings and None if the cell isn't in the file. The change is the difference for numbers, the
+            value itself for an added number and minus the value for a removed one, and None for strings
+        """
+
+        before = self._get_sorted(self._before)
+        after = self._get_sorted(self._after)
+
+        old = next(before, None)
+        new = next(after, None)
+
+        while old is not None or new is not None:
+
+            if new is None or (old is not None and old[0] < new[0]):
+                yield self.removed, old[0], old[1], None, self._get_delta(0.0, old[1])
+                old = next(before, None)
+
+            elif old is None or new[0] < old[0]:
+                yield self.added, new[0], None, new[1], self._get_delta(new[1], 0.0)
+                new = next(after, None)
+
+            else:
+                if self._is_changed(old[1], new[1]):
+                    yield self.changed, new[0], old[1], new[1], self._get_delta(new[1], old[1])
+
+                old = next(before, None)
+                new = next(after, None)
+
+    def get_summary(self) -> Dict[str, int]:
+        """Returns the number of cells added, removed and changed"""
+
+        summary = {self.added: 0, self.removed: 0, self.changed: 0}
+
+        for status, *_ in self.get_differences():
+            summary[status] = summary[status] + 1
+
+        return summary
+
+    def write_cma(self, path: Path) -> int:
+        """Writes the differences to a cma file, with the change as the value, e.g. to load as increments
+
+        Numbers are the change (negative for removed cells), strings are the new value (blank for removed cells)
+
+        Returns:
+            The number of rows written
+        """
+
+        # the same as the files compared, there's no file to read it from yet
+        delimiter = self._before.delimiter or self._after.delimiter or ","
+
+        count = 0
+
+        with open(path, "w") as f:
+
+            for status, key, old, new, delta in self.get_differences():
+
+                if delta is not None:
+                    value = repr(delta)
+                elif new is None:
+                    # a string that's been removed
+                    value = ""
+                elif isinstance(new, str):
+                    value = new
+                else:
+                    # a string that became a number
+                    value = repr(new)
+
+                f.write(TM1CMAFile.format_row([self._cube_column, *key, value], delimiter) + "\n")
+                count = count + 1
+
+        return count
+
+    def write_csv(self, path: Path) -> int:
+        """Writes the differences to a csv file with a header and a row per cell
+
+        The columns are the status, the elements (one column each), the value before and after and the change
+
+        Returns:
+            The number of rows written, not counting the header
+        """
+
+        count = 0
+
+        with open(path, "w", newline="") as f:
+
+            writer = csv.writer(f)
+            header_written = False
+
+            for status, key, old, new, delta in self.get_differences():
+
+                if not header_written:
+                    writer.writerow(
+                        ["status"] + [f"element_{i + 1}" for i in range(len(key))] + ["before", "after", "change"]
+                    )
+                    header_written = True
+
+                writer.writerow([status, *key, *["" if v is None else v for v in (old, new, delta)]])
+                count = count + 1
+
+        return count
+
+    def _get_sorted(self, cma: TM1CMAFile) -> Iterator[Tuple[Key, Union[float, str]]]:
+
+        # yields (elements, value) in order of the elements, sorting in chunks and merging them
+        runs = []
+        sources = []
+        rows = self._read(cma)
+
+        try:
+
+            while True:
+
+                # sorted is stable so cells with the same elements stay in the order they were in the file
+                chunk = sorted(itertools.islice(rows, self._max_rows), key=lambda cell: cell[0])
+
+                if not chunk:
+                    break
+
+                runs.append(chunk)
+
+                # only write chunks to disk if there's more than one
+                if len(runs) > 1:
+                    runs = [self._write_run(run) if isinstance(run, list) else run for run in runs]
+
+            sources = [self._read_run(run) if isinstance(run, str) else iter(run) for run in runs]
+
+            cells = heapq.merge(*sources, key=lambda cell: cell[0])
+
+            # if an element combination is repeated, the last one wins
+            for _, group in itertools.groupby(cells, key=lambda cell: cell[0]):
+                yield collections.deque(group, maxlen=1)[0]
+
+        finally:
+            # files can't be deleted while they're open on windows
+            for source in sources:
+                if hasattr(source, "close"):
+                    source.close()
+
+            # the runs of this sort only
+            self._remove_runs([run for run in runs if isinstance(run, str)])
+
+    def _read(self, cma: TM1CMAFile) -> Iterator[Tuple[Key, Union[float, str]]]:
+
+        for row in cma.read_rows():
+
+            if self._cube_column is None:
+                self._cube_column = row[0]
+
+            try:
+                value = float(row[-1])
+            except ValueError:
+                value = row[-1]
+
+            yield tuple(row[1:-1]), value
+
+    def _write_run(self, run: list) -> str:
+
+        fd, path = tempfile.mkstemp(suffix=".run", dir=self._temp_path)
+        self._runs.append(path)
+
+        with os.fdopen(fd, "w") as f:
+            for key, value in run:
+                f.write(json.dumps([key, value]) + "\n")
+
+        return path
+
+    def _remove_runs(self, paths: List[str]) -> None:
+
+        for path in paths:
+
+            if os.path.exists(path):
+                os.remove(path)
+
+            if path in self._runs:
+                self._runs.remove(path)
+
+    @staticmethod
+    def _read_run(path: str) -> Iterator[Tuple[Key, Union[float, str]]]:
+
+        with open(path, "r") as f:
+            for line in f:
+                key, value = json.loads(line)
+                yield tuple(key), value
+
+    def _is_changed(self, old: Union[float, str], new: Union[float, str]) -> bool:
+
+        if isinstance(old, float) and isinstance(new, float):
+            return abs(new - old) > self._tolerance
+
+        return old != new
+
+    @staticmethod
+    def _get_delta(new: Union[float, str], old: Union[float, str]) -> Optional[float]:
+
+        if not isinstance(new, float) or not isinstance(old, float):
+            return None
+
+        return new - old
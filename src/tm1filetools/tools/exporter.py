@@ -0,0 +1,236 @@
+import hashlib
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from tm1filetools.files import TM1ProcessFile
+
+
+def _export_process(path: str, indent: Optional[int]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+
+    # runs in a worker process, returns the json, the hash of the file it came from and the error, if any
+    try:
+        with open(path, "rb") as f:
+            sha1 = hashlib.sha1(f.read()).hexdigest()
+
+        return TM1ProcessFile(Path(path))._to_json(indent=indent), sha1, None
+
+    except Exception as e:
+        return None, None, f"{type(e).__name__}: {e}"
+
+
+class TM1ProcessExporter:
+    """
+    Exports processes to json in parallel
+
+    Processes are either written to a json file each, in a folder, or to a single NDJSON file with
+    one process per line. Processes are parsed in a process pool with a limited number queued at
+    once, so memory use doesn't grow with the number of processes.
+
+    A manifest of the size, modified time and hash of each process exported is kept next to the
+    output so processes that haven't changed since the last export can be skipped.
+
+    """
+
+    # kept in the output folder or alongside the ndjson file
+    manifest_suffix = ".manifest"
+
+    def __init__(
+        self, path: Path, ndjson: bool = False, workers: Optional[int] = None, force: bool = False, indent: int = 4
+    ):
+
+        # a folder for json files or the ndjson file
+        self._path: Path = Path(path)
+        self._ndjson: bool = ndjson
+
+        self._workers: int = workers or os.cpu_count() or 1
+
+        # export everything, even if it hasn't changed
+        self._force: bool = force
+
+        # ndjson has to be one line per process
+        self._indent: Optional[int] = None if ndjson else indent
+
+        if ndjson:
+            self._manifest_path = self._path.with_name(f"{self._path.name}{self.manifest_suffix}")
+        else:
+            self._manifest_path = Path.joinpath(self._path, f"export{self.manifest_suffix}")
+
+    def export(self, procs: Iterable[TM1ProcessFile]) -> dict:
+        """Exports processes, skipping any that haven't changed since the last export
+
+        Args:
+            procs: The process files to export
+
+        Returns:
+            Dict with the number of processes exported and skipped and the errors keyed by process file name
+        """
+
+        previous = {} if self._force else self._read_manifest()
+
+        if self._ndjson:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+        else:
+            self._path.mkdir(parents=True, exist_ok=True)
+
+        # work out what has changed up front so only those go to the pool
+        work = []
+
+        for p in procs:
+
+            state, unchanged = self._get_state(p._path, previous.get(p.name))
+            work.append((p, state, unchanged and self._is_output_current(p, previous)))
+
+        result = {"exported": 0, "skipped": 0, "errors": {}}
+
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+
+            results = self._map(executor, work)
+
+            if self._ndjson:
+                manifest = self._write_ndjson(results, previous, result)
+            else:
+                manifest = self._write_files(results, previous, result)
+
+        self._write_manifest(manifest)
+
+        return result
+
+    def _map(self, executor: ProcessPoolExecutor, work: List[tuple]) -> Iterator[tuple]:
+
+        # yields (process, state, json, error) in the order given, with json None for skipped processes
+        # no more than a few jobs per worker are queued so finished json doesn't pile up in memory
+        window = deque()
+        limit = self._workers * 4
+
+        for p, state, skip in work:
+
+            future = None if skip else executor.submit(_export_process, str(p._path), self._indent)
+            window.append((p, state, future))
+
+            while len(window) > limit or (window and window[0][2] is None):
+                yield self._collect(*window.popleft())
+
+        while window:
+            yield self._collect(*window.popleft())
+
+    @staticmethod
+    def _collect(p: TM1ProcessFile, state: dict, future) -> tuple:
+
+        if future is None:
+            return p, state, None, None
+
+        json_str, sha1, error = future.result()
+
+        if sha1:
+            state["sha1"] = sha1
+
+        return p, state, json_str, error
+
+    def _write_files(self, results: Iterator[tuple], previous: dict, result: dict) -> dict:
+
+        manifest = {}
+
+        for p, state, json_str, error in results:
+
+            if error:
+                result["errors"][p.name] = error
+                continue
+
+            if json_str is None:
+                result["skipped"] += 1
+                manifest[p.name] = previous[p.name]
+                continue
+
+            with open(self._get_json_path(p), "w") as f:
+                f.write(json_str)
+
+            result["exported"] += 1
+            manifest[p.name] = state
+
+        return manifest
+
+    def _write_ndjson(self, results: Iterator[tuple], previous: dict, result: dict) -> dict:
+
+        manifest = {}
+
+        # lines for unchanged processes are copied from the previous file using the offsets in the manifest
+        # then the new file replaces the old one
+        temp_path = self._path.with_name(f"{self._path.name}.tmp")
+        old = open(self._path, "rb") if self._path.exists() and previous else None
+
+        try:
+            with open(temp_path, "wb") as f:
+
+                for p, state, json_str, error in results:
+
+                    if error:
+                        result["errors"][p.name] = error
+                        continue
+
+                    if json_str is None:
+                        old.seek(previous[p.name]["offset"])
+                        line = old.read(previous[p.name]["length"])
+                        result["skipped"] += 1
+                    else:
+                        line = json_str.encode("utf-8") + b"\n"
+                        result["exported"] += 1
+
+                    state["offset"], state["length"] = f.tell(), len(line)
+                    manifest[p.name] = state
+
+                    f.write(line)
+        finally:
+            if old:
+                old.close()
+
+        os.replace(temp_path, self._path)
+
+        return manifest
+
+    def _get_json_path(self, p: TM1ProcessFile) -> Path:
+
+        return Path.joinpath(self._path, f"{p.stem}.json")
+
+    def _is_output_current(self, p: TM1ProcessFile, previous: dict) -> bool:
+
+        # the json from last time has to still be there to skip a process
+        if self._ndjson:
+            return self._path.exists() and "offset" in previous[p.name]
+
+        return self._get_json_path(p).exists()
+
+    @staticmethod
+    def _get_state(path: Path, previous: Optional[dict]) -> Tuple[dict, bool]:
+
+        stat = path.stat()
+        state = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+        if not previous or previous["size"] != stat.st_size:
+            return state, False
+
+        if previous["mtime_ns"] == stat.st_mtime_ns:
+            state["sha1"] = previous["sha1"]
+            return state, True
+
+        # e.g. a fresh checkout will have touched everything, so check the content
+        with open(path, "rb") as f:
+            state["sha1"] = hashlib.sha1(f.read()).hexdigest()
+
+        return state, state["sha1"] == previous["sha1"]
+
+    def _read_manifest(self) -> Dict[str, dict]:
+
+        if self._manifest_path.exists():
+            with open(self._manifest_path, "r") as f:
+                return json.load(f)
+
+        return {}
+
+    def _write_manifest(self, manifest: Dict[str, dict]) -> None:
+
+        with open(self._manifest_path, "w") as f:
+            json.dump(manifest, f, indent=4, sort_keys=True)
@@ -1,5 +1,9 @@
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from tm1filetools.files import (
     NonTM1File,
@@ -15,14 +19,43 @@ from tm1filetools.files import (
     TM1ProcessFile,
     TM1RulesFile,
     TM1SubsetFile,
+    TM1TextFile,
     TM1ViewFile,
 )
 from tm1filetools.files.base import TM1File
+from tm1filetools.files.binary.binary import TM1BinaryFile
+from tm1filetools.files.text.chore import TM1ChoreModel
+from tm1filetools.files.text.view import TM1ViewModel
 
 from .base import TM1BaseFileTool
+from .catalog import TM1ScanCatalog
+from .codeindex import TM1CodeIndex
+from .exporter import TM1ProcessExporter
+from .graph import TM1ModelGraph
 
 # from .cfgfiletool import TM1CfgFileTool
 from .logfiletool import TM1LogFileTool
+from .schedule import TM1ChoreSchedule
+from .transform import TM1ProcessTransformer
+from .xref import TM1ReferenceExtractor
+
+
+def _load_chore(path: str) -> Tuple[Optional[TM1ChoreModel], Optional[str]]:
+
+    # runs in a worker process, returns the model and the error, if any
+    try:
+        return TM1ChoreFile(Path(path)).get_model(), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _load_view(path: str) -> Tuple[Optional[TM1ViewModel], Optional[str]]:
+
+    # runs in a worker process, returns the model and the error, if any
+    try:
+        return TM1ViewFile(Path(path)).get_model(), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
 
 
 class TM1FileTool(TM1BaseFileTool):
@@ -31,10 +64,30 @@ class TM1FileTool(TM1BaseFileTool):
 
     """
 
-    def __init__(self, path: Path, local: bool = False):
+    # the attribute holding the list of files and the class to instantiate for each suffix
+    _file_types = {
+        TM1DimensionFile.suffix: ("_dim_files", TM1DimensionFile),
+        TM1CubeFile.suffix: ("_cube_files", TM1CubeFile),
+        TM1RulesFile.suffix: ("_rules_files", TM1RulesFile),
+        TM1ProcessFile.suffix: ("_proc_files", TM1ProcessFile),
+        TM1SubsetFile.suffix: ("_sub_files", TM1SubsetFile),
+        TM1ViewFile.suffix: ("_view_files", TM1ViewFile),
+        TM1FeedersFile.suffix: ("_feeders_files", TM1FeedersFile),
+        TM1ChoreFile.suffix: ("_chore_files", TM1ChoreFile),
+        TM1CMAFile.suffix: ("_cma_files", TM1CMAFile),
+        TM1BLBFile.suffix: ("_blb_files", TM1BLBFile),
+    }
+
+    # these can live in sub folders (e.g. private subsets and views in user folders)
+    _recursive_suffixes = [TM1SubsetFile.suffix, TM1ViewFile.suffix, TM1CMAFile.suffix]
+
+    def __init__(self, path: Path, local: bool = False, catalog: Optional[Path] = None, workers: Optional[int] = None):
 
         self._path: Path = path
 
+        # threads used to walk sub folders (e.g. private subsets and views)
+        self._workers: Optional[int] = workers
+
         # local means the code is running on the machine the folder exists
         # this means that an absolute path in the cfg file can be used
         self._local: bool = local
@@ -65,23 +118,45 @@ class TM1FileTool(TM1BaseFileTool):
         self._blb_files: Optional[list] = None
         self._non_tm1_files: Optional[list] = None
 
+        # dependencies between objects, built on demand and thrown away when the lists change
+        self._model_graph: Optional[TM1ModelGraph] = None
+        # sets of lower case object names, built from the graph and thrown away with it
+        self._name_indexes: dict = {}
+
+        # optionally, remember what was found in a sqlite db so the next run only rescans changed folders
+        self._scan_catalog: Optional[TM1ScanCatalog] = None
+
+        if catalog:
+            self._scan_catalog = TM1ScanCatalog(catalog)
+            self._scan_catalog.load_encodings(TM1TextFile.encoding_detector)
+
     def find_all(self):
         """
         Do a full scan of the dir(s) and populate all lists of files
         """
 
-        self._find_dims()
-        self._find_cubes()
-        self._find_rules()
-        self._find_procs()
-        self._find_subs()
-        self._find_views()
-        self._find_feeders()
-        self.logfile_tool._find_logs()
-        self._find_cmas()
-        self._find_blbs()
-        self._find_chores()
-        self._find_non_tm1()
+        # a single pass over the data dir populates every list of files
+        index = self._index(self._data_path, recursive_suffixes=self._recursive_suffixes)
+
+        self._invalidate_indexes()
+
+        records = self._get_records()
+
+        for suffix, (attr, _) in self._file_types.items():
+            setattr(self, attr, [self._make_file(f, records.get(str(f))) for f in index.get(suffix, [])])
+
+        self._non_tm1_files = [
+            NonTM1File(f) for suffix, files in index.items() if suffix and suffix not in self.suffixes for f in files
+        ]
+
+        if self._scan_catalog:
+            self._scan_catalog.record(f for attr, _ in self._file_types.values() for f in getattr(self, attr))
+
+        # only reuse the index for logs if they live in the data dir
+        if self.logfile_tool._path == self._data_path:
+            self.logfile_tool._find_logs(paths=index.get(TM1LogFile.suffix, []))
+        else:
+            self.logfile_tool._find_logs()
 
     # getters for all file types
 
@@ -266,6 +341,74 @@ class TM1FileTool(TM1BaseFileTool):
             TM1AttributeCubeFile(c._path) for c in self.get_cubes(control=True) if c.name.find(c.attribute_prefix) == 0
         ]
 
+    # dependencies between objects
+
+    def get_model_graph(self) -> TM1ModelGraph:
+        """Returns a graph of the dependencies between the objects found
+
+        The graph is cached until the lists of files change
+
+        Returns:
+            Graph of the model
+        """
+
+        if self._model_graph is None:
+            self._model_graph = TM1ModelGraph.from_file_tool(self)
+
+        return self._model_graph
+
+    def get_reference_graph(self, workers: Optional[int] = None, cache_file: Optional[Path] = None) -> TM1ModelGraph:
+        """Returns a graph of the dependencies between objects, including references by name in processes and rules
+
+        On top of the model graph, processes are added and linked to the processes, cubes and dims they refer
+        to in calls like ExecuteProcess, CellPutN and DimensionElementInsert, as are rules to the cubes in DB calls
+        and chores to the processes they run. Dims are linked to the cubes they're on the views of.
+        e.g. get_unreferenced("process") returns processes that aren't called from other processes or chores.
+        get_unreferenced("dim") returns dims that aren't on any view, referred to in code, or used by subsets or
+        attributes. The dims of a cube can't be read from its .cub file, so dims of cubes without views are included.
+        Views are parsed with load_views, which only parses the ones that haven't been already, so the first call
+        reads every view and later ones reuse them until the lists of files change
+
+        Args:
+            workers: Number of processes to read the code with, defaults to the number of cpus
+            cache_file: Optional json file to keep the references found in each file between runs
+
+        Returns:
+            Graph of the model
+        """
+
+        graph = TM1ModelGraph.from_file_tool(self)
+
+        extractor = TM1ReferenceExtractor(workers=workers, cache_file=cache_file)
+        extractor.add_to_graph(graph, self.get_procs(control=True), self.get_rules(control=True))
+        extractor.save()
+
+        # and chores to the processes they run
+        errors = self.load_chores(control=True, workers=workers)
+
+        for c in self.get_chores(control=True):
+
+            if c.name in errors:
+                continue
+
+            key = graph.add_file("chore", c.stem, c)
+
+            for process in c.get_model().get_processes():
+                graph.add_edge(graph.key("process", process), key)
+
+        # and dims to the cubes they're in, every view of a cube has all its dims on one axis or another
+        errors = self.load_views(control=True, workers=workers)
+
+        for v in self.get_views(control=True):
+
+            if str(v._path) in errors:
+                continue
+
+            for d in v.get_model().get_dimensions():
+                graph.add_edge(graph.key("dim", d.dimension), graph.key("cube", v.cube))
+
+        return graph
+
     # orphan getters
 
     def get_orphan_rules(self) -> List[TM1RulesFile]:
@@ -275,7 +418,9 @@ class TM1FileTool(TM1BaseFileTool):
             List of rules files
         """
 
-        return [r for r in self.get_rules() if r.stem.lower() not in [c.stem.lower() for c in self.get_cubes()]]
+        cubes = self._get_name_index("cubes")
+
+        return [r for r in self.get_rules() if r.stem.lower() not in cubes]
 
     def get_orphan_attr_dims(self) -> List[TM1DimensionFile]:
         """Returns list of attribute dim files that don't have corresponding dim files
@@ -284,9 +429,9 @@ class TM1FileTool(TM1BaseFileTool):
             List of dim files
         """
 
-        return [
-            a for a in self.get_attr_dims() if a.strip_prefix().lower() not in [d.stem.lower() for d in self.get_dims()]
-        ]
+        dims = self._get_name_index("all_dims")
+
+        return [a for a in self.get_attr_dims() if a.strip_prefix().lower() not in dims]
 
     def get_orphan_attr_cubes(self) -> List[TM1CubeFile]:
         """Returns list of attribute cube files that don't have corresponding dim files
@@ -295,11 +440,9 @@ class TM1FileTool(TM1BaseFileTool):
             List of cube files
         """
 
-        return [
-            a
-            for a in self.get_attr_cubes()
-            if a.strip_prefix().lower() not in [d.stem.lower() for d in self.get_dims(control=True)]
-        ]
+        dims = self._get_name_index("all_dims")
+
+        return [a for a in self.get_attr_cubes() if a.strip_prefix().lower() not in dims]
 
     def get_orphan_subs(self) -> List[TM1SubsetFile]:
         """Returns list of subset files that don't have corresponding dim files
@@ -308,11 +451,9 @@ class TM1FileTool(TM1BaseFileTool):
             List of subset files
         """
 
-        return [
-            s
-            for s in self.get_subs(control=True)
-            if s.dimension.lower() not in [d.stem.lower() for d in self.get_dims(control=True)]
-        ]
+        dims = self._get_name_index("all_dims")
+
+        return [s for s in self.get_subs(control=True) if s.dimension.lower() not in dims]
 
     def get_orphan_views(self) -> List[TM1ViewFile]:
         """Returns list of view files that don't have corresponding cube files
@@ -321,11 +462,9 @@ class TM1FileTool(TM1BaseFileTool):
             List of view files
         """
 
-        return [
-            v
-            for v in self.get_views(control=True)
-            if v.cube.lower() not in [c.stem.lower() for c in self.get_cubes(control=True)]
-        ]
+        cubes = self._get_name_index("all_cubes")
+
+        return [v for v in self.get_views(control=True) if v.cube.lower() not in cubes]
 
     def get_orphan_feeders(self) -> List[TM1FeedersFile]:
         """Returns list of feeder files that don't have corresponding cube files
@@ -334,11 +473,42 @@ class TM1FileTool(TM1BaseFileTool):
             List of feeder files
         """
 
-        return [
-            f
-            for f in self.get_feeders(control=True)
-            if f.stem.lower() not in [c.stem.lower() for c in self.get_cubes(control=True)]
-        ]
+        cubes = self._get_name_index("all_cubes")
+
+        return [f for f in self.get_feeders(control=True) if f.stem.lower() not in cubes]
+
+    # name indexes used to look up objects by name
+
+    def _get_name_index(self, index: str) -> Set[str]:
+        """Returns a cached set of lower case names of a type of object
+
+        The names are read from the keys of the model graph, so they're case folded the same way
+
+        Args:
+            index: One of "dims", "all_dims", "cubes", "all_cubes", "attr_dims" or "attr_cubes"
+                The "all_" indexes include control objects, attribute names have the prefix removed
+
+        Returns:
+            Set of lower case names
+        """
+
+        if index not in self._name_indexes:
+
+            graph = self.get_model_graph()
+            kind = "dim" if "dims" in index else "cube"
+
+            # only objects we have files for, the graph also holds objects that are just referred to
+            names = {name for _, name in graph.get_keys(kind) if graph.exists(kind, name)}
+
+            if index.startswith("attr_"):
+                prefix = TM1BinaryFile.attribute_prefix.lower()
+                names = {n.removeprefix(prefix) for n in names if n.startswith(prefix)}
+            elif not index.startswith("all_"):
+                names = {n for n in names if not n.startswith(TM1File.control_prefix)}
+
+            self._name_indexes[index] = names
+
+        return self._name_indexes[index]
 
     # to deprecate
 
@@ -368,10 +538,9 @@ class TM1FileTool(TM1BaseFileTool):
 
         count = file_object.delete()
 
-        # potentially slow
-        # This is all a bit hacky because the delete method in the object itself
-        # Doesn't know anything about the file tool object
-        self.find_all()
+        # The delete method in the object itself doesn't know anything about the file tool object
+        # so drop it from the relevant list rather than rescanning everything
+        self._uncatalog([file_object._path])
 
         return count
 
@@ -383,10 +552,323 @@ class TM1FileTool(TM1BaseFileTool):
             new_name: New name for stem of file object
         """
 
+        old_path = file_object._path
+
         file_object.rename(new_name)
 
-        # potentially slow
-        self.find_all()
+        self._invalidate_indexes()
+
+        # the object is updated in place so there's nothing to do if it's the one we hold
+        # otherwise resync the old and new paths
+        if not self._is_catalogued(file_object):
+            self.refresh(paths=[old_path, file_object._path])
+
+    def refresh(self, paths: Optional[Iterable[Path]] = None) -> None:
+        """Resyncs the lists of files found with what is on disk
+
+        Args:
+            paths: Files or folders to resync, a full scan is done if not provided
+
+        """
+
+        if paths is None:
+            self.find_all()
+            return
+
+        for path in paths:
+
+            path = Path(path)
+
+            if path == self._data_path:
+                self.find_all()
+                return
+
+            if path.is_file():
+                self._refresh_file(path)
+            else:
+                # this also takes care of files that no longer exist
+                self._refresh_folder(path)
+
+    def save_catalog(self) -> None:
+        """Stores the encodings detected and attributes read (e.g. the cube of a cma) so far in the catalog,
+        if one is being used"""
+
+        if self._scan_catalog:
+            self._scan_catalog.save_encodings(TM1TextFile.encoding_detector)
+            self._scan_catalog.record(
+                (f for attr, _ in self._file_types.values() for f in getattr(self, attr) or []), changed_only=False
+            )
+
+    def close_catalog(self) -> None:
+        """Stores the encodings detected so far and closes the catalog, if one is being used"""
+
+        if self._scan_catalog:
+            self.save_catalog()
+            self._scan_catalog.close()
+            self._scan_catalog = None
+
+    # chores
+
+    def load_chores(self, model: bool = True, control: bool = False, workers: Optional[int] = None) -> Dict[str, str]:
+        """Parses chores in parallel, so their models are ready to use without reading the files again
+
+        Args:
+            model: Load model chores
+            control: Load control chores
+            workers: Number of processes to parse with, defaults to the number of cpus
+
+        Returns:
+            Dict of errors keyed by chore file name, for chores that couldn't be parsed
+        """
+
+        # no point in parsing the ones we already have
+        chores = [c for c in self.get_chores(model=model, control=control) if c._model is None]
+        errors = {}
+
+        if not chores:
+            return errors
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+
+            for c, (chore_model, error) in zip(chores, executor.map(_load_chore, [str(c._path) for c in chores])):
+
+                if error:
+                    errors[c.name] = error
+                else:
+                    c._model = chore_model
+
+        return errors
+
+    def get_chore_process_map(
+        self, model: bool = True, control: bool = False, workers: Optional[int] = None
+    ) -> Dict[str, List[str]]:
+        """Returns the processes each chore runs, in order, keyed by chore name
+
+        Chores that can't be parsed are left out
+
+        Args:
+            model: Include model chores
+            control: Include control chores
+            workers: Number of processes to parse with, defaults to the number of cpus
+
+        Returns:
+            Dict of lists of process names keyed by chore name
+        """
+
+        errors = self.load_chores(model=model, control=control, workers=workers)
+
+        return {
+            c.get_model().name: c.get_model().get_processes()
+            for c in self.get_chores(model=model, control=control)
+            if c.name not in errors
+        }
+
+    def get_chore_schedule(
+        self,
+        start: datetime,
+        end: datetime,
+        durations: Optional[Dict[str, timedelta]] = None,
+        default_duration: timedelta = timedelta(minutes=5),
+        workers: Optional[int] = None,
+    ) -> TM1ChoreSchedule:
+        """Returns the runs of the active chores over a window of time, to look for overlaps
+
+        Args:
+            start: Start of the window
+            end: End of the window
+            durations: How long each chore takes to run, keyed by chore name
+            default_duration: How long to assume any other chore takes to run
+            workers: Number of processes to parse the chores with, defaults to the number of cpus
+
+        Returns:
+            The schedule of the chores, which can report overlaps and the peak number of chores running per hour
+        """
+
+        errors = self.load_chores(model=True, control=True, workers=workers)
+
+        chores = [c.get_model() for c in self.get_chores(model=True, control=True) if c.name not in errors]
+
+        return TM1ChoreSchedule(chores, start, end, durations=durations, default_duration=default_duration)
+
+    # views
+
+    def load_views(self, model: bool = True, control: bool = False, workers: Optional[int] = None) -> Dict[str, str]:
+        """Parses views in parallel, so their models are ready to use without reading the files again
+
+        Args:
+            model: Load model views
+            control: Load control views
+            workers: Number of processes to parse with, defaults to the number of cpus
+
+        Returns:
+            Dict of errors keyed by view file path, for views that couldn't be parsed
+        """
+
+        # no point in parsing the ones we already have
+        views = [v for v in self.get_views(model=model, control=control) if v._model is None]
+        errors = {}
+
+        if not views:
+            return errors
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+
+            # lots of small files so send them in batches
+            chunksize = max(1, len(views) // ((workers or os.cpu_count() or 1) * 4))
+            results = executor.map(_load_view, [str(v._path) for v in views], chunksize=chunksize)
+
+            for v, (view_model, error) in zip(views, results):
+
+                # view names are only unique per cube (and owner) so use the path
+                if error:
+                    errors[str(v._path)] = error
+                else:
+                    v._model = view_model
+
+        return errors
+
+    def get_referenced_subs(self, workers: Optional[int] = None) -> List[TM1SubsetFile]:
+        """Returns the named subsets used by at least one view, public or private
+
+        Views that can't be parsed are ignored, see load_views for the errors
+
+        Args:
+            workers: Number of processes to parse the views with, defaults to the number of cpus
+
+        Returns:
+            List of subset files
+        """
+
+        used = self._get_used_subs(workers)
+
+        return [s for s in self.get_subs(model=True, control=True) if str(s._path) in used]
+
+    def get_dead_private_subs(self, workers: Optional[int] = None) -> List[TM1SubsetFile]:
+        """Returns the private subsets that none of their owner's views use
+
+        A private subset can only be used by its owner's private views so, as long as every view
+        can be parsed, these are safe to delete as far as views are concerned. They may still be used
+        by a process or a report.
+
+        Args:
+            workers: Number of processes to parse the views with, defaults to the number of cpus
+
+        Returns:
+            List of subset files
+        """
+
+        used = self._get_used_subs(workers)
+
+        return [s for s in self.get_subs(model=True, control=True) if not s.public and str(s._path) not in used]
+
+    def _get_used_subs(self, workers: Optional[int] = None) -> set:
+
+        # the paths of the subsets used by views, in a single pass over the views
+        self.load_views(model=True, control=True, workers=workers)
+
+        # (owner, dimension, hierarchy, subset) -> path, owner is None for public subsets
+        # names are case insensitive in tm1
+        lookup = {}
+
+        for s in self.get_subs(model=True, control=True):
+            owner = s.owner.lower() if s.owner else None
+            lookup[(owner, s.dimension.lower(), s.hierarchy.lower(), s.subset_name.lower())] = str(s._path)
+
+        used = set()
+
+        for v in self.get_views(model=True, control=True):
+
+            # couldn't be parsed
+            if v._model is None:
+                continue
+
+            owner = v.owner.lower() if v.owner else None
+
+            for dimension, hierarchy, subset in v._model.get_named_subsets():
+
+                key = (dimension.lower(), hierarchy.lower(), subset.lower())
+
+                # a private view uses its owner's private subset over a public one of the same name
+                path = (owner and lookup.get((owner,) + key)) or lookup.get((None,) + key)
+
+                if path:
+                    used.add(path)
+
+        return used
+
+    # bulk exports
+
+    def export_procs(
+        self,
+        path: Path,
+        model: bool = True,
+        control: bool = False,
+        ndjson: bool = False,
+        workers: Optional[int] = None,
+        force: bool = False,
+    ) -> dict:
+        """Exports processes to json, parsing them in parallel and skipping any unchanged since the last export
+
+        Args:
+            path: Folder to write a json file per process to, or the file to write to if ndjson is True
+            model: Export model processes
+            control: Export control processes
+            ndjson: Write a single file with one process per line
+            workers: Number of processes to parse with, defaults to the number of cpus
+            force: Export every process, even if it hasn't changed
+
+        Returns:
+            Dict with the number of processes exported and skipped and the errors keyed by process file name
+        """
+
+        exporter = TM1ProcessExporter(path, ndjson=ndjson, workers=workers, force=force)
+
+        return exporter.export(self.get_procs(model=model, control=control))
+
+    def transform_procs(
+        self,
+        func: Callable[[str], str],
+        model: bool = True,
+        control: bool = False,
+        workers: Optional[int] = None,
+        dry_run: bool = False,
+    ) -> dict:
+        """Applies a function to the code tabs of processes in parallel, writing back those that change
+
+        Args:
+            func: Takes the code of a tab as a string and returns the new code, must be a top level function
+            model: Transform model processes
+            control: Transform control processes
+            workers: Number of processes to transform with, defaults to the number of cpus
+            dry_run: Report what would change without writing anything
+
+        Returns:
+            Dict with the lines added and removed per tab and a unified diff for each process changed,
+            the number unchanged and the errors, all keyed by process file name
+        """
+
+        transformer = TM1ProcessTransformer(func, workers=workers, dry_run=dry_run)
+
+        return transformer.transform(self.get_procs(model=model, control=control))
+
+    def get_code_index(self, path: Path, model: bool = True, control: bool = False) -> TM1CodeIndex:
+        """Returns an index of the tokens in the code of the processes, stored in a SQLite database
+
+        The index is brought up to date first, only processes that have changed since the last time are parsed
+
+        Args:
+            path: The database file, created if it doesn't exist
+            model: Index model processes
+            control: Index control processes
+
+        Returns:
+            The code index, which should be closed when done with, e.g. by using it in a with statement
+        """
+
+        index = TM1CodeIndex(path)
+        index.update(self.get_procs(model=model, control=control))
+
+        return index
 
     # bulk deletes for relevant objects
 
@@ -397,11 +879,13 @@ class TM1FileTool(TM1BaseFileTool):
             int: count of files deleted
         """
 
+        files = self.get_feeders()
+
         count = 0
-        for fd in self.get_feeders():
+        for fd in files:
             count = count + fd.delete()
 
-        self._find_feeders()
+        self._uncatalog([fd._path for fd in files])
 
         return count
 
@@ -412,11 +896,13 @@ class TM1FileTool(TM1BaseFileTool):
             int: count of files deleted
         """
 
+        files = self.get_blbs(control=True)
+
         count = 0
-        for b in self.get_blbs(control=True):
+        for b in files:
             count = count + b.delete()
 
-        self._find_blbs()
+        self._uncatalog([b._path for b in files])
 
         return count
 
@@ -448,11 +934,13 @@ class TM1FileTool(TM1BaseFileTool):
             int: count of files deleted
         """
 
+        files = self.get_orphan_rules()
+
         count = 0
-        for r in self.get_orphan_rules():
+        for r in files:
             count = count + r.delete()
 
-        self._find_rules()
+        self._uncatalog([r._path for r in files])
 
         return count
 
@@ -463,11 +951,13 @@ class TM1FileTool(TM1BaseFileTool):
             int: count of files deleted
         """
 
+        files = self.get_orphan_attr_dims()
+
         count = 0
-        for d in self.get_orphan_attr_dims():
+        for d in files:
             count = count + d.delete()
 
-        self._find_dims()
+        self._uncatalog([d._path for d in files])
 
         return count
 
@@ -478,11 +968,13 @@ class TM1FileTool(TM1BaseFileTool):
             int: Count of files deleted
         """
 
+        files = self.get_orphan_attr_cubes()
+
         count = 0
-        for c in self.get_orphan_attr_cubes():
-            c.delete()
+        for c in files:
+            count = count + c.delete()
 
-        self._find_cubes()
+        self._uncatalog([c._path for c in files])
 
         return count
 
@@ -493,11 +985,13 @@ class TM1FileTool(TM1BaseFileTool):
             int: count of files deleted
         """
 
+        files = self.get_orphan_views()
+
         count = 0
-        for v in self.get_orphan_views():
+        for v in files:
             count = count + v.delete()
 
-        self._find_views()
+        self._uncatalog([v._path for v in files])
 
         return count
 
@@ -509,11 +1003,13 @@ class TM1FileTool(TM1BaseFileTool):
 
         """
 
+        files = self.get_orphan_subs()
+
         count = 0
-        for s in self.get_orphan_subs():
+        for s in files:
             count = count + s.delete()
 
-        self._find_subs()
+        self._uncatalog([s._path for s in files])
 
         return count
 
@@ -523,14 +1019,162 @@ class TM1FileTool(TM1BaseFileTool):
             int: count of files deleted
         """
 
+        files = self.get_orphan_feeders()
+
         count = 0
-        for f in self.get_orphan_feeders():
+        for f in files:
             count = count + f.delete()
 
-        self._find_feeders()
+        self._uncatalog([f._path for f in files])
 
         return count
 
+    # keeping the lists of files in sync without a full rescan
+
+    def _invalidate_indexes(self) -> None:
+
+        self._model_graph = None
+        self._name_indexes = {}
+
+    def _make_file(self, path: Path, record: Optional[dict] = None) -> Optional[TM1File]:
+
+        file_type = self._file_types.get(path.suffix[1:].lower())
+
+        if file_type:
+
+            _, file_class = file_type
+
+            if file_class in (TM1SubsetFile, TM1ViewFile):
+                file_object = file_class(path, public=self._is_public(path))
+            else:
+                file_object = file_class(path)
+
+            # fill in what the catalog has for the file, if it was recorded as the same type
+            if record and record["type"] == file_class.__name__:
+                self._apply_record(file_object, record)
+
+            return file_object
+
+        if path.suffix and path.suffix[1:].lower() not in self.suffixes:
+            return NonTM1File(path)
+
+    def _get_records(self) -> Dict[str, dict]:
+
+        # what was stored last time about the files that haven't changed, so they don't need reading again
+        # call after listing the files, which is when the catalog finds what has changed
+        if self._scan_catalog:
+            return self._scan_catalog.get_records()
+
+        return {}
+
+    @staticmethod
+    def _apply_record(file_object: TM1File, record: dict) -> None:
+
+        for name in TM1ScanCatalog._attributes:
+
+            value = record.get(name)
+
+            if value is None or not hasattr(type(file_object), name) and not hasattr(file_object, name):
+                continue
+
+            # lazy attributes are properties backed by a private one, which saves reading the file
+            if isinstance(getattr(type(file_object), name, None), property):
+                setattr(file_object, f"_{name}", value)
+            else:
+                setattr(file_object, name, value)
+
+    def _is_public(self, path: Path) -> bool:
+
+        # public subsets and views are in a folder per object in the data dir
+        # e.g. data/dim}subs/sub.sub, while private ones are in a folder per user
+        # e.g. data/user/dim}subs/sub.sub
+        # subsets of alternate hierarchies are a level deeper, e.g. data/dim}hiers/hier}subs/sub.sub
+        try:
+            folders = path.parent.relative_to(self._data_path).parts
+        except ValueError:
+            return True
+
+        return len(folders) < 2 or folders[0].lower().endswith("}hiers")
+
+    def _get_catalog_attr(self, path: Path) -> Optional[str]:
+
+        suffix = path.suffix[1:].lower()
+
+        if suffix in self._file_types:
+            return self._file_types[suffix][0]
+
+        if suffix and suffix not in self.suffixes:
+            return "_non_tm1_files"
+
+    def _is_catalogued(self, file_object: TM1File) -> bool:
+
+        attr = self._get_catalog_attr(file_object._path)
+
+        return attr is not None and any(f is file_object for f in getattr(self, attr) or [])
+
+    def _uncatalog(self, paths: Iterable[Path]) -> None:
+
+        self._invalidate_indexes()
+
+        # group by list so each affected list is only filtered once
+        by_attr = defaultdict(set)
+
+        for path in paths:
+            attr = self._get_catalog_attr(path)
+            if attr:
+                by_attr[attr].add(path)
+
+            # logs are found by the log file tool, there aren't many so just look again
+            if path.suffix[1:].lower() == TM1LogFile.suffix:
+                self.logfile_tool._find_logs()
+
+        for attr, attr_paths in by_attr.items():
+
+            files = getattr(self, attr)
+
+            # not found yet so it will be up to date when it is
+            if files is not None:
+                setattr(self, attr, [f for f in files if f._path not in attr_paths])
+
+    def _catalog(self, paths: Iterable[Path]) -> None:
+
+        self._invalidate_indexes()
+
+        for path in paths:
+
+            attr = self._get_catalog_attr(path)
+
+            if attr and getattr(self, attr) is not None:
+                getattr(self, attr).append(self._make_file(path))
+
+    def _refresh_file(self, path: Path) -> None:
+
+        self._uncatalog([path])
+
+        # only some file types are found in sub folders
+        if path.parent != self._data_path and path.suffix[1:].lower() not in self._recursive_suffixes:
+            return
+
+        self._catalog([path])
+
+    def _refresh_folder(self, path: Path) -> None:
+
+        self._invalidate_indexes()
+
+        # drop anything we knew about at or under this path
+        for attr, _ in list(self._file_types.values()) + [("_non_tm1_files", None)]:
+
+            files = getattr(self, attr)
+
+            if files is not None:
+                setattr(self, attr, [f for f in files if not f._path.is_relative_to(path)])
+
+        # a sub folder of the data dir can only contain the file types we look for recursively
+        index = self._index_files(path, recursive_suffixes=self._recursive_suffixes)
+
+        for suffix in self._recursive_suffixes:
+            self._catalog(index.get(suffix, []))
+
     # finders for different file types
 
     def _find_dims(self):
@@ -539,14 +1183,17 @@ class TM1FileTool(TM1BaseFileTool):
         """
 
         self._dim_files = [TM1DimensionFile(d) for d in self._find_files(TM1DimensionFile.suffix)]
+        self._invalidate_indexes()
 
     def _find_cubes(self):
 
         self._cube_files = [TM1CubeFile(c) for c in self._find_files(TM1CubeFile.suffix)]
+        self._invalidate_indexes()
 
     def _find_rules(self):
 
         self._rules_files = [TM1RulesFile(r) for r in self._find_files(TM1RulesFile.suffix)]
+        self._invalidate_indexes()
 
     def _find_procs(self):
 
@@ -554,25 +1201,24 @@ class TM1FileTool(TM1BaseFileTool):
 
     def _find_subs(self):
 
-        self._sub_files = [
-            TM1SubsetFile(
-                s,
-            )
-            for s in self._find_files(TM1SubsetFile.suffix, recursive=True)
-        ]
+        paths = self._find_files(TM1SubsetFile.suffix, recursive=True)
+        records = self._get_records()
+
+        self._sub_files = [self._make_file(s, records.get(str(s))) for s in paths]
+        self._invalidate_indexes()
 
     def _find_views(self):
 
-        self._view_files = [
-            TM1ViewFile(
-                v,
-            )
-            for v in self._find_files(TM1ViewFile.suffix, recursive=True)
-        ]
+        paths = self._find_files(TM1ViewFile.suffix, recursive=True)
+        records = self._get_records()
+
+        self._view_files = [self._make_file(v, records.get(str(v))) for v in paths]
+        self._invalidate_indexes()
 
     def _find_feeders(self):
 
         self._feeders_files = [TM1FeedersFile(f) for f in self._find_files(TM1FeedersFile.suffix)]
+        self._invalidate_indexes()
 
     def _find_chores(self):
 
@@ -580,7 +1226,10 @@ class TM1FileTool(TM1BaseFileTool):
 
     def _find_cmas(self):
 
-        self._cma_files = [TM1CMAFile(r) for r in self._find_files(TM1CMAFile.suffix, recursive=True)]
+        paths = self._find_files(TM1CMAFile.suffix, recursive=True)
+        records = self._get_records()
+
+        self._cma_files = [self._make_file(r, records.get(str(r))) for r in paths]
 
     def _find_blbs(self):
         """
@@ -596,18 +1245,27 @@ class TM1FileTool(TM1BaseFileTool):
         # a specific path might work best (although the naming is a bit confusing)
         # Using this recursively might perform poorly
 
-        files = [NonTM1File(f) for f in self._find_files(suffix="*", recursive=recursive)]
+        index = self._index(self._data_path, recursive_suffixes=["*"] if recursive else [])
 
-        non_tm1 = [f for f in files if f.suffix.lower() not in self.suffixes]
+        self._non_tm1_files = [
+            NonTM1File(f) for suffix, files in index.items() if suffix and suffix not in self.suffixes for f in files
+        ]
+
+    def _index(self, path: Path, recursive_suffixes: Iterable[str] = ()):
 
-        self._non_tm1_files = non_tm1
+        if self._scan_catalog and path == self._data_path:
+            return self._scan_catalog.index(path, recursive_suffixes=recursive_suffixes)
+
+        return self._index_files(path, recursive_suffixes=recursive_suffixes, workers=self._workers)
 
     def _find_files(self, suffix: str, recursive: bool = False, prefix: str = "", path: Path = None):
 
-        if path:
-            return self._case_insensitive_glob(path, f"{prefix}*.{suffix}", recursive=recursive)
+        suffix = suffix.lower()
+        prefix = prefix.lower()
+
+        index = self._index(path or self._data_path, recursive_suffixes=[suffix] if recursive else [])
 
-        return self._case_insensitive_glob(self._data_path, f"{prefix}*.{suffix}", recursive=recursive)
+        return [f for f in index.get(suffix, []) if f.name.lower().startswith(prefix)]
 
     @staticmethod
     def _filter_model_and_or_control(objects, model: bool = True, control: bool = False):
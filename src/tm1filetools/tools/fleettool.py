@@ -0,0 +1,199 @@
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .cfgfiletool import TM1CfgFileTool
+from .filetool import TM1FileTool
+from .logfiletool import TM1LogFileTool
+
+# name used in a catalog for each getter of the orphan files
+_orphan_getters = {
+    "rules": "get_orphan_rules",
+    "attr_dims": "get_orphan_attr_dims",
+    "attr_cubes": "get_orphan_attr_cubes",
+    "subs": "get_orphan_subs",
+    "views": "get_orphan_views",
+    "feeders": "get_orphan_feeders",
+}
+
+
+def _resolve_paths(path: Path, local: bool = False) -> Tuple[Path, Path]:
+
+    # a tm1s.cfg file (or a folder holding one) can point somewhere else for data and logs
+    # otherwise, treat the path as the data dir and assume the logs live there too
+    cfg_tool = TM1CfgFileTool(path, local=local)
+
+    folder = path.parent if path.is_file() else path
+
+    data_path = cfg_tool.get_data_path() or folder
+
+    return data_path, cfg_tool.get_log_path() or data_path
+
+
+def _scan_server(path: str, local: bool = False) -> dict:
+
+    # runs in a worker process, so takes and returns things that pickle cheaply (i.e. no file objects)
+
+    catalog = {
+        "source": path,
+        "data_path": None,
+        "log_path": None,
+        "files": {},
+        "counts": {},
+        "sizes": {},
+        "orphans": {},
+        "error": None,
+    }
+
+    try:
+
+        data_path, log_path = _resolve_paths(Path(path), local=local)
+
+        catalog["data_path"] = str(data_path)
+        catalog["log_path"] = str(log_path)
+
+        if not data_path.is_dir():
+            raise FileNotFoundError(f"Data dir {data_path} not found")
+
+        ft = TM1FileTool(data_path, local=local)
+
+        if log_path != data_path:
+            ft._log_path = log_path
+            ft.logfile_tool = TM1LogFileTool(log_path)
+
+        ft.find_all()
+
+        buckets = {suffix: getattr(ft, attr) for suffix, (attr, _) in ft._file_types.items()}
+        buckets["log"] = ft.logfile_tool.get_logs()
+        buckets["other"] = ft._non_tm1_files
+
+        for bucket, files in buckets.items():
+
+            paths = [str(f._path) for f in files]
+
+            catalog["files"][bucket] = paths
+            catalog["counts"][bucket] = len(paths)
+            catalog["sizes"][bucket] = sum(_get_size(p) for p in paths)
+
+        for orphan_type, getter in _orphan_getters.items():
+            catalog["orphans"][orphan_type] = len(getattr(ft, getter)())
+
+    except Exception as e:
+        # one broken server shouldn't stop the rest of the fleet being scanned
+        catalog["error"] = f"{type(e).__name__}: {e}"
+
+    return catalog
+
+
+def _get_size(path: str) -> int:
+
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        # deleted since the scan
+        return 0
+
+
+class TM1FleetTool:
+    """
+    Scans the data dirs of many TM1 servers in parallel
+
+    Each server is given as its data dir or its tm1s.cfg file (or a folder holding one), in which
+    case the data and log dirs are taken from the cfg file. Servers are scanned in separate
+    processes and a failure on one is recorded against it rather than stopping the rest.
+
+    """
+
+    def __init__(self, paths: Iterable[Path], local: bool = False, workers: Optional[int] = None):
+
+        # a server given twice is only scanned once
+        self._paths: List[Path] = list(dict.fromkeys(Path(p) for p in paths))
+
+        # local means the code is running on the machine the folders exist
+        # this means that absolute paths in cfg files can be used
+        self._local: bool = local
+
+        # processes used to scan, defaults to the number of cpus
+        self._workers: Optional[int] = workers
+
+        self._catalogs: Optional[Dict[str, dict]] = None
+
+    def scan(self) -> Dict[str, dict]:
+        """Scans every server and returns what was found in each
+
+        Returns:
+            Dict of catalogs keyed by the path given for the server. Each catalog is a dict with the
+            resolved data_path and log_path, lists of paths (files), counts, total sizes in bytes (sizes)
+            per type of file, counts of orphans per type and the error, if the scan failed
+        """
+
+        sources = [str(p) for p in self._paths]
+        catalogs = {}
+
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+
+            futures = {executor.submit(_scan_server, source, self._local): source for source in sources}
+
+            for future in as_completed(futures):
+
+                source = futures[future]
+
+                try:
+                    catalogs[source] = future.result()
+                except Exception as e:
+                    # e.g. the worker process died
+                    catalogs[source] = {"source": source, "error": f"{type(e).__name__}: {e}"}
+
+        # keep the order the servers were given in
+        self._catalogs = {source: catalogs[source] for source in sources}
+
+        return self._catalogs
+
+    def get_catalogs(self) -> Dict[str, dict]:
+        """Returns what was found for each server, scanning if that hasn't been done yet"""
+
+        if self._catalogs is None:
+            self.scan()
+
+        return self._catalogs
+
+    def get_errors(self) -> Dict[str, str]:
+        """Returns the error for each server that couldn't be scanned"""
+
+        return {source: c["error"] for source, c in self.get_catalogs().items() if c.get("error")}
+
+    def get_report(self) -> dict:
+        """Returns totals across every server that was scanned successfully
+
+        Returns:
+            Dict with the number of servers, the number that failed and the errors, and file counts,
+            total sizes in bytes and orphan counts per type of file, summed across the fleet
+        """
+
+        report = {
+            "servers": 0,
+            "failed": 0,
+            "errors": self.get_errors(),
+            "counts": defaultdict(int),
+            "sizes": defaultdict(int),
+            "orphans": defaultdict(int),
+        }
+
+        for catalog in self.get_catalogs().values():
+
+            report["servers"] += 1
+
+            if catalog.get("error"):
+                report["failed"] += 1
+                continue
+
+            for total in ["counts", "sizes", "orphans"]:
+                for k, v in catalog[total].items():
+                    report[total][k] += v
+
+        for total in ["counts", "sizes", "orphans"]:
+            report[total] = dict(report[total])
+
+        return report
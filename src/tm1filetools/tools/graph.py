@@ -0,0 +1,210 @@
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+from tm1filetools.files.base import TM1File
+from tm1filetools.files.binary.binary import TM1BinaryFile
+
+# e.g. ("cube", "sales")
+Key = Tuple[str, str]
+
+
+class TM1ModelGraph:
+    """
+    A graph of the dependencies between objects in a TM1 model
+
+    Nodes are keyed by the type of object and its lower case name (e.g. ("cube", "sales")) and
+    hold the files found for that object, if any. A node can exist without files if something
+    refers to it (e.g. the cube of an orphaned rux).
+
+    Edges point from an object to the objects that depend on it (e.g. a cube to its rules).
+    Both directions are stored so neighbours can be looked up either way without a scan.
+
+    """
+
+    def __init__(self):
+
+        # key -> files found for the object
+        self._files: Dict[Key, List[TM1File]] = {}
+        # key -> keys of objects that depend on it
+        self._dependents: Dict[Key, Set[Key]] = defaultdict(set)
+        # key -> keys of objects it depends on
+        self._dependencies: Dict[Key, Set[Key]] = defaultdict(set)
+        # type -> keys of that type, a dict rather than a set to keep the order they were added
+        self._kinds: Dict[str, Dict[Key, None]] = defaultdict(dict)
+
+    @staticmethod
+    def key(kind: str, name: str) -> Key:
+        """Returns the key used for an object, names are case insensitive"""
+
+        return kind, name.lower()
+
+    def add_node(self, kind: str, name: str) -> Key:
+        """Adds an object to the graph, if it isn't already there
+
+        Args:
+            kind: The type of object (e.g. "cube")
+            name: The name of the object
+
+        Returns:
+            The key of the node
+        """
+
+        key = self.key(kind, name)
+
+        if key not in self._files:
+            self._files[key] = []
+            self._kinds[kind][key] = None
+
+        return key
+
+    def add_file(self, kind: str, name: str, file_object: TM1File) -> Key:
+        """Adds a file to the node for an object, adding the node if necessary
+
+        Returns:
+            The key of the node
+        """
+
+        key = self.add_node(kind, name)
+        self._files[key].append(file_object)
+
+        return key
+
+    def add_edge(self, source: Key, target: Key) -> None:
+        """Records that target depends on source, adding either node if necessary"""
+
+        self.add_node(*source)
+        self.add_node(*target)
+
+        self._dependents[source].add(target)
+        self._dependencies[target].add(source)
+
+    def has_node(self, kind: str, name: str) -> bool:
+
+        return self.key(kind, name) in self._files
+
+    def exists(self, kind: str, name: str) -> bool:
+        """True if any files were found for the object"""
+
+        return bool(self._files.get(self.key(kind, name)))
+
+    def get_files(self, kind: str, name: str) -> List[TM1File]:
+
+        return self._files.get(self.key(kind, name), [])
+
+    def get_keys(self, kind: str) -> List[Key]:
+        """Returns the keys of all objects of a type"""
+
+        return list(self._kinds.get(kind, {}))
+
+    def get_dependents(self, kind: str, name: str) -> List[Key]:
+        """Returns the keys of the objects that depend directly on an object"""
+
+        return list(self._dependents.get(self.key(kind, name), []))
+
+    def get_dependencies(self, kind: str, name: str) -> List[Key]:
+        """Returns the keys of the objects an object depends on directly"""
+
+        return list(self._dependencies.get(self.key(kind, name), []))
+
+    def get_dependent_files(self, kind: str, name: str, recursive: bool = False) -> List[TM1File]:
+        """Returns the files of everything that depends on an object
+
+        Args:
+            kind: The type of object (e.g. "dim")
+            name: The name of the object
+            recursive: Also include anything that depends on the dependents
+
+        Returns:
+            List of file objects
+        """
+
+        seen = set()
+        stack = [self.key(kind, name)]
+        files = []
+
+        while stack:
+
+            for dependent in self._dependents.get(stack.pop(), []):
+
+                if dependent in seen:
+                    continue
+
+                seen.add(dependent)
+                files.extend(self._files[dependent])
+
+                if recursive:
+                    stack.append(dependent)
+
+        return files
+
+    def get_orphans(self, kind: str) -> List[TM1File]:
+        """Returns files of a type that depend on an object that has no files
+
+        e.g. get_orphans("rules") returns rux files without a cub file
+
+        """
+
+        return [
+            f
+            for key in self._kinds.get(kind, {})
+            if any(not self._files[d] for d in self._dependencies.get(key, []))
+            for f in self._files[key]
+        ]
+
+    def get_unreferenced(self, kind: str) -> List[Key]:
+        """Returns the keys of objects of a type that have files but nothing depending on them"""
+
+        return [key for key in self._kinds.get(kind, {}) if self._files[key] and not self._dependents.get(key)]
+
+    @classmethod
+    def from_file_tool(cls, file_tool) -> "TM1ModelGraph":
+        """Builds a graph from the files a file tool has found
+
+        Edges are derived from file names and folders:
+
+        - cube -> rules, feeders and views
+        - dim -> subsets, keyed by dim/subset or dim:hier/subset for alternate hierarchies
+        - dim -> attribute dim and attribute cube
+
+        Args:
+            file_tool: A TM1FileTool instance
+
+        Returns:
+            A graph of the model
+        """
+
+        graph = cls()
+
+        attribute_prefix = TM1BinaryFile.attribute_prefix.lower()
+        prefix_length = len(attribute_prefix)
+
+        for d in file_tool.get_dims(control=True):
+
+            key = graph.add_file("dim", d.stem, d)
+
+            if d.stem.lower().startswith(attribute_prefix):
+                graph.add_edge(graph.key("dim", d.stem[prefix_length:]), key)
+
+        for c in file_tool.get_cubes(control=True):
+
+            key = graph.add_file("cube", c.stem, c)
+
+            if c.stem.lower().startswith(attribute_prefix):
+                graph.add_edge(graph.key("dim", c.stem[prefix_length:]), key)
+
+        for r in file_tool.get_rules(control=True):
+            graph.add_edge(graph.key("cube", r.stem), graph.add_file("rules", r.stem, r))
+
+        for f in file_tool.get_feeders(control=True):
+            graph.add_edge(graph.key("cube", f.stem), graph.add_file("feeders", f.stem, f))
+
+        # public and private views with the same name share a node
+        for v in file_tool.get_views(control=True):
+            graph.add_edge(graph.key("cube", v.cube), graph.add_file("view", f"{v.cube}/{v.view_name}", v))
+
+        # subsets of an alternate hierarchy are dim:hier/subset so they don't share a node with the default's
+        for s in file_tool.get_subs(control=True):
+            name = s.dimension if s.hierarchy.lower() == s.dimension.lower() else f"{s.dimension}:{s.hierarchy}"
+            graph.add_edge(graph.key("dim", s.dimension), graph.add_file("subset", f"{name}/{s.subset_name}", s))
+
+        return graph
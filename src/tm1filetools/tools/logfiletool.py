@@ -60,15 +60,19 @@ class TM1LogFileTool(TM1BaseFileTool):
 
         return self._process_error_logs
 
-    def _find_logs(self):
+    def _find_logs(self, paths: Optional[List[Path]] = None):
 
         # logs may be in a different path so search with the glob func
+        # unless the caller has already found them (e.g. in a scan of the data dir)
         # We should also be careful of the tm1s.log file as we may fail to get a lock on it
 
+        if paths is None:
+            paths = self._index_files(self._path).get(TM1LogFile.suffix, [])
+
         tm1_log = []
         process_error_logs = []
         cube_change_logs = []
-        for log in self._case_insensitive_glob(self._path, f"*.{TM1LogFile.suffix}"):
+        for log in paths:
             # if we think this is the tm1s.log file, use the derived class that avoids trying to open it
             if log.stem.lower() == "tm1s":
                 tm1_log.append(TM1ChangeLogFile(log))
@@ -0,0 +1,306 @@
+import csv
+import locale
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from tm1filetools.files import TM1CMAFile
+from tm1filetools.files.text.cma import TM1CMAFilter
+
+from .aggregate import TM1CMAAggregator
+
+# start and end offsets in bytes, end not included
+Range = Tuple[int, int]
+
+
+def _read_range(path: str, start: int, end: int, delimiter: str, el_filter: Optional[TM1CMAFilter]) -> Iterator[list]:
+
+    # the same as TM1CMAFile.read_rows but only for the rows that start in the range
+    encoding = locale.getpreferredencoding(False)
+
+    def lines():
+
+        with open(path, "rb") as f:
+
+            f.seek(start)
+
+            while f.tell() < end:
+
+                line = f.readline()
+
+                if not line:
+                    return
+
+                yield line.decode(encoding)
+
+    for row in csv.reader(lines(), delimiter=delimiter, quotechar=TM1CMAFile.quote_character):
+        if row and (not el_filter or el_filter.match_row(row)):
+            yield row
+
+
+def _count_range(path: str, start: int, end: int, delimiter: str, el_filter: Optional[TM1CMAFilter]) -> Tuple[int, int]:
+
+    # runs in a worker process, returns the number of numeric and string cells
+    numeric = 0
+    strings = 0
+
+    for row in _read_range(path, start, end, delimiter, el_filter):
+        try:
+            float(row[-1])
+            numeric = numeric + 1
+        except ValueError:
+            strings = strings + 1
+
+    return numeric, strings
+
+
+def _aggregate_range(
+    path: str,
+    start: int,
+    end: int,
+    delimiter: str,
+    el_filter: Optional[TM1CMAFilter],
+    positions: List[int],
+    max_groups: int,
+    spill_path: Optional[Path],
+) -> list:
+
+    # runs in a worker process, returns the paths of spill files with the groups in the range
+    # so no more than max_groups are ever held in memory, here or in the process merging them
+    shifted = [p + 1 for p in positions]
+
+    with TM1CMAAggregator(positions, max_groups=max_groups, spill_path=spill_path) as agg:
+
+        for row in _read_range(path, start, end, delimiter, el_filter):
+            agg.add_row(tuple([row[p] for p in shifted]), row[-1])
+
+        return agg.release_spills()
+
+
+def _extract_range(
+    path: str, start: int, end: int, delimiter: str, el_filter: Optional[TM1CMAFilter], part_path: str
+) -> int:
+
+    # runs in a worker process, writes the matching rows to a file of its own and returns how many
+    count = 0
+
+    with open(part_path, "w") as f:
+        for row in _read_range(path, start, end, delimiter, el_filter):
+            f.write(TM1CMAFile.format_row(row, delimiter) + "\n")
+            count = count + 1
+
+    return count
+
+
+class TM1CMAParallelReader:
+    """
+    Reads a single large cma file in parallel by splitting it into ranges of bytes
+
+    Each range starts at the beginning of a line that isn't inside a quoted value. Quotes are counted
+    from the start of the file to know whether a line break is in a quoted value or not, which is
+    fast as it's done on bytes, not rows. The ranges are parsed in a process pool and the results of
+    each combined as they finish.
+
+    """
+
+    # ranges are no smaller than this
+    min_range_size = 1 << 20
+
+    _block_size = 1 << 20
+
+    def __init__(self, cma: TM1CMAFile, workers: Optional[int] = None, parts: Optional[int] = None):
+
+        self._cma: TM1CMAFile = cma
+        self._workers: int = workers or os.cpu_count() or 1
+
+        # a few ranges per worker so one slow range doesn't hold everything up
+        self._parts: Optional[int] = parts
+
+    def get_ranges(self) -> List[Range]:
+        """Returns the ranges of bytes the file is split into, in order
+
+        Whether a line break is inside a quoted value can't be told from the bytes around it, so this reads
+        the whole file once, in this process, counting quotes. That's a single pass over bytes without any
+        parsing so it's much quicker than reading the rows, but it is the part that doesn't get faster with
+        more workers
+
+        Returns:
+            List of (start, end) tuples
+        """
+
+        size = self._cma._path.stat().st_size
+        parts = self._parts or max(1, min(self._workers * 4, size // self.min_range_size))
+
+        quote = TM1CMAFile.quote_character.encode()
+        boundaries = [0]
+
+        position = 0
+
+        with open(self._cma._path, "rb") as f:
+
+            for part in range(1, parts):
+
+                target = max(size * part // parts, position)
+
+                # whether the target is inside a quoted value, counting from the last boundary
+                f.seek(position)
+                in_quotes = self._count(f, target - position, quote) % 2 == 1
+
+                position = self._find_line_start(f, target, in_quotes, quote)
+
+                if position >= size:
+                    break
+
+                if position > boundaries[-1]:
+                    boundaries.append(position)
+
+        boundaries.append(size)
+
+        return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+    def count(self, el_filter: Union[str, TM1CMAFilter, None] = None) -> Dict[str, int]:
+        """Counts the cells matching a filter
+
+        Returns:
+            Dict with the number of numeric and string cells
+        """
+
+        numeric = 0
+        strings = 0
+
+        for n, s in self._map(_count_range, el_filter, self.get_ranges()):
+            numeric = numeric + n
+            strings = strings + s
+
+        return {"numeric": numeric, "strings": strings}
+
+    def aggregate(
+        self,
+        positions: List[int],
+        el_filter: Union[str, TM1CMAFilter, None] = None,
+        max_groups: int = 1000000,
+        spill_path: Optional[Path] = None,
+    ) -> TM1CMAAggregator:
+        """Aggregates the cells matching a filter grouped by the elements at some positions
+
+        Each range is aggregated to spill files, which are merged when the results are read, so memory
+        is bounded by max_groups however many groups there are. See TM1CMAAggregator for the arguments
+
+        Returns:
+            The aggregator, which should be closed when done with
+        """
+
+        agg = TM1CMAAggregator(positions, max_groups=max_groups, spill_path=spill_path)
+
+        ranges = self.get_ranges()
+
+        extras = [(list(positions), max_groups, spill_path)] * len(ranges)
+
+        try:
+            for spills in self._map(_aggregate_range, el_filter, ranges, extras):
+                agg.add_spills(spills)
+        except Exception:
+            # don't leave the spill files of the ranges that did finish behind
+            agg.close()
+            raise
+
+        return agg
+
+    def extract(self, path: Path, el_filter: Union[str, TM1CMAFilter, None] = None) -> int:
+        """Writes the rows matching a filter to a new cma file, in the same order
+
+        Args:
+            path: The file to write to
+            el_filter: Only rows matching a filter, either a TM1CMAFilter or elements separated by colons
+
+        Returns:
+            The number of rows written
+        """
+
+        ranges = self.get_ranges()
+
+        with tempfile.TemporaryDirectory(dir=Path(path).parent) as temp:
+
+            parts = [str(Path(temp, f"{index}.part")) for index in range(len(ranges))]
+            count = sum(self._map(_extract_range, el_filter, ranges, [(part,) for part in parts]))
+
+            # the parts are in order so just join them up, there are none for an empty file
+            with open(path, "wb") as out:
+                for part in parts:
+                    if os.path.exists(part):
+                        with open(part, "rb") as f:
+                            shutil.copyfileobj(f, out, self._block_size)
+
+        return count
+
+    def _map(self, func, el_filter, ranges: List[Range], extras: Optional[List[tuple]] = None) -> Iterator:
+
+        # calls a worker function for each range, optionally with some more arguments per range
+        # and yields the results in the order they finish, so they can be combined while others run
+        # an empty file
+        if not self._cma.delimiter or not ranges:
+            return
+
+        el_filter = TM1CMAFile._get_filter(el_filter)
+        extras = extras or [()] * len(ranges)
+
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+
+            futures = [
+                executor.submit(func, str(self._cma._path), start, end, self._cma.delimiter, el_filter, *extra)
+                for (start, end), extra in zip(ranges, extras)
+            ]
+
+            for future in as_completed(futures):
+                yield future.result()
+
+    def _count(self, f, length: int, quote: bytes) -> int:
+
+        # the number of quotes in the next length bytes
+        count = 0
+
+        while length > 0:
+
+            block = f.read(min(length, self._block_size))
+
+            if not block:
+                break
+
+            count = count + block.count(quote)
+            length = length - len(block)
+
+        return count
+
+    def _find_line_start(self, f, position: int, in_quotes: bool, quote: bytes) -> int:
+
+        # the position just after the next line break that isn't in a quoted value
+        f.seek(position)
+
+        while True:
+
+            block = f.read(self._block_size)
+
+            if not block:
+                return position
+
+            start = 0
+
+            while True:
+
+                newline = block.find(b"\n", start)
+
+                if newline == -1:
+                    in_quotes = in_quotes != (block.count(quote, start) % 2 == 1)
+                    break
+
+                in_quotes = in_quotes != (block.count(quote, start, newline) % 2 == 1)
+
+                if not in_quotes:
+                    return position + newline + 1
+
+                start = newline + 1
+
+            position = position + len(block)
@@ -0,0 +1,203 @@
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from tm1filetools.files.text.chore import TM1ChoreModel
+
+# e.g. (datetime(2023, 1, 1, 3), datetime(2023, 1, 1, 3, 5), "load all")
+Run = Tuple[datetime, datetime, str]
+
+
+class TM1ChoreSchedule:
+    """
+    The runs of a set of chores over a window of time, and where they overlap
+
+    Each active chore's schedule is expanded into runs from its start time and frequency. How long a
+    run takes isn't in the chore file so durations are passed in per chore, with a default for the
+    rest. Overlaps are found with a sweep over the start and end of every run in time order.
+
+    """
+
+    def __init__(
+        self,
+        chores: Iterable[TM1ChoreModel],
+        start: datetime,
+        end: datetime,
+        durations: Optional[Dict[str, timedelta]] = None,
+        default_duration: timedelta = timedelta(minutes=5),
+    ):
+
+        self.start: datetime = start
+        self.end: datetime = end
+
+        self._durations: Dict[str, timedelta] = durations or {}
+        self._default_duration: timedelta = default_duration
+
+        # only the active chores run
+        self._chores: Dict[str, TM1ChoreModel] = {c.name: c for c in chores if c.active}
+
+        self._runs: Optional[List[Run]] = None
+        self._overlaps: Optional[List[Tuple[Run, Run]]] = None
+
+    def get_runs(self) -> List[Run]:
+        """Returns every run of an active chore that overlaps the window, in order of start time
+
+        Returns:
+            List of (start, end, chore name) tuples
+        """
+
+        if self._runs is None:
+
+            runs = []
+
+            for name, chore in self._chores.items():
+                runs.extend(self._expand(chore, self._durations.get(name, self._default_duration)))
+
+            self._runs = sorted(runs)
+
+        return self._runs
+
+    def get_overlaps(self) -> List[Tuple[Run, Run]]:
+        """Returns each pair of runs that overlap, runs that end as another starts don't count
+
+        Returns:
+            List of pairs of (start, end, chore name) tuples, the earlier run first
+        """
+
+        if self._overlaps is None:
+
+            overlaps = []
+            running = {}
+
+            for _, is_start, index in self._get_events():
+
+                run = self.get_runs()[index]
+
+                if not is_start:
+                    del running[index]
+                    continue
+
+                # everything still running overlaps the run starting
+                for other in running.values():
+                    overlaps.append((other, run))
+
+                running[index] = run
+
+            self._overlaps = overlaps
+
+        return self._overlaps
+
+    def get_overlapping_chores(self) -> Dict[str, List[str]]:
+        """Returns the other chores each chore overlaps with at some point in the window
+
+        Returns:
+            Dict of sorted lists of chore names keyed by chore name, only chores with overlaps are included
+        """
+
+        chores = defaultdict(set)
+
+        for (_, _, first), (_, _, second) in self.get_overlaps():
+
+            if first != second:
+                chores[first].add(second)
+                chores[second].add(first)
+
+        return {name: sorted(others) for name, others in sorted(chores.items())}
+
+    def get_peak_concurrency(self) -> Dict[datetime, int]:
+        """Returns the most chores running at once in each hour of the window
+
+        Returns:
+            Dict of counts keyed by the start of each hour
+        """
+
+        events = self._get_events()
+        peaks = {}
+
+        count = 0
+        position = 0
+
+        hour = self.start.replace(minute=0, second=0, microsecond=0)
+
+        while hour < self.end:
+
+            next_hour = hour + timedelta(hours=1)
+
+            # what's running at the start of the hour
+            while position < len(events) and events[position][0] <= hour:
+                count = count + (1 if events[position][1] else -1)
+                position = position + 1
+
+            peak = count
+
+            # and the most running at any point in it
+            while position < len(events) and events[position][0] < next_hour:
+                count = count + (1 if events[position][1] else -1)
+                position = position + 1
+                peak = max(peak, count)
+
+            peaks[hour] = peak
+            hour = next_hour
+
+        return peaks
+
+    def get_concurrent_processes(self) -> Dict[str, List[str]]:
+        """Returns the processes run by chores that overlap with other chores
+
+        These are where to look for lock contention, particularly processes run by more than one chore
+
+        Returns:
+            Dict of sorted lists of the overlapping chores that run each process, keyed by process name
+        """
+
+        processes = defaultdict(set)
+
+        for name in self.get_overlapping_chores():
+            for process in self._chores[name].get_processes():
+                processes[process].add(name)
+
+        return {process: sorted(chores) for process, chores in sorted(processes.items())}
+
+    def _get_events(self) -> List[Tuple[datetime, bool, int]]:
+
+        # (time, is start, index of the run), ends sort before starts at the same time
+        # so a run ending as another starts isn't an overlap
+        events = []
+
+        for index, (start, end, _) in enumerate(self.get_runs()):
+            events.append((start, True, index))
+            events.append((end, False, index))
+
+        return sorted(events)
+
+    def _expand(self, chore: TM1ChoreModel, duration: timedelta) -> List[Run]:
+
+        if chore.start_time is None:
+            return []
+
+        run_start = chore.start_time
+
+        if not chore.frequency:
+
+            # runs once
+            if run_start < self.end and run_start + duration > self.start:
+                return [(run_start, run_start + duration, chore.name)]
+
+            return []
+
+        # skip to the first run that's still going at the start of the window
+        if run_start + duration <= self.start:
+            skip = math.ceil((self.start - duration - run_start) / chore.frequency)
+            run_start = run_start + skip * chore.frequency
+
+            if run_start + duration <= self.start:
+                run_start = run_start + chore.frequency
+
+        runs = []
+
+        while run_start < self.end:
+            runs.append((run_start, run_start + duration, chore.name))
+            run_start = run_start + chore.frequency
+
+        return runs
@@ -0,0 +1,116 @@
+import difflib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from tm1filetools.files import TM1ProcessFile
+
+# e.g. {"prolog": {"added": 1, "removed": 1}}
+Changes = Dict[str, Dict[str, int]]
+
+
+def _transform_process(
+    path: str, func: Callable[[str], str], dry_run: bool
+) -> Tuple[Optional[Changes], Optional[str], Optional[str]]:
+
+    # runs in a worker process, returns the changes per tab, the diff and the error, if any
+    try:
+        p = TM1ProcessFile(Path(path))
+        model = p.get_model()
+
+        changes = {}
+        diff = []
+
+        for tab in TM1ProcessFile._code_tab_codes.values():
+
+            before = getattr(model, tab)
+            after = func("".join(before)).splitlines(keepends=True)
+
+            if [line.rstrip("\r\n") for line in after] == [line.rstrip("\r\n") for line in before]:
+                continue
+
+            setattr(model, tab, after)
+
+            lines = list(difflib.unified_diff(before, after, f"{p.name}/{tab}", f"{p.name}/{tab}", lineterm=""))
+
+            changes[tab] = {
+                "added": sum(1 for line in lines[2:] if line.startswith("+")),
+                "removed": sum(1 for line in lines[2:] if line.startswith("-")),
+            }
+            diff.extend(line.rstrip("\r\n") for line in lines)
+
+        if changes and not dry_run:
+            p.write_model(model)
+
+        return changes, "\n".join(diff), None
+
+    except Exception as e:
+        return None, None, f"{type(e).__name__}: {e}"
+
+
+class TM1ProcessTransformer:
+    """
+    Applies a function to the code of many processes in parallel and writes back the ones that change
+
+    The function is called with the code of each tab (prolog, metadata, data and epilog) as a single
+    string and returns the new code. It's run in a process pool, so it has to be a function defined
+    at the top level of a module (i.e. not a lambda).
+
+    Each process is written to a temporary file which then replaces it, see TM1ProcessFile.write_model,
+    so a process is never left half written.
+
+    """
+
+    def __init__(self, func: Callable[[str], str], workers: Optional[int] = None, dry_run: bool = False):
+
+        self._func: Callable[[str], str] = func
+        self._workers: Optional[int] = workers
+
+        # report what would change without writing anything
+        self._dry_run: bool = dry_run
+
+    def transform(self, procs: Iterable[TM1ProcessFile]) -> dict:
+        """Transforms the code of processes
+
+        Args:
+            procs: The process files to transform
+
+        Returns:
+            Dict with the lines added and removed per tab and a unified diff for each process changed,
+            the number unchanged and the errors, all keyed by process file name
+        """
+
+        procs = list(procs)
+        result = {"changed": {}, "diffs": {}, "unchanged": 0, "errors": {}}
+
+        if not procs:
+            return result
+
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+
+            # lots of small jobs so send them in batches
+            chunksize = max(1, len(procs) // ((self._workers or os.cpu_count() or 1) * 4))
+            results = executor.map(
+                _transform_process,
+                [str(p._path) for p in procs],
+                [self._func] * len(procs),
+                [self._dry_run] * len(procs),
+                chunksize=chunksize,
+            )
+
+            for p, (changes, diff, error) in zip(procs, results):
+
+                if error:
+                    result["errors"][p.name] = error
+                elif not changes:
+                    result["unchanged"] += 1
+                else:
+                    result["changed"][p.name] = changes
+                    result["diffs"][p.name] = diff
+
+                    # the file was written in the worker, so anything read from it before is stale
+                    if not self._dry_run:
+                        p._reset_file_properties()
+
+        return result
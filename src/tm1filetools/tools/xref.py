@@ -0,0 +1,233 @@
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from tm1filetools.files import TM1ProcessFile, TM1RulesFile
+from tm1filetools.files.text.text import TM1TextFile
+
+from .graph import TM1ModelGraph
+
+# e.g. ("cube", "Sales")
+Reference = Tuple[str, str]
+
+
+def _extract_references(path: str) -> Tuple[Optional[List[Reference]], Optional[str]]:
+
+    # runs in a worker process, returns the references and the error, if any
+    try:
+        return TM1ReferenceExtractor.find_references(TM1ReferenceExtractor.get_code(Path(path))), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+class TM1ReferenceExtractor:
+    """
+    Finds the objects referred to by name in the code of processes and rules
+
+    Only calls to the functions below with a quoted string for the object are found, anything
+    built up in a variable can't be known without running the code.
+
+    Files are read in a process pool. Results are cached against a hash of the content of each file
+    and, if a cache file is provided, the cache can be saved and reused between runs.
+
+    """
+
+    # lower case function name -> type of object referred to and the position of its argument
+    functions = {
+        "executeprocess": ("process", 0),
+        "runprocess": ("process", 0),
+        "cellgetn": ("cube", 0),
+        "cellgets": ("cube", 0),
+        "cellputn": ("cube", 1),
+        "cellputs": ("cube", 1),
+        "cellincrementn": ("cube", 1),
+        "db": ("cube", 0),
+        "dimensionelementinsert": ("dim", 0),
+        "subsetcreate": ("dim", 0),
+        "viewcreate": ("cube", 0),
+    }
+
+    _call_pattern = re.compile(r"\b(" + "|".join(functions) + r")\s*\(", re.IGNORECASE)
+
+    # single quoted strings, a quote is escaped by doubling it
+    _literal_pattern = re.compile(r"'((?:[^']|'')*)'")
+
+    def __init__(self, workers: Optional[int] = None, cache_file: Optional[Path] = None):
+
+        self._workers: Optional[int] = workers
+
+        # sha1 of the file content -> references, lists rather than tuples so it survives a round trip to json
+        self._cache: Dict[str, List[List[str]]] = {}
+        self._cache_file: Optional[Path] = cache_file
+
+        # files that couldn't be read on the last run and why
+        self.errors: Dict[str, str] = {}
+
+        if self._cache_file and self._cache_file.exists():
+            with open(self._cache_file, "r") as f:
+                self._cache.update(json.load(f))
+
+    def save(self) -> None:
+        """Write the cached results to the cache file so they can be reused"""
+
+        if self._cache_file:
+            with open(self._cache_file, "w") as f:
+                json.dump(self._cache, f)
+
+    def extract(self, files: Iterable[TM1TextFile]) -> Dict[str, List[Reference]]:
+        """Finds the references in the code of process and rules files
+
+        Args:
+            files: Process and rules files
+
+        Returns:
+            Dict of lists of (type, name) tuples keyed by file path
+        """
+
+        self.errors = {}
+        references = {}
+        todo = {}
+
+        for f in files:
+
+            with open(f._path, "rb") as fb:
+                sha1 = hashlib.sha1(fb.read()).hexdigest()
+
+            if sha1 in self._cache:
+                references[str(f._path)] = [tuple(r) for r in self._cache[sha1]]
+            else:
+                todo[str(f._path)] = sha1
+
+        if todo:
+            with ProcessPoolExecutor(max_workers=self._workers) as executor:
+
+                # lots of small jobs so send them in batches
+                chunksize = max(1, len(todo) // ((self._workers or os.cpu_count() or 1) * 4))
+                results = executor.map(_extract_references, todo, chunksize=chunksize)
+
+                for (path, sha1), (found, error) in zip(todo.items(), results):
+
+                    if error:
+                        self.errors[path] = error
+                        continue
+
+                    references[path] = found
+                    self._cache[sha1] = [list(r) for r in found]
+
+        return references
+
+    def add_to_graph(self, graph: TM1ModelGraph, procs: Iterable[TM1ProcessFile], rules: Iterable[TM1RulesFile]):
+        """Adds the processes and the references found in processes and rules to a model graph
+
+        Processes are added as "process" nodes and each reference as an edge from the object referred to
+        to the process or rules that refer to it, e.g. get_unreferenced("process") returns the processes
+        no other process calls
+
+        Args:
+            graph: A model graph, e.g. from TM1ModelGraph.from_file_tool
+            procs: Process files
+            rules: Rules files
+        """
+
+        procs = list(procs)
+        rules = list(rules)
+
+        sources = {}
+
+        for kind, files in [("process", procs), ("rules", rules)]:
+            for f in files:
+
+                # the graph may already have the file, e.g. rules
+                if f not in graph.get_files(kind, f.stem):
+                    graph.add_file(kind, f.stem, f)
+
+                sources[str(f._path)] = graph.key(kind, f.stem)
+
+        for path, found in self.extract(procs + rules).items():
+            for kind, name in found:
+                graph.add_edge(graph.key(kind, name), sources[path])
+
+    @staticmethod
+    def get_code(path: Path) -> str:
+        """Returns the code of a process (all four tabs) or a rules file as a single string"""
+
+        if path.suffix.lower() == f".{TM1ProcessFile.suffix}":
+
+            pro = TM1ProcessFile(path)
+            lines = pro.get_prolog_code() + pro.get_metadata_code() + pro.get_data_code() + pro.get_epilog_code()
+
+        else:
+            lines = TM1RulesFile(path).readlines()
+
+        # comments have to start the line
+        return "\n".join(line for line in lines if not line.lstrip().startswith("#"))
+
+    @classmethod
+    def find_references(cls, code: str) -> List[Reference]:
+        """Returns the objects referred to by name in some code, in the order found, without duplicates
+
+        Args:
+            code: TI or rules code
+
+        Returns:
+            List of (type, name) tuples e.g. ("cube", "Sales")
+        """
+
+        references = {}
+
+        for match in cls._call_pattern.finditer(code):
+
+            kind, position = cls.functions[match.group(1).lower()]
+            arguments = cls._get_arguments(code, match.end())
+
+            if position >= len(arguments):
+                continue
+
+            literal = cls._literal_pattern.fullmatch(arguments[position])
+
+            if literal:
+                references[(kind, literal.group(1).replace("''", "'"))] = None
+
+        return list(references)
+
+    @staticmethod
+    def _get_arguments(code: str, start: int) -> List[str]:
+
+        # split the arguments of a call on commas that aren't in quotes or brackets
+        # start is the position just after the opening bracket
+        arguments = []
+        current = []
+        depth = 0
+        quote = None
+
+        # index rather than slice to avoid copying the rest of the code for every call
+        for index in range(start, len(code)):
+
+            char = code[index]
+
+            if quote:
+                # a doubled quote just closes and reopens the string, which works out the same
+                if char == quote:
+                    quote = None
+            elif char in "'\"":
+                quote = char
+            elif char == "(":
+                depth = depth + 1
+            elif char == ")":
+                if depth == 0:
+                    break
+                depth = depth - 1
+            elif char == "," and depth == 0:
+                arguments.append("".join(current).strip())
+                current = []
+                continue
+
+            current.append(char)
+
+        arguments.append("".join(current).strip())
+
+        return arguments
@@ -2,6 +2,7 @@ from datetime import datetime
 from pathlib import Path
 from time import sleep
 
+from tm1filetools.files import TM1CubeFile, TM1SubsetFile, TM1ViewFile
 from tm1filetools.files.base import TM1File
 
 
@@ -112,3 +113,29 @@ def test_last_modified(test_folder):
     f._path.touch()
 
     assert f.get_last_modified() > lm
+
+
+def test_no_instance_dict(test_folder):
+
+    # file objects use slots to keep memory down when there are lots of them
+    f = TM1File(Path.joinpath(test_folder, "cat.cub"))
+    assert not hasattr(f, "__dict__")
+
+    f = TM1SubsetFile(
+        Path.joinpath(test_folder, "Alex", f"cat{TM1SubsetFile.folder_suffix}", "platypus.sub"), public=False
+    )
+    assert not hasattr(f, "__dict__")
+    assert f.owner == "Alex"
+
+    f = TM1ViewFile(Path.joinpath(test_folder, f"cat{TM1ViewFile.folder_suffix}", "mouse.vue"))
+    assert not hasattr(f, "__dict__")
+    assert f.view_name == "mouse"
+
+
+def test_type_suffix(test_folder):
+
+    # the class has the suffix of the file type, the instance the actual suffix of the file
+    f = TM1CubeFile(Path.joinpath(test_folder, "dog.CUB"))
+
+    assert TM1CubeFile.suffix == "cub"
+    assert f.suffix == "CUB"
@@ -1,3 +1,4 @@
+from datetime import datetime, timedelta
 from pathlib import Path
 
 from tm1filetools.files import TM1ChoreFile
@@ -9,3 +10,44 @@ def test_init(test_folder):
 
     assert p
     assert p.suffix == "cho"
+
+
+def test_get_model(json_dumps_folder):
+
+    # hand written, not exported from a server, see TM1ChoreFile._parse_model
+    c = TM1ChoreFile(Path.joinpath(json_dumps_folder, "chores", "load_all.cho"))
+
+    model = c.get_model()
+
+    assert model is c.get_model()
+
+    assert model.name == "load all"
+    assert model.start_time == datetime(2023, 1, 1, 3)
+    assert model.frequency == timedelta(days=1)
+    assert model.active
+
+    assert model.get_processes() == ["new process", "process_logging.start"]
+    assert model.steps[0].parameters == {"pPeriod": "202301", "pVersion": "BP, final", "pLogging": 1}
+    assert model.steps[1].parameters == {}
+
+
+def test_get_model_empty(test_folder):
+
+    c = TM1ChoreFile(Path.joinpath(test_folder, "quokka.cho"))
+
+    # the name comes from the file if it's not in it
+    assert c.get_model().name == "quokka"
+    assert c.get_model().steps == []
+    assert not c.get_model().active
+
+    c.write('530,20230101000000\n531,000013000\n532,0\n533,1\n6,"wombat"\n560,0\n590,0\n')
+
+    assert c.get_model().frequency == timedelta(hours=1, minutes=30)
+    assert c.get_model().get_processes() == ["wombat"]
+
+
+def test_parse_frequency():
+
+    assert TM1ChoreFile._parse_frequency("007000000") == timedelta(days=7)
+    assert TM1ChoreFile._parse_frequency("000000030") == timedelta(seconds=30)
+    assert TM1ChoreFile._parse_frequency("1000000") == timedelta(days=1)
@@ -1,6 +1,16 @@
+import pickle
 from pathlib import Path
 
-from tm1filetools.files.text.cma import TM1CMAFile
+import pytest
+
+from tm1filetools.files.text.cma import TM1CMAFile, TM1CMAFilter
+
+cma = """"Planning:Sales","BP","202201","Sales","Australia","Amount",200
+"Planning:Sales","BP","202202","Sales","Australia","Amount",300.5
+"Planning:Sales","BP","202203","Sales","Australia","Comment","To the moon!"
+"Planning:Sales","FC","202201","Sales","Germany","Amount",-50
+"Planning:Sales","FC","202202","Sales","Germany","Amount",150
+"""
 
 
 def test_get_delimiter(test_folder):
@@ -15,7 +25,7 @@ def test_get_delimiter(test_folder):
     f.write('"Planning:Sales Planning","202301","Software","Germany",1000000')
 
     assert f._get_delimiter() == ","
-    assert not f.delimiter
+    assert f.delimiter == ","
 
 
 def test_get_cube(test_folder):
@@ -30,6 +40,7 @@ def test_get_cube(test_folder):
     f.write('"Planning:Sales Planning","202301","Software","Germany",1000000')
 
     assert f._get_cube() == "Sales Planning"
+    assert f.cube == "Sales Planning"
 
 
 def test_reader(test_folder):
@@ -137,3 +148,107 @@ def test_el_filter_multi_length(test_folder):
         rows.append(row)
 
     assert len(rows) == 0
+
+
+def check_columns(f: TM1CMAFile, use_numpy: bool):
+
+    # small chunks so the string value isn't in the first one
+    columns = f.load_columns(chunk_size=2, use_numpy=use_numpy)
+
+    assert columns.cube == "Sales"
+    assert columns.width == 5
+    assert len(columns) == 5
+    assert columns.elements[0] == ["BP", "FC"]
+    assert list(columns.codes[0]) == [0, 0, 0, 1, 1]
+    assert list(columns.string_rows) == [2]
+    assert columns.string_values == ["To the moon!"]
+
+    assert columns.get_row(1) == (["BP", "202202", "Sales", "Australia", "Amount"], 300.5)
+    assert columns.get_row(2)[1] == "To the moon!"
+    assert columns.get_code(3, "Germany") == 1
+    assert columns.get_code(3, "France") is None
+
+    assert columns.sum_by([0]) == {("BP",): 500.5, ("FC",): 100.0}
+    assert columns.count_by([0]) == {("BP",): 2, ("FC",): 2}
+    assert columns.sum_by([]) == {(): 600.5}
+
+    mask = columns.get_mask(1, ["202201", "202203"])
+    mask = columns.get_mask(4, ["Amount", "Comment"], mask=mask)
+
+    assert list(mask) == [1, 0, 1, 1, 0]
+    assert columns.sum_by([0, 1], mask=mask) == {("BP", "202201"): 200.0, ("FC", "202201"): -50.0}
+
+    # only the string cell, or nothing at all, has no groups
+    for mask in [columns.get_mask(4, ["Comment"]), columns.get_mask(4, ["Nothing"])]:
+        assert columns.sum_by([], mask=mask) == {}
+        assert columns.count_by([], mask=mask) == {}
+        assert columns.sum_by([0], mask=mask) == {}
+
+
+def test_load_columns(test_folder):
+
+    f = TM1CMAFile(Path.joinpath(test_folder, "test.cma"))
+    f.write(cma)
+
+    check_columns(f, use_numpy=False)
+
+
+def test_load_columns_numpy(test_folder):
+
+    pytest.importorskip("numpy")
+
+    f = TM1CMAFile(Path.joinpath(test_folder, "test.cma"))
+    f.write(cma)
+
+    check_columns(f, use_numpy=True)
+
+
+def test_load_columns_empty(test_folder):
+
+    f = TM1CMAFile(Path.joinpath(test_folder, "test.cma"))
+    f._path.touch()
+
+    columns = f.load_columns(use_numpy=False)
+
+    assert len(columns) == 0
+    assert columns.width == 0
+
+
+def test_filter(test_folder, tmp_path):
+
+    f = TM1CMAFile(Path.joinpath(test_folder, "test.cma"))
+    f.write(cma)
+
+    el_filter = TM1CMAFilter().isin(0, ["BP", "FC"]).startswith(1, "20220").equals(4, "Comment", negate=True)
+
+    assert [row.elements[1] for row in f.reader(el_filter=el_filter)] == ["202201", "202202", "202201", "202202"]
+
+    el_filter.matches(3, "Ger.*")
+
+    assert [row._value for row in f.reader(el_filter=el_filter)] == ["-50", "150"]
+
+    # the whole element has to match
+    assert not TM1CMAFilter().matches(0, "B").match(["BP"])
+    assert TM1CMAFilter().matches(0, "B", negate=True).match(["BP"])
+
+    # positions past the end of the row don't match
+    assert not TM1CMAFilter().equals(9, "BP").match(["BP"])
+    assert TM1CMAFilter().match(["BP"])
+
+    # the same filter on another file, after being pickled
+    other = TM1CMAFile(tmp_path / "other.cma")
+    other.write('"Planning:Sales","BP","202202","Sales","Germany","Amount",5\n')
+
+    el_filter = pickle.loads(pickle.dumps(el_filter))
+
+    assert [row.val_n for row in other.reader(el_filter=el_filter)] == [5]
+    assert len(f.load_columns(use_numpy=False, el_filter=el_filter)) == 2
+    assert len(f.load_columns(use_numpy=False, el_filter="FC")) == 2
+
+
+def test_filter_from_string():
+
+    el_filter = TM1CMAFilter.from_string("202302::Australia::")
+
+    assert el_filter.match(["202302", "Hardware", "Australia"])
+    assert not el_filter.match(["202302", "Hardware", "Germany"])
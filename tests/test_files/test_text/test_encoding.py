@@ -0,0 +1,97 @@
+from pathlib import Path
+
+from tm1filetools.files import TM1EncodingDetector
+
+
+def test_detect_bom(json_dumps_folder):
+
+    detector = TM1EncodingDetector()
+
+    # subsets saved by TM1 start with a utf-8 bom
+    path = Path.joinpath(json_dumps_folder, "subsets", "test.tm1filetools.mdx_subset.sub")
+
+    assert detector.detect(path) == "UTF-8-SIG"
+
+
+def test_detect_missing_file(test_folder):
+
+    detector = TM1EncodingDetector()
+
+    assert detector.detect(Path.joinpath(test_folder, "not_there.pro")) is None
+
+
+def test_detect_sample(test_folder):
+
+    detector = TM1EncodingDetector(sample_size=1024, chunk_size=256)
+
+    path = Path.joinpath(test_folder, "big.cma")
+    path.write_text("plain ascii text\n" * 10000)
+
+    assert detector.detect(path).lower() in ["ascii", "utf-8"]
+
+
+def test_detect_cached(test_folder, monkeypatch):
+
+    detector = TM1EncodingDetector()
+
+    path = Path.joinpath(test_folder, "emu.blb")
+    path.write_text("some text")
+
+    encoding = detector.detect(path)
+
+    # an unchanged file shouldn't be checked again
+    def fail(path):
+        raise AssertionError("encoding detected twice")
+
+    monkeypatch.setattr(detector, "_detect", fail)
+
+    assert detector.detect(path) == encoding
+
+    # but a changed one should
+    path.write_text("some more text")
+    monkeypatch.setattr(detector, "_detect", lambda path: "changed")
+
+    assert detector.detect(path) == "changed"
+
+
+def test_cache_file(test_folder, monkeypatch):
+
+    cache_file = Path.joinpath(test_folder, "encodings.json")
+
+    path = Path.joinpath(test_folder, "emu.blb")
+    path.write_text("some text")
+
+    detector = TM1EncodingDetector(cache_file=cache_file)
+    encoding = detector.detect(path)
+    detector.save()
+
+    assert cache_file.exists()
+
+    detector = TM1EncodingDetector(cache_file=cache_file)
+    monkeypatch.setattr(detector, "_detect", lambda path: "not cached")
+
+    assert detector.detect(path) == encoding
+
+
+def test_get_read_encoding(test_folder):
+
+    detector = TM1EncodingDetector(sample_size=1024)
+
+    path = Path.joinpath(test_folder, "emu.blb")
+
+    # a non ascii byte past the sample
+    for encoding, expected in [("utf-8", "utf-8"), ("cp1252", "cp1252")]:
+
+        path.write_bytes(b"x" * 4096 + "Zürich".encode(encoding))
+
+        assert detector.detect(path) == "ascii"
+        assert detector.get_read_encoding(path, "ascii") == expected
+
+    # a byte cp1252 doesn't have
+    path.write_bytes(b"x" * 4096 + b"\x81")
+
+    assert detector.get_read_encoding(path, "ascii") == "latin-1"
+
+    # anything but ascii is left alone
+    assert detector.get_read_encoding(path, "UTF-16") == "UTF-16"
+    assert detector.get_read_encoding(path, None) is None
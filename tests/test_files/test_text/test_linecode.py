@@ -105,3 +105,27 @@ def test_get_multiline_block(json_dumps_folder):
 
     # check indent
     assert lines[40] == "   'pCubeLogging', 0,"
+
+
+def test_line_cache(test_folder):
+
+    p = TM1LinecodeFile(Path.joinpath(test_folder, "copy data from my cube.pro"))
+
+    p.write('601,100\n602,"my zany process"\n572,2\n602,"not the name"\n\n560,0\n')
+
+    assert p._get_line_index_by_code(602) == 1
+    assert p._get_multiline_block(572) == ['602,"not the name"', ""]
+    assert p._get_multiline_block(560) == []
+    assert p._get_line_by_code(999) is None
+
+    # the file is only read once
+    p._path.unlink()
+
+    assert p._get_line_by_code(601) == "601,100"
+    assert p._get_line_by_index(2, rstrip=False) == "572,2\n"
+
+    # and again after it has been written
+    p.write("601,200\n")
+
+    assert p._get_line_by_code(601) == "601,200"
+    assert p._get_line_by_code(602) is None
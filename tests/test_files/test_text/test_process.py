@@ -323,3 +323,60 @@ def test_epilog_only_process(json_dumps_folder):
 
     # this I have looked at yet
     # assert json_out["VariablesUIData"] == json_expected["VariablesUIData"]
+
+
+def test_get_model(json_dumps_folder, test_folder):
+
+    pro = TM1ProcessFile(Path.joinpath(json_dumps_folder, "processes", "new_process.pro"))
+
+    model = pro.get_model()
+
+    # read once
+    assert model is pro.get_model()
+
+    assert model.name == "new process"
+    assert len(model.prolog) == 48
+    assert len(model.epilog) == 21
+    assert model.has_security_access is False
+    assert [p["Name"] for p in model.parameters] == ["pPeriod", "pVersion", "pScenario"]
+    assert len(model.variables) == 5
+    assert model.datasource["Type"] == "ASCII"
+
+    # and again when written
+    pro = TM1ProcessFile(Path.joinpath(test_folder, "zany.pro"))
+    pro.write(Path.joinpath(json_dumps_folder, "processes", "new_process.pro").read_text())
+
+    assert pro.get_model().name == "new process"
+
+    pro.write(Path.joinpath(json_dumps_folder, "processes", "test.tm1filetools.empty_process.pro").read_text())
+
+    assert pro.get_model().name == "test.tm1filetools.empty_process"
+    assert pro.get_model().parameters == []
+
+
+def test_write_model(json_dumps_folder, tmp_path):
+
+    for source in Path.joinpath(json_dumps_folder, "processes").glob("*.pro"):
+
+        path = tmp_path / source.name
+        path.write_bytes(source.read_bytes())
+
+        # nothing changed, nothing different, whatever the line endings
+        f = TM1ProcessFile(path)
+        f.write_model()
+
+        assert path.read_bytes() == source.read_bytes()
+
+    f = TM1ProcessFile(tmp_path / "test.tm1filetools.empty_process.pro")
+    model = f.get_model()
+
+    model.epilog = model.epilog + ["sLog = 'done';\r\n", "LogOutput('INFO', sLog);\r\nProcessQuit;"]
+    f.write_model(model)
+
+    assert f._model is None
+    assert f.get_epilog_code()[-3:] == ["sLog = 'done';", "LogOutput('INFO', sLog);", "ProcessQuit;"]
+    assert f._get_line_by_code(575) == "575,5"
+    assert b"\r\n575,5\r\n" in f._path.read_bytes()
+    assert (
+        f.get_prolog_code() == TM1ProcessFile(Path.joinpath(json_dumps_folder, "processes", f.name)).get_prolog_code()
+    )
@@ -157,3 +157,96 @@ def test_get_hierarchy_odata(json_dumps_folder):
     sub = TM1SubsetFile(Path.joinpath(json_dumps_folder, "subsets", f"{subset}.sub"))  # noqa
 
     expected_string = "Dimensions('}Processes')/Hierarchies('}Processes')"  # noqa
+
+
+def test_static_subset_to_json(json_dumps_folder):
+
+    subset = "test.tm1filetools.multi_element_static_subset"
+
+    sub = TM1SubsetFile(Path.joinpath(json_dumps_folder, "subsets", f"{subset}.sub"))
+
+    with open(Path.joinpath(json_dumps_folder, "subsets", f"{subset}.json"), "r") as f:
+        expected_json = json.load(f)
+
+    # the artifacts aren't in a dim folder, so pretend they are
+    json_out = sub._to_json()
+    prefix = sub._get_hierarchy_odata(sub.dimension)
+    expected_prefix = expected_json["Hierarchy@odata.bind"]
+
+    assert json_out["Name"] == expected_json["Name"]
+    assert "Expression" not in json_out
+    assert [e.replace(prefix, expected_prefix) for e in json_out["Elements@odata.bind"]] == expected_json[
+        "Elements@odata.bind"
+    ]
+
+
+def test_get_elements(json_dumps_folder):
+
+    sub = TM1SubsetFile(
+        Path.joinpath(json_dumps_folder, "subsets", "test.tm1filetools.multi_element_static_subset_alias_on.sub")
+    )
+
+    elements = sub.get_elements()
+
+    # a generator, nothing is read until asked for
+    assert next(elements) == "}bedrock.chore.execution.check"
+    assert list(elements) == ["}bedrock.cube.clone", "}bedrock.cube.create"]
+
+    assert sub.get_alias() == "Name"
+    assert not sub.get_expand_above()
+    assert sub.get_element_count() == 3
+    assert sub._get_mdx() is None
+
+    sub = TM1SubsetFile(Path.joinpath(json_dumps_folder, "subsets", "All Non Control.sub"))
+
+    assert sub.get_alias() is None
+    assert sub._get_mdx().startswith("TM1Sort( Except(")
+    assert list(sub.get_elements()) == []
+
+
+def test_large_subset(test_folder):
+
+    f = TM1SubsetFile(Path.joinpath(test_folder, f"cat{TM1SubsetFile.folder_suffix}", "platypus.sub"))
+
+    elements = [f"element {i}" for i in range(100000)] + ["it's"]
+    f.write("\n".join(["283,100", '284,"platypus"', "274,", "18,1", "275,", f"270,{len(elements)}"] + elements))
+
+    assert f.get_expand_above()
+    assert f.get_element_count() == len(elements)
+    assert sum(1 for _ in f.get_elements()) == len(elements)
+    assert f._to_json()["Elements@odata.bind"][-1] == "Dimensions('cat')/Hierarchies('cat')/Elements('it''s')"
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "cp1252"])
+def test_subset_late_non_ascii(test_folder, encoding):
+
+    f = TM1SubsetFile(Path.joinpath(test_folder, f"cat{TM1SubsetFile.folder_suffix}", "zurich.sub"))
+
+    # ascii for far longer than the encoding detector looks at
+    elements = [f"element {i}" for i in range(20000)] + ["Zürich"]
+    text = "\n".join(['284,"zurich"', "274,", "275,", f"270,{len(elements)}"] + elements)
+    f._path.write_bytes(text.encode(encoding))
+
+    assert f.encoding == "ascii"
+    assert f.get_element_count() == len(elements)
+    assert list(f.get_elements())[-1] == "Zürich"
+
+
+def test_hierarchy_subset(test_folder):
+
+    path = Path.joinpath(test_folder, "cat}hiers", f"fluffy{TM1SubsetFile.folder_suffix}", "platypus.sub")
+
+    f = TM1SubsetFile(path)
+
+    assert f.dimension == "cat"
+    assert f.hierarchy == "fluffy"
+
+    f = TM1SubsetFile(Path.joinpath(test_folder, "Alex", "cat}hiers", "fluffy}subs", "platypus.sub"), public=False)
+
+    assert f.dimension == "cat"
+    assert f.hierarchy == "fluffy"
+    assert f.owner == "Alex"
+
+    f = TM1SubsetFile(Path.joinpath(test_folder, f"cat{TM1SubsetFile.folder_suffix}", "platypus.sub"))
+
+    assert f.hierarchy == "cat"
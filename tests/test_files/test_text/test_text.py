@@ -24,3 +24,25 @@ def test_is_non_empty(test_folder):
 
     assert f._get_non_empty()
     assert f.is_non_empty
+
+
+def test_lazy_properties(test_folder):
+
+    f = TM1TextFile(Path.joinpath(test_folder, "emu.blb"))
+
+    # nothing is read until the properties are accessed
+    assert f._is_non_empty is None
+    assert not f._encoding_detected
+
+    assert not f.is_non_empty
+    assert f._is_non_empty is False
+
+    f.write("some text")
+
+    # writing resets the cached values
+    assert f._is_non_empty is None
+    assert not f._encoding_detected
+
+    assert f.is_non_empty
+    assert f.encoding
+    assert f._encoding_detected
@@ -1,5 +1,8 @@
+import json
 from pathlib import Path
 
+import pytest
+
 from tm1filetools.files import TM1ViewFile
 
 
@@ -74,3 +77,77 @@ def test_move_to_public(test_folder):
     assert f._get_owner_name() is None
     assert f._path == Path.joinpath(test_folder, f"cat{TM1ViewFile.folder_suffix}", "squirrel.VUE")
     assert f.public
+
+
+def test_get_model(json_dumps_folder):
+
+    f = TM1ViewFile(Path.joinpath(json_dumps_folder, "views", "test.tm1filetools.static_view.vue"))
+
+    model = f.get_model()
+
+    assert model.name == "test.tm1filetools.static_view"
+    assert [d.dimension for d in model.titles] == ["}TimeIntervals"]
+    assert [d.dimension for d in model.columns] == ["}StatsByProcess"]
+    assert [d.dimension for d in model.rows] == ["}Processes"]
+
+    # all inline
+    assert model.get_named_subsets() == []
+    assert model.columns[0].elements[0] == "Current State"
+    assert len(model.columns[0].elements) == 8
+    assert len(model.rows[0].elements) == 121
+    assert model.titles[0].selected == "LATEST"
+
+    # cached
+    assert f.get_model() is model
+
+
+def test_get_model_late_non_ascii(test_folder):
+
+    f = TM1ViewFile(Path.joinpath(test_folder, f"cat{TM1ViewFile.folder_suffix}", "zurich.vue"))
+
+    # ascii for far longer than the encoding detector looks at
+    elements = [f"element {i}" for i in range(20000)] + ["Zürich"]
+    lines = ['390,"zurich"', "374,0", "360,1", "7,cat", f"270,{len(elements)}"] + elements + ["371,0", "373,0"]
+    f._path.write_bytes("\r\n".join(lines).encode("utf-8"))
+
+    assert f.encoding == "ascii"
+    assert f.get_model().columns[0].elements[-1] == "Zürich"
+
+
+def test_get_model_named_subset(json_dumps_folder):
+
+    f = TM1ViewFile(
+        Path.joinpath(json_dumps_folder, "views", "test.tm1filetools.static_view_with_named_title_subset.vue")
+    )
+
+    model = f.get_model()
+
+    assert model.get_named_subsets() == [("}TimeIntervals", "}TimeIntervals", "LATEST")]
+    assert model.titles[0].is_named
+    assert model.titles[0].elements == []
+    assert model.titles[0].selected == "LATEST"
+    assert not model.rows[0].is_named
+
+
+@pytest.mark.parametrize(
+    "name", ["test.tm1filetools.static_view", "test.tm1filetools.static_view_with_named_title_subset"]
+)
+def test_get_model_suppression(json_dumps_folder, tmp_path, name):
+
+    f = TM1ViewFile(Path.joinpath(json_dumps_folder, "views", f"{name}.vue"))
+
+    # the same view as exported from the rest api
+    with open(Path.joinpath(json_dumps_folder, "views", f"{name}.json")) as j:
+        view = json.load(j)
+
+    assert f.get_model().suppress_rows == view["SuppressEmptyRows"]
+    assert f.get_model().suppress_columns == view["SuppressEmptyColumns"]
+
+    # a copy with only 363 on
+    f = TM1ViewFile(tmp_path / f"{name}.vue")
+    f._path.write_bytes(
+        Path.joinpath(json_dumps_folder, "views", f"{name}.vue").read_bytes().replace(b"363,0", b"363,1")
+    )
+
+    assert f.get_model().suppress_rows
+    assert not f.get_model().suppress_columns
@@ -0,0 +1,46 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from tm1filetools.files import TM1CMAFile
+
+
+@pytest.fixture(scope="function")
+def proc_folder(tmp_path, json_dumps_folder):
+    """
+    Create a data folder with copies of the real processes and one that can't be read
+    """
+
+    data = tmp_path / "data"
+    data.mkdir()
+
+    for p in Path.joinpath(json_dumps_folder, "processes").glob("*.pro"):
+        shutil.copy(p, data)
+
+    # not a real process
+    (data / "broken.pro").write_text("572,x\n")
+
+    return data
+
+
+@pytest.fixture(scope="function")
+def sales_cma(tmp_path):
+    """
+    Create a cma file with a number for each of 200 rows and some comments with quoted line breaks
+    """
+
+    lines = []
+
+    # versions alternate starting with FC, periods go round the twelve months and the value is the row number
+    for index in range(200):
+        lines.append(f'"Planning:Sales","{"BP" if index % 2 else "FC"}","2022{index % 12 + 1:02}","Amount",{index}')
+
+        # quoted line breaks, with a quote in the middle of them
+        if index % 7 == 0:
+            lines.append(f'"Planning:Sales","BP","2022{index % 12 + 1:02}","Comment","line one\n""two""\nthree"')
+
+    path = tmp_path / "sales.cma"
+    path.write_text("\n".join(lines) + "\n")
+
+    return TM1CMAFile(path)
@@ -0,0 +1,81 @@
+from tm1filetools.files.text.cma import TM1CMAFilter
+from tm1filetools.tools.aggregate import TM1CMAAggregator
+
+
+def test_aggregate(sales_cma):
+
+    with TM1CMAAggregator([0]) as agg:
+
+        agg.add_file(sales_cma)
+
+        groups = agg.get_groups()
+
+    # odd rows are BP, which has all the comments
+    assert list(groups) == [("BP",), ("FC",)]
+    assert groups[("BP",)] == {"count": 100, "sum": 10000.0, "min": 1.0, "max": 199.0, "mean": 100.0, "strings": 29}
+    assert groups[("FC",)] == {"count": 100, "sum": 9900.0, "min": 0.0, "max": 198.0, "mean": 99.0, "strings": 0}
+
+
+def test_aggregate_filtered(sales_cma):
+
+    el_filter = TM1CMAFilter().equals(2, "Amount")
+
+    with TM1CMAAggregator([1], el_filter=el_filter) as agg:
+
+        agg.add_file(sales_cma)
+
+        groups = agg.get_groups()
+
+    # rows 0, 12, ..., 192
+    assert len(groups) == 12
+    assert groups[("202201",)] == {"count": 17, "sum": 1632.0, "min": 0.0, "max": 192.0, "mean": 96.0, "strings": 0}
+
+    # no positions is a grand total
+    with TM1CMAAggregator([], el_filter="BP") as agg:
+
+        agg.add_file(sales_cma)
+
+        assert agg.get_groups() == {
+            (): {"count": 100, "sum": 10000.0, "min": 1.0, "max": 199.0, "mean": 100.0, "strings": 29}
+        }
+
+
+def test_aggregate_spill(tmp_path, sales_cma):
+
+    spill = tmp_path / "spill"
+    spill.mkdir()
+
+    with TM1CMAAggregator([0, 1]) as expected:
+        expected.add_file(sales_cma)
+        expected = expected.get_groups()
+
+    agg = TM1CMAAggregator([0, 1], max_groups=1, spill_path=spill)
+
+    # twice, so groups are split across the spills
+    agg.add_file(sales_cma)
+    agg.add_file(sales_cma)
+
+    assert len(list(spill.iterdir())) > 1
+
+    groups = agg.get_groups()
+
+    assert list(groups) == list(expected)
+
+    for key, result in expected.items():
+        assert groups[key]["count"] == result["count"] * 2
+        assert groups[key]["strings"] == result["strings"] * 2
+        assert groups[key]["min"] == result["min"]
+
+        # some groups only have comments
+        if result["count"]:
+            assert groups[key]["sum"] == result["sum"] * 2
+
+    # merging partial results
+    merged = TM1CMAAggregator([0, 1])
+    merged.add_groups(agg.get_states())
+
+    assert merged.get_groups() == groups
+
+    agg.close()
+
+    assert not list(spill.iterdir())
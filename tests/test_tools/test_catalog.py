@@ -0,0 +1,158 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from tm1filetools.files import TM1CMAFile, TM1EncodingDetector, TM1TextFile
+from tm1filetools.tools import TM1FileTool
+from tm1filetools.tools.catalog import TM1ScanCatalog
+
+
+def test_index(test_folder, tmp_path):
+
+    catalog = TM1ScanCatalog(tmp_path / "catalog.db")
+
+    index = catalog.index(test_folder, recursive_suffixes=["sub"])
+
+    assert index["cub"] == TM1FileTool._index_files(test_folder)["cub"]
+    assert sorted(index["sub"]) == sorted(TM1FileTool._index_files(test_folder, recursive_suffixes=["sub"])["sub"])
+
+    # a new file is picked up as the folder has changed
+    Path.joinpath(test_folder, "tiger.cub").touch()
+    Path.joinpath(test_folder, "cat.cub").unlink()
+
+    index = catalog.index(test_folder)
+
+    assert any(f.stem == "tiger" for f in index["cub"])
+    assert all(f.stem != "cat" for f in index["cub"])
+
+    catalog.close()
+
+
+def test_unchanged_folders_not_listed(test_folder, tmp_path, monkeypatch):
+
+    catalog = TM1ScanCatalog(tmp_path / "catalog.db")
+    catalog.index(test_folder, recursive_suffixes=["sub", "vue"])
+    catalog.close()
+
+    catalog = TM1ScanCatalog(tmp_path / "catalog.db")
+
+    def fail(folder, mtime_ns):
+        raise AssertionError(f"{folder} listed again")
+
+    monkeypatch.setattr(catalog, "_rescan_folder", fail)
+
+    index = catalog.index(test_folder, recursive_suffixes=["sub", "vue"])
+
+    assert len(index["sub"]) == 12
+    assert len(index["vue"]) == 12
+
+
+def test_removed_folder(test_folder, tmp_path):
+
+    catalog = TM1ScanCatalog(tmp_path / "catalog.db")
+    catalog.index(test_folder, recursive_suffixes=["vue"])
+
+    user_views = Path.joinpath(test_folder, "Chimpy", "cat}vues")
+    for f in user_views.iterdir():
+        f.unlink()
+    user_views.rmdir()
+
+    index = catalog.index(test_folder, recursive_suffixes=["vue"])
+
+    assert len(index["vue"]) == 9
+    assert catalog.get_record(Path.joinpath(user_views, "mouse.vue")) is None
+
+
+def test_file_tool_catalog(test_folder, tmp_path, monkeypatch):
+
+    db = tmp_path / "catalog.db"
+
+    ft = TM1FileTool(test_folder, catalog=db)
+    ft.find_all()
+
+    record = ft._scan_catalog.get_record(Path.joinpath(test_folder, "cat}vues", "mouse.vue"))
+
+    assert record["type"] == "TM1ViewFile"
+    assert record["cube"] == "cat"
+    assert record["suffix"] == "vue"
+    assert record["folder"] == str(Path.joinpath(test_folder, "cat}vues"))
+
+    # encodings detected are stored
+    monkeypatch.setattr(TM1TextFile, "encoding_detector", TM1EncodingDetector())
+
+    rux = [r for r in ft.get_rules() if r.stem == "rux_1"][0]
+    encoding = rux.encoding
+    ft.save_catalog()
+
+    assert ft._scan_catalog.get_record(rux._path)["encoding"] == encoding
+
+    # and reused by a new tool
+    detector = TM1EncodingDetector()
+    monkeypatch.setattr(TM1TextFile, "encoding_detector", detector)
+    monkeypatch.setattr(detector, "_detect", lambda path: "not cached")
+
+    ft = TM1FileTool(test_folder, catalog=db)
+
+    rux = [r for r in ft.get_rules() if r.stem == "rux_1"][0]
+
+    assert rux.encoding == encoding
+
+    ft.close_catalog()
+
+    assert ft._scan_catalog is None
+
+
+def test_context_manager(test_folder, tmp_path):
+
+    with TM1ScanCatalog(tmp_path / "catalog.db") as catalog:
+        catalog.index(test_folder)
+
+    # closed
+    with pytest.raises(sqlite3.ProgrammingError):
+        catalog.get_record(Path.joinpath(test_folder, "cat.cub"))
+
+    with TM1ScanCatalog(tmp_path / "catalog.db") as catalog:
+        assert catalog.get_record(Path.joinpath(test_folder, "cat.cub"))["suffix"] == "cub"
+
+
+def test_warm_start_attributes(test_folder, tmp_path, monkeypatch):
+
+    db = tmp_path / "catalog.db"
+
+    Path.joinpath(test_folder, "troll.cma").write_text('"Planning:Sales","BP","202201",1\n')
+
+    ft = TM1FileTool(test_folder, catalog=db)
+
+    # not read until it's asked for, so not stored yet
+    cma = [c for c in ft.get_cmas() if c.stem == "troll"][0]
+    assert ft._scan_catalog.get_record(cma._path)["cube"] is None
+
+    assert cma.cube == "Sales"
+    ft.close_catalog()
+
+    # the cube comes from the catalog next time
+    monkeypatch.setattr(TM1CMAFile, "_get_cube", lambda self: "not from the catalog")
+
+    with TM1ScanCatalog(db) as catalog:
+        assert catalog.get_records()[str(cma._path)] == {
+            "type": "TM1CMAFile",
+            "cube": "Sales",
+            "dimension": None,
+            "owner": None,
+        }
+
+    ft = TM1FileTool(test_folder, catalog=db)
+
+    assert [c for c in ft.get_cmas() if c.stem == "troll"][0].cube == "Sales"
+    assert [v for v in ft.get_views(control=True) if v.owner][0].owner == "Chimpy"
+
+    # until the file changes
+    Path.joinpath(test_folder, "troll.cma").unlink()
+    Path.joinpath(test_folder, "troll.cma").write_text('"Planning:Costs","BP","202201",1\n')
+
+    ft = TM1FileTool(test_folder, catalog=db)
+
+    assert [c for c in ft.get_cmas() if c.stem == "troll"][0].cube == "not from the catalog"
+
+    ft.close_catalog()
@@ -0,0 +1,43 @@
+import shutil
+from pathlib import Path
+
+from tm1filetools.tools import TM1FileTool
+
+
+def test_chore_process_map(tmp_path, json_dumps_folder):
+
+    data = tmp_path / "data"
+    data.mkdir()
+
+    shutil.copy(Path.joinpath(json_dumps_folder, "chores", "load_all.cho"), data)
+    (data / "}control.cho").write_text('6,"}bedrock.server.save"\n560,0\n590,0\n')
+    (data / "broken.cho").write_text("531,x\n")
+
+    ft = TM1FileTool(data)
+
+    errors = ft.load_chores(control=True, workers=2)
+
+    assert list(errors) == ["broken.cho"]
+
+    # already parsed
+    assert all(c._model for c in ft.get_chores(control=True) if c.name != "broken.cho")
+
+    assert ft.get_chore_process_map(workers=2) == {"load all": ["new process", "process_logging.start"]}
+    assert ft.get_chore_process_map(model=False, control=True, workers=2) == {"}control": ["}bedrock.server.save"]}
+
+
+def test_reference_graph_chores(tmp_path, json_dumps_folder):
+
+    data = tmp_path / "data"
+    data.mkdir()
+
+    shutil.copy(Path.joinpath(json_dumps_folder, "chores", "load_all.cho"), data)
+    shutil.copy(Path.joinpath(json_dumps_folder, "processes", "new_process.pro"), data / "new process.pro")
+
+    ft = TM1FileTool(data)
+
+    graph = ft.get_reference_graph(workers=2)
+
+    # run by the chore
+    assert graph.get_unreferenced("process") == []
+    assert graph.get_dependents("process", "new process") == [("chore", "load_all")]
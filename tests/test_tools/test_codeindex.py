@@ -0,0 +1,68 @@
+import os
+import sqlite3
+
+import pytest
+
+from tm1filetools.tools import TM1FileTool
+from tm1filetools.tools.codeindex import TM1CodeIndex
+
+
+def test_tokenize():
+
+    line = "  CellPutN(nValue, 'FX Rates', 'It''s', vYear); # not a comment"
+
+    tokens = set(TM1CodeIndex.tokenize(line))
+
+    assert ("cellputn", "function") in tokens
+    assert ("nvalue", "identifier") in tokens
+    assert ("vyear", "identifier") in tokens
+    assert ("fx rates", "literal") in tokens
+    assert ("it's", "literal") in tokens
+    assert ("rates", "identifier") not in tokens
+
+    assert list(TM1CodeIndex.tokenize("# CellPutN(1, 'Sales');")) == []
+
+
+def test_code_index(tmp_path, proc_folder):
+
+    ft = TM1FileTool(proc_folder)
+
+    index = ft.get_code_index(tmp_path / "code.db")
+
+    assert list(index.errors) == ["broken.pro"]
+
+    hits = index.find_function("executeprocess")
+
+    assert ("new process", "prolog", 12) in hits
+    assert ("new process", "prolog", 28) in hits
+    assert ("new process", "epilog", 18) in hits
+
+    assert index.find_literal("FX RATES") == [("new process", "prolog", 16)]
+    assert index.find_calls("ExecuteProcess", "process_logging.start") == [("new process", "prolog", 12)]
+    assert index.find_calls("ExecuteProcess", "FX Rates") == []
+    assert index.get_processes("pPeriod") == ["new process"]
+    assert index.find_identifier("sFilter")
+
+    # nothing to do if nothing has changed
+    assert index.update(ft.get_procs()) == 0
+
+    pro = proc_folder / "new_process.pro"
+    pro.write_text(pro.read_text().replace("sCube = 'FX Rates';", "sCube = 'FX Rates 2';"))
+    os.utime(pro, ns=(1, 1))
+
+    assert index.update(ft.get_procs()) == 1
+    assert index.find_literal("fx rates") == []
+    assert index.find_literal("fx rates 2") == [("new process", "prolog", 16)]
+
+    index.close()
+
+    # and it's still there next time
+    pro.unlink()
+    ft.refresh()
+
+    with ft.get_code_index(tmp_path / "code.db") as index:
+        assert index.find_literal("fx rates 2") == []
+
+    # closed
+    with pytest.raises(sqlite3.ProgrammingError):
+        index.find_literal("fx rates 2")
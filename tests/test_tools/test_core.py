@@ -41,3 +41,67 @@ def test_find_all(test_folder):
     ft.find_all()
 
     assert all(f.stem != "cat" for f in ft._feeders_files)
+
+
+def test_index_files(test_folder):
+
+    index = TM1FileTool._index_files(test_folder)
+
+    # suffixes are lower cased
+    assert any(f.name == "dog.CUB" for f in index["cub"])
+    assert any(f.name == "koala.DIM" for f in index["dim"])
+    assert any(f.name == "cat.cub.bak" for f in index["bak"])
+
+    # sub folders are only walked for the suffixes requested
+    assert "sub" not in index
+
+    index = TM1FileTool._index_files(test_folder, recursive_suffixes=["sub"])
+
+    assert any(f.parent.parent.name == "Alex" for f in index["sub"])
+    assert "vue" not in index
+
+
+def test_find_all_single_pass(test_folder):
+
+    ft = TM1FileTool(test_folder)
+
+    ft.find_all()
+
+    assert any(d.stem == "koala" for d in ft._dim_files)
+    assert len(ft._sub_files) == 12
+    assert len(ft._view_files) == 12
+    assert all(f.name != "no_extension" for f in ft._non_tm1_files)
+    assert any(f.name == "zzzBackup12.zip" for f in ft._non_tm1_files)
+    assert any(log.stem == "tm1s" for log in ft.logfile_tool._log_files)
+
+
+def test_index_files_parallel(test_folder):
+
+    suffixes = ["sub", "vue", "cma"]
+
+    index = TM1FileTool._index_files(test_folder, recursive_suffixes=suffixes)
+    index_parallel = TM1FileTool._index_files(test_folder, recursive_suffixes=suffixes, workers=4)
+
+    assert index.keys() == index_parallel.keys()
+
+    for suffix in index:
+        assert sorted(index[suffix]) == sorted(index_parallel[suffix])
+
+
+def test_find_all_parallel(test_folder):
+
+    ft = TM1FileTool(test_folder, workers=4)
+
+    ft.find_all()
+
+    assert len(ft._sub_files) == 12
+    assert len(ft._view_files) == 12
+
+    private_subs = [s for s in ft._sub_files if not s.public]
+    assert len(private_subs) == 6
+    assert all(s.owner == "Alex" for s in private_subs)
+
+    private_views = [v for v in ft._view_files if not v.public]
+    assert len(private_views) == 6
+    assert all(v.owner == "Chimpy" for v in private_views)
+    assert all(v.owner is None for v in ft._view_files if v.public)
@@ -97,3 +97,24 @@ def test_delete_all_pre_get(test_folder):
     assert ft.delete_all_blbs() > 0
     assert ft.delete_all_orphans() > 0
     assert ft.delete_all_feeders() > 0
+
+
+def test_delete_no_rescan(test_folder, monkeypatch):
+
+    ft = TM1FileTool(test_folder)
+    ft.find_all()
+
+    def fail():
+        raise AssertionError("full rescan")
+
+    monkeypatch.setattr(ft, "find_all", fail)
+
+    len_subs = len(ft.get_subs(control=True))
+    s = ft.get_subs(control=True)[0]
+
+    assert ft.delete(s) == 1
+    assert len(ft.get_subs(control=True)) == len_subs - 1
+    assert all(sub._path != s._path for sub in ft.get_subs(control=True))
+
+    # other lists are untouched
+    assert any(f.stem == "cat" for f in ft.get_feeders())
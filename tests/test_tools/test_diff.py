@@ -0,0 +1,107 @@
+import csv
+
+from tm1filetools.files import TM1CMAFile
+from tm1filetools.tools.diff import TM1CMADiff
+
+before = """"Planning:Sales","BP","202201","Amount",200
+"Planning:Sales","BP","202202","Amount",300
+"Planning:Sales","BP","202203","Amount",400
+"Planning:Sales","BP","202201","Comment","old"
+"Planning:Sales","FC","202201","Amount",10
+"""
+
+after = """"Planning:Sales","FC","202201","Amount",10.0000001
+"Planning:Sales","BP","202203","Amount",450
+"Planning:Sales","BP","202201","Amount",200
+"Planning:Sales","BP","202201","Comment","new"
+"Planning:Sales","BP","202204","Amount",50
+"""
+
+
+def make_cmas(tmp_path):
+
+    (tmp_path / "before.cma").write_text(before)
+    (tmp_path / "after.cma").write_text(after)
+
+    return TM1CMAFile(tmp_path / "before.cma"), TM1CMAFile(tmp_path / "after.cma")
+
+
+def test_diff(tmp_path):
+
+    expected = [
+        ("changed", ("BP", "202201", "Comment"), "old", "new", None),
+        ("removed", ("BP", "202202", "Amount"), 300.0, None, -300.0),
+        ("changed", ("BP", "202203", "Amount"), 400.0, 450.0, 50.0),
+        ("added", ("BP", "202204", "Amount"), None, 50.0, 50.0),
+    ]
+
+    with TM1CMADiff(*make_cmas(tmp_path), tolerance=0.001) as diff:
+
+        assert list(diff.get_differences()) == expected
+        assert diff.get_summary() == {"added": 1, "removed": 1, "changed": 2}
+
+    # sorted in chunks of two, which have to go to disk
+    temp = tmp_path / "temp"
+    temp.mkdir()
+
+    with TM1CMADiff(*make_cmas(tmp_path), max_rows=2, temp_path=temp, tolerance=0.001) as diff:
+
+        differences = diff.get_differences()
+        assert next(differences) == expected[0]
+        assert list(temp.iterdir())
+
+        # deleted as soon as each call is done with them
+        differences.close()
+        assert not list(temp.iterdir())
+
+        assert list(diff.get_differences()) == expected
+        assert diff.get_summary() == {"added": 1, "removed": 1, "changed": 2}
+        assert diff.write_cma(tmp_path / "diff.cma") == 4
+
+        assert not list(temp.iterdir())
+        assert diff._runs == []
+
+    # or on close, if a call didn't finish
+    with TM1CMADiff(*make_cmas(tmp_path), max_rows=2, temp_path=temp, tolerance=0.001) as diff:
+        differences = diff.get_differences()
+        next(differences)
+
+    assert not list(temp.iterdir())
+
+    # without a tolerance the tiny change counts
+    with TM1CMADiff(*make_cmas(tmp_path)) as diff:
+        assert diff.get_summary()["changed"] == 3
+
+
+def test_write_diff(tmp_path):
+
+    with TM1CMADiff(*make_cmas(tmp_path), tolerance=0.001) as diff:
+
+        assert diff.write_cma(tmp_path / "diff.cma") == 4
+        assert diff.write_csv(tmp_path / "diff.csv") == 4
+
+    rows = list(TM1CMAFile(tmp_path / "diff.cma").read_rows())
+
+    assert rows[0] == ["Planning:Sales", "BP", "202201", "Comment", "new"]
+    assert rows[1] == ["Planning:Sales", "BP", "202202", "Amount", "-300.0"]
+
+    with open(tmp_path / "diff.csv", newline="") as f:
+        rows = list(csv.reader(f))
+
+    assert rows[0] == ["status", "element_1", "element_2", "element_3", "before", "after", "change"]
+    assert rows[3] == ["changed", "BP", "202203", "Amount", "400.0", "450.0", "50.0"]
+
+
+def test_write_diff_over_existing(tmp_path):
+
+    (tmp_path / "before.cma").write_text(before.replace('",', '";'))
+    (tmp_path / "after.cma").write_text(after.replace('",', '";'))
+
+    # left over from something else and not a cma at all
+    out = tmp_path / "diff.cma"
+    out.write_text('""')
+
+    with TM1CMADiff(TM1CMAFile(tmp_path / "before.cma"), TM1CMAFile(tmp_path / "after.cma"), tolerance=0.001) as diff:
+        assert diff.write_cma(out) == 4
+
+    assert out.read_text().splitlines()[1] == '"Planning:Sales";"BP";"202202";"Amount";-300.0'
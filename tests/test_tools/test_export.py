@@ -0,0 +1,77 @@
+import json
+import os
+
+from tm1filetools.tools import TM1FileTool
+
+
+def test_export_procs(tmp_path, proc_folder):
+
+    out = tmp_path / "json"
+
+    ft = TM1FileTool(proc_folder)
+
+    result = ft.export_procs(out, workers=2)
+
+    assert result["exported"] == 4
+    assert result["skipped"] == 0
+    assert list(result["errors"]) == ["broken.pro"]
+
+    with open(out / "new_process.json") as f:
+        assert json.load(f)["Name"] == "new process"
+
+    # nothing has changed
+    result = ft.export_procs(out, workers=2)
+
+    assert result["exported"] == 0
+    assert result["skipped"] == 4
+
+    # same content, different time
+    pro = proc_folder / "new_process.pro"
+    os.utime(pro, ns=(0, 0))
+
+    assert ft.export_procs(out, workers=2)["skipped"] == 4
+
+    # new content
+    pro.write_text(pro.read_text().replace('602,"new process"', '602,"newer process"'))
+
+    result = ft.export_procs(out, workers=2)
+
+    assert result["exported"] == 1
+    assert result["skipped"] == 3
+
+    with open(out / "new_process.json") as f:
+        assert json.load(f)["Name"] == "newer process"
+
+    assert ft.export_procs(out, workers=2, force=True)["exported"] == 4
+
+
+def test_export_procs_ndjson(tmp_path, proc_folder):
+
+    out = tmp_path / "procs.ndjson"
+
+    ft = TM1FileTool(proc_folder)
+
+    result = ft.export_procs(out, ndjson=True, workers=2)
+
+    assert result["exported"] == 4
+
+    lines = out.read_text().splitlines()
+    names = sorted(json.loads(line)["Name"] for line in lines)
+
+    assert len(lines) == 4
+    assert "new process" in names
+
+    # unchanged lines are copied from the last export
+    pro = proc_folder / "new_process.pro"
+    pro.write_text(pro.read_text().replace('602,"new process"', '602,"newer process"'))
+
+    result = ft.export_procs(out, ndjson=True, workers=2)
+
+    assert result["exported"] == 1
+    assert result["skipped"] == 3
+
+    lines = out.read_text().splitlines()
+
+    assert sorted(json.loads(line)["Name"] for line in lines) == sorted(
+        "newer process" if n == "new process" else n for n in names
+    )
@@ -0,0 +1,52 @@
+from tm1filetools.tools import TM1FileTool
+from tm1filetools.tools.fleettool import TM1FleetTool
+
+
+def test_scan(test_folder, rel_config_folder, empty_folder):
+
+    missing = empty_folder / "missing"
+
+    fleet = TM1FleetTool([test_folder, rel_config_folder, missing], workers=2)
+
+    catalogs = fleet.scan()
+
+    assert list(catalogs) == [str(test_folder), str(rel_config_folder), str(missing)]
+
+    ft = TM1FileTool(test_folder)
+    catalog = catalogs[str(test_folder)]
+
+    assert catalog["error"] is None
+    assert catalog["counts"]["cub"] == len(ft.get_cubes(control=True))
+    assert sorted(catalog["files"]["dim"]) == sorted(str(d._path) for d in ft.get_dims(control=True))
+    assert catalog["sizes"]["rux"] > 0
+    assert catalog["orphans"]["rules"] == len(ft.get_orphan_rules())
+
+    # data and logs in separate dirs, from the cfg file
+    catalog = catalogs[str(rel_config_folder)]
+
+    assert catalog["error"] is None
+    assert catalog["data_path"] == str((rel_config_folder / "data").resolve())
+    assert catalog["counts"]["log"] == 3
+    assert catalog["counts"]["cub"] == 0
+
+    assert catalogs[str(missing)]["error"]
+
+
+def test_report(test_folder, empty_folder):
+
+    missing = empty_folder / "missing"
+
+    fleet = TM1FleetTool([test_folder, empty_folder, missing, test_folder], workers=2)
+
+    report = fleet.get_report()
+
+    # one failure doesn't stop the others
+    assert report["servers"] == 3
+    assert report["failed"] == 1
+    assert list(fleet.get_errors()) == [str(missing)]
+    assert "FileNotFoundError" in report["errors"][str(missing)]
+
+    ft = TM1FileTool(test_folder)
+
+    assert report["counts"]["cub"] == len(ft.get_cubes(control=True))
+    assert report["orphans"]["feeders"] == len(ft.get_orphan_feeders())
@@ -0,0 +1,53 @@
+from tm1filetools.tools import TM1FileTool
+from tm1filetools.tools.graph import TM1ModelGraph
+
+
+def test_add_edge():
+
+    graph = TM1ModelGraph()
+
+    cube = graph.add_file("cube", "Sales", "sales.cub")
+    graph.add_edge(cube, graph.add_file("rules", "Sales", "sales.rux"))
+    graph.add_edge(graph.key("cube", "Missing"), graph.add_file("rules", "missing", "missing.rux"))
+
+    assert graph.exists("cube", "SALES")
+    assert graph.has_node("cube", "missing")
+    assert not graph.exists("cube", "missing")
+
+    assert graph.get_dependents("cube", "sales") == [("rules", "sales")]
+    assert graph.get_dependencies("rules", "sales") == [("cube", "sales")]
+
+    assert graph.get_orphans("rules") == ["missing.rux"]
+    assert graph.get_unreferenced("cube") == []
+    assert graph.get_unreferenced("rules") == [("rules", "sales"), ("rules", "missing")]
+
+
+def test_model_graph(test_folder):
+
+    ft = TM1FileTool(test_folder)
+
+    graph = ft.get_model_graph()
+
+    # cached until the files change
+    assert graph is ft.get_model_graph()
+
+    assert ("rules", "dog") in graph.get_dependents("cube", "dog")
+    assert ("feeders", "cat") in graph.get_dependents("cube", "cat")
+    assert ("view", "cat/mouse") in graph.get_dependents("cube", "cat")
+
+    # everything that depends on a dim
+    dependents = graph.get_dependents("dim", "koala")
+
+    assert ("subset", "koala/platypus") in dependents
+    assert ("dim", "}elementattributes_koala") in dependents
+    assert ("cube", "}elementattributes_koala") in dependents
+
+    files = graph.get_dependent_files("dim", "koala")
+
+    # public and private subsets
+    assert len([f for f in files if f.stem == "platypus"]) == 2
+
+    ft.delete(graph.get_files("cube", "dog")[0])
+
+    assert ft.get_model_graph() is not graph
+    assert not ft.get_model_graph().exists("cube", "dog")
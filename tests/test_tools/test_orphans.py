@@ -71,3 +71,38 @@ def test_orphan_feeders(test_folder):
     assert len(orphans) > 0
     assert "cat" not in [o.stem for o in orphans]
     assert "possum" in [o.stem for o in orphans]
+
+
+def test_orphans_after_delete(test_folder):
+
+    ft = TM1FileTool(test_folder)
+
+    assert "cat" not in [o.stem for o in ft.get_orphan_feeders()]
+
+    for c in ft.get_cubes():
+        if c.stem == "cat":
+            ft.delete(c)
+
+    # the graph is rebuilt after the delete
+    assert "cat" in [o.stem for o in ft.get_orphan_feeders()]
+
+
+def test_name_index(test_folder):
+
+    ft = TM1FileTool(test_folder)
+
+    assert "koala" in ft._get_name_index("dims")
+    assert "dog" in ft._get_name_index("cubes")
+    assert "kangaroo" in ft._get_name_index("attr_dims")
+    assert "humphrey" in ft._get_name_index("attr_cubes")
+    assert "}elementattributes_koala" in ft._get_name_index("all_dims")
+    assert "}elementattributes_koala" not in ft._get_name_index("dims")
+
+    # cached until the lists of files change
+    assert ft._get_name_index("cubes") is ft._get_name_index("cubes")
+
+    for c in ft.get_cubes():
+        if c.stem == "cat":
+            ft.delete(c)
+
+    assert "cat" not in ft._get_name_index("cubes")
@@ -0,0 +1,95 @@
+from tm1filetools.files import TM1CMAFile
+from tm1filetools.tools.aggregate import TM1CMAAggregator
+from tm1filetools.tools.parallel import TM1CMAParallelReader, _aggregate_range
+
+
+def test_get_ranges(sales_cma):
+
+    size = sales_cma._path.stat().st_size
+
+    ranges = TM1CMAParallelReader(sales_cma, parts=16).get_ranges()
+
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == size
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+
+    data = sales_cma._path.read_bytes()
+
+    # every range starts at the start of a row, not in a comment
+    for start, _ in ranges:
+        assert data[start:].startswith(b'"Planning:Sales"')
+
+    # small files are one range by default
+    assert TM1CMAParallelReader(sales_cma).get_ranges() == [(0, size)]
+
+
+def test_parallel(tmp_path, sales_cma):
+
+    reader = TM1CMAParallelReader(sales_cma, workers=2, parts=16)
+
+    assert reader.count() == {"numeric": 200, "strings": 29}
+    assert reader.count(el_filter="BP") == {"numeric": 100, "strings": 29}
+
+    with TM1CMAAggregator([0, 1]) as expected:
+
+        expected.add_file(sales_cma)
+
+        with reader.aggregate([0, 1]) as agg:
+            assert agg.get_groups() == expected.get_groups()
+
+        # the workers spill too, and clean up after themselves
+        spill = tmp_path / "spill"
+        spill.mkdir()
+
+        with reader.aggregate([0, 1], max_groups=2, spill_path=spill) as agg:
+            assert agg.get_groups() == expected.get_groups()
+
+        assert list(spill.iterdir()) == []
+
+    out = tmp_path / "comments.cma"
+
+    assert reader.extract(out, el_filter="::Comment") == 29
+
+    rows = list(TM1CMAFile(out).read_rows())
+
+    assert rows == list(sales_cma.read_rows(el_filter="::Comment"))
+    assert rows[0][-1] == 'line one\n"two"\nthree'
+
+
+def test_parallel_empty(tmp_path):
+
+    cma = TM1CMAFile(tmp_path / "empty.cma")
+    cma._path.touch()
+
+    reader = TM1CMAParallelReader(cma, workers=2)
+
+    assert reader.get_ranges() == []
+    assert reader.count() == {"numeric": 0, "strings": 0}
+    assert reader.extract(tmp_path / "out.cma") == 0
+
+
+def test_aggregate_range_capped(tmp_path, sales_cma):
+
+    spill = tmp_path / "spill"
+    spill.mkdir()
+
+    size = sales_cma._path.stat().st_size
+
+    # 24 groups of version and period, at most 5 at a time
+    paths = _aggregate_range(str(sales_cma._path), 0, size, ",", None, [0, 1], 5, spill)
+
+    assert len(paths) > 1
+    assert sorted(paths) == sorted(str(p) for p in spill.iterdir())
+
+    for path in paths:
+        with open(path) as f:
+            assert len(f.readlines()) <= 5
+
+    with TM1CMAAggregator([0, 1]) as expected, TM1CMAAggregator([0, 1]) as agg:
+
+        expected.add_file(sales_cma)
+        agg.add_spills(paths)
+
+        assert agg.get_groups() == expected.get_groups()
+
+    assert not list(spill.iterdir())
@@ -1,5 +1,7 @@
 # import pytest
+from pathlib import Path
 
+from tm1filetools.files import TM1CubeFile, TM1SubsetFile
 from tm1filetools.tools import TM1FileTool
 
 
@@ -14,3 +16,42 @@ def test_rename(test_folder):
 
     assert any(c.stem == "lion" for c in ft.get_cubes())
     assert all(c.stem != "cat" for c in ft.get_cubes())
+
+
+def test_rename_copy(test_folder):
+
+    ft = TM1FileTool(test_folder)
+
+    # a file object the tool doesn't hold itself
+    cube = TM1CubeFile(Path.joinpath(test_folder, "cat.cub"))
+
+    ft.rename(cube, "lion")
+
+    assert any(c.stem == "lion" for c in ft.get_cubes())
+    assert all(c.stem != "cat" for c in ft.get_cubes())
+
+
+def test_refresh(test_folder):
+
+    ft = TM1FileTool(test_folder)
+    ft.find_all()
+
+    Path.joinpath(test_folder, "tiger.cub").touch()
+    Path.joinpath(test_folder, "cat.cub").unlink()
+
+    ft.refresh(paths=[Path.joinpath(test_folder, "tiger.cub"), Path.joinpath(test_folder, "cat.cub")])
+
+    assert any(c.stem == "tiger" for c in ft.get_cubes())
+    assert all(c.stem != "cat" for c in ft.get_cubes())
+
+    # refresh a whole folder
+    user_subs = Path.joinpath(test_folder, "Alex", f"cat{TM1SubsetFile.folder_suffix}")
+    Path.joinpath(user_subs, "emu.sub").touch()
+    Path.joinpath(user_subs, "platypus.sub").unlink()
+
+    ft.refresh(paths=[Path.joinpath(test_folder, "Alex")])
+
+    assert any(s._path == Path.joinpath(user_subs, "emu.sub") for s in ft.get_subs())
+    assert all(s._path != Path.joinpath(user_subs, "platypus.sub") for s in ft.get_subs())
+    # public ones are still there
+    assert any(s.stem == "platypus" for s in ft.get_subs())
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+from tm1filetools.files.text.chore import TM1ChoreModel, TM1ChoreStep
+from tm1filetools.tools import TM1FileTool
+from tm1filetools.tools.schedule import TM1ChoreSchedule
+
+
+def make_chore(name, start_time, frequency, processes, active=True):
+
+    chore = TM1ChoreModel()
+
+    chore.name = name
+    chore.start_time = start_time
+    chore.frequency = frequency
+    chore.active = active
+    chore.steps = [TM1ChoreStep(p) for p in processes]
+
+    return chore
+
+
+def test_get_runs():
+
+    hourly = make_chore("hourly", datetime(2022, 12, 25, 0, 30), timedelta(hours=1), ["a"])
+    once = make_chore("once", datetime(2023, 1, 1, 1, 0), None, ["b"])
+    inactive = make_chore("inactive", datetime(2023, 1, 1, 1, 0), timedelta(hours=1), ["c"], active=False)
+
+    schedule = TM1ChoreSchedule([hourly, once, inactive], datetime(2023, 1, 1), datetime(2023, 1, 1, 3))
+
+    assert schedule.get_runs() == [
+        (datetime(2023, 1, 1, 0, 30), datetime(2023, 1, 1, 0, 35), "hourly"),
+        (datetime(2023, 1, 1, 1, 0), datetime(2023, 1, 1, 1, 5), "once"),
+        (datetime(2023, 1, 1, 1, 30), datetime(2023, 1, 1, 1, 35), "hourly"),
+        (datetime(2023, 1, 1, 2, 30), datetime(2023, 1, 1, 2, 35), "hourly"),
+    ]
+
+    # a run that started before the window but is still going is included
+    schedule = TM1ChoreSchedule(
+        [hourly], datetime(2023, 1, 1, 0, 40), datetime(2023, 1, 1, 1), durations={"hourly": timedelta(minutes=20)}
+    )
+
+    assert schedule.get_runs() == [(datetime(2023, 1, 1, 0, 30), datetime(2023, 1, 1, 0, 50), "hourly")]
+
+
+def test_overlaps():
+
+    nightly = make_chore("nightly", datetime(2023, 1, 1, 1), timedelta(days=1), ["load", "save"])
+    hourly = make_chore("hourly", datetime(2023, 1, 1), timedelta(hours=1), ["load", "sync"])
+    late = make_chore("late", datetime(2023, 1, 1, 3), timedelta(days=1), ["report"])
+
+    schedule = TM1ChoreSchedule(
+        [nightly, hourly, late],
+        datetime(2023, 1, 1),
+        datetime(2023, 1, 1, 6),
+        durations={"nightly": timedelta(hours=2), "late": timedelta(hours=1)},
+    )
+
+    # the nightly run overlaps two hourly runs, the late one starts just as nightly ends
+    assert schedule.get_overlapping_chores() == {
+        "hourly": ["late", "nightly"],
+        "late": ["hourly"],
+        "nightly": ["hourly"],
+    }
+    assert len(schedule.get_overlaps()) == 3
+
+    peaks = schedule.get_peak_concurrency()
+
+    assert len(peaks) == 6
+    assert peaks[datetime(2023, 1, 1, 0)] == 1
+    assert peaks[datetime(2023, 1, 1, 1)] == 2
+    assert peaks[datetime(2023, 1, 1, 2)] == 2
+    assert peaks[datetime(2023, 1, 1, 3)] == 2
+    assert peaks[datetime(2023, 1, 1, 4)] == 1
+
+    assert schedule.get_concurrent_processes() == {
+        "load": ["hourly", "nightly"],
+        "report": ["late"],
+        "save": ["nightly"],
+        "sync": ["hourly"],
+    }
+
+
+def test_get_chore_schedule(tmp_path):
+
+    data = tmp_path / "data"
+    data.mkdir()
+
+    (data / "a.cho").write_text('602,"a"\n530,20230101000000\n531,000010000\n532,1\n533,1\n6,"p"\n560,0\n590,0\n')
+    (data / "b.cho").write_text('602,"b"\n530,20230101000000\n531,001000000\n532,1\n533,1\n6,"p"\n560,0\n590,0\n')
+
+    ft = TM1FileTool(data)
+
+    schedule = ft.get_chore_schedule(datetime(2023, 1, 1), datetime(2023, 1, 2), workers=2)
+
+    assert len(schedule.get_runs()) == 25
+    assert schedule.get_concurrent_processes() == {"p": ["a", "b"]}
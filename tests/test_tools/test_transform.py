@@ -0,0 +1,45 @@
+from tm1filetools.tools import TM1FileTool
+
+
+def swap_logging(code: str) -> str:
+
+    # has to be at the top level to get to the worker processes
+    return code.replace("process_logging.start", "process.logging.start")
+
+
+def test_transform_procs(proc_folder):
+
+    pro = proc_folder / "new_process.pro"
+    before = pro.read_text()
+
+    assert "process_logging.start" in before
+
+    ft = TM1FileTool(proc_folder)
+
+    # nothing written
+    result = ft.transform_procs(swap_logging, workers=2, dry_run=True)
+
+    assert pro.read_text() == before
+    assert list(result["changed"]) == ["new_process.pro"]
+    assert result["unchanged"] == 3
+    assert list(result["errors"]) == ["broken.pro"]
+
+    changes = result["changed"]["new_process.pro"]
+
+    assert all(c["added"] == c["removed"] for c in changes.values())
+    assert "+" in result["diffs"]["new_process.pro"]
+
+    # and for real
+    assert ft.get_procs()[0].get_model()
+
+    result = ft.transform_procs(swap_logging, workers=2)
+
+    assert result["changed"]["new_process.pro"] == changes
+    assert pro.read_text() == before.replace("process_logging.start", "process.logging.start")
+    assert not list(proc_folder.glob("*.tmp"))
+
+    # the cached models have gone
+    assert all(p._model is None for p in ft.get_procs() if p.name == "new_process.pro")
+
+    # already done
+    assert ft.transform_procs(swap_logging, workers=2)["unchanged"] == 4
@@ -0,0 +1,92 @@
+from pathlib import Path
+
+from tm1filetools.tools import TM1FileTool
+
+
+def _write_view(path: Path, dims: list):
+
+    # just enough of a .vue file, one title dimension per (dimension, subset)
+    lines = ["389,100", f'390,"{path.stem}"', f"374,{len(dims)}"]
+
+    for dimension, subset in dims:
+        lines = lines + [f"7,{dimension}", f"6,{subset}"]
+
+    lines = lines + ["360,0", "371,0", f"373,{len(dims)}"] + [f"1,{subset}" for _, subset in dims]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\r\n".join(lines) + "\r\n")
+
+
+def test_subset_usage(tmp_path):
+
+    data = tmp_path / "data"
+
+    for sub in [
+        data / "cat}subs" / "used.sub",
+        data / "cat}subs" / "unused.sub",
+        data / "cat}subs" / "Shadowed.sub",
+        data / "Chimpy" / "cat}subs" / "shadowed.sub",
+        data / "Chimpy" / "cat}subs" / "dead.sub",
+        data / "Bonzo" / "cat}subs" / "private.sub",
+    ]:
+        sub.parent.mkdir(parents=True, exist_ok=True)
+        sub.write_text("284,1\n")
+
+    (data / "cat.dim").write_text("")
+
+    _write_view(data / "cube}vues" / "public.vue", [("cat", "USED")])
+    _write_view(data / "Chimpy" / "cube}vues" / "private.vue", [("cat", "shadowed")])
+    _write_view(data / "Bonzo" / "cube}vues" / "private.vue", [("cat", "private"), ("cat", "gone")])
+    (data / "cube}vues" / "broken.vue").write_text("374,1\n7,cat\n270,x\n")
+
+    ft = TM1FileTool(data)
+
+    errors = ft.load_views(workers=2)
+
+    assert list(errors) == [str(data / "cube}vues" / "broken.vue")]
+    assert [v for v in ft.get_views() if v.public][0].get_model().get_named_subsets() == [("cat", "cat", "USED")]
+
+    referenced = ft.get_referenced_subs(workers=2)
+
+    assert sorted((s.owner or "", s.stem) for s in referenced) == [
+        ("", "used"),
+        ("Bonzo", "private"),
+        ("Chimpy", "shadowed"),
+    ]
+
+    # the public subset of the same name isn't used by Chimpy's view
+    assert [(s.owner, s.stem) for s in ft.get_dead_private_subs(workers=2)] == [("Chimpy", "dead")]
+
+
+def test_hierarchy_subset_usage(tmp_path):
+
+    data = tmp_path / "data"
+
+    # the same name in the default and an alternate hierarchy
+    for sub in [
+        data / "Chimpy" / "cat}subs" / "platypus.sub",
+        data / "Chimpy" / "cat}hiers" / "fluffy}subs" / "platypus.sub",
+        data / "Chimpy" / "cat}hiers" / "fluffy}subs" / "dead.sub",
+    ]:
+        sub.parent.mkdir(parents=True, exist_ok=True)
+        sub.write_text("284,1\n")
+
+    (data / "cat.dim").write_text("")
+
+    _write_view(data / "Chimpy" / "cube}vues" / "private.vue", [("cat:fluffy", "platypus")])
+
+    ft = TM1FileTool(data)
+
+    referenced = ft.get_referenced_subs(workers=2)
+
+    assert [(s.hierarchy, s.stem) for s in referenced] == [("fluffy", "platypus")]
+    assert sorted((s.hierarchy, s.stem) for s in ft.get_dead_private_subs(workers=2)) == [
+        ("cat", "platypus"),
+        ("fluffy", "dead"),
+    ]
+
+    graph = ft.get_model_graph()
+
+    assert graph.has_node("subset", "cat/platypus")
+    assert graph.has_node("subset", "cat:fluffy/platypus")
+    assert len(graph.get_files("subset", "cat:fluffy/platypus")) == 1
@@ -0,0 +1,83 @@
+import shutil
+from pathlib import Path
+
+from tm1filetools.tools import TM1FileTool
+from tm1filetools.tools.xref import TM1ReferenceExtractor
+
+
+def test_find_references():
+
+    code = """
+    ExecuteProcess('load.sales', 'pYear', Str(vYear, 4, 0));
+    CellPutN(nValue * (1 + nRate), 'Sales', 'Actual', 'Jan');
+    nPrice = CellGetN( sCube, 'Price' );
+    DimensionElementInsert('Region', '', 'It''s new', 'N');
+    ['Amount'] = N: DB('FX Rates', !Currency, 'Rate') * ['Local'];
+    """
+
+    references = TM1ReferenceExtractor.find_references(code)
+
+    assert references == [
+        ("process", "load.sales"),
+        ("cube", "Sales"),
+        ("dim", "Region"),
+        ("cube", "FX Rates"),
+    ]
+
+
+def test_reference_graph(tmp_path, json_dumps_folder):
+
+    data = tmp_path / "data"
+    data.mkdir()
+
+    shutil.copy(Path.joinpath(json_dumps_folder, "processes", "new_process.pro"), data / "new process.pro")
+
+    (data / "process_logging.start.pro").write_text("572,1\nExecuteProcess('new process');\n573,0\n574,0\n575,0\n")
+    (data / "unused.pro").write_text("572,1\nCellPutN(1, 'FX Rates', 'x');\n573,0\n574,0\n575,0\n")
+    (data / "broken.pro").write_text("572,x\n")
+    (data / "Sales.rux").write_text("['Amount'] = N: DB('FX Rates', !Currency, 'Rate');\n")
+    (data / "Sales.cub").touch()
+
+    ft = TM1FileTool(data)
+    cache = tmp_path / "xref.json"
+
+    graph = ft.get_reference_graph(workers=2, cache_file=cache)
+
+    # nothing calls these, the other two call each other
+    assert sorted(graph.get_unreferenced("process")) == [("process", "broken"), ("process", "unused")]
+    assert ("process", "process_logging.start") in graph.get_dependents("process", "new process")
+
+    dependents = graph.get_dependents("cube", "fx rates")
+    assert ("process", "unused") in dependents
+    assert ("rules", "sales") in dependents
+
+    # the rules file is only in the graph once
+    assert len(graph.get_files("rules", "sales")) == 1
+
+    # results are cached by content
+    assert cache.exists()
+
+    extractor = TM1ReferenceExtractor(cache_file=cache)
+
+    assert len(extractor._cache) == 4
+    assert extractor.extract(ft.get_rules()) == {str(data / "Sales.rux"): [("cube", "FX Rates")]}
+
+
+def test_cube_dims_referenced(tmp_path):
+
+    data = tmp_path / "data"
+    (data / "Sales}vues").mkdir(parents=True)
+
+    for dim in ["Version", "Period", "Unused"]:
+        (data / f"{dim}.dim").touch()
+
+    (data / "Sales.cub").touch()
+    (data / "Sales}vues" / "default.vue").write_text(
+        '390,"default"\r\n374,1\r\n7,Version\r\n6,Budget\r\n360,1\r\n7,Period\r\n6,All\r\n371,0\r\n373,1\r\n1,BP\r\n'
+    )
+
+    graph = TM1FileTool(data).get_reference_graph(workers=2)
+
+    # dims on a view of a cube are in the cube
+    assert graph.get_unreferenced("dim") == [("dim", "unused")]
+    assert ("cube", "sales") in graph.get_dependents("dim", "period")